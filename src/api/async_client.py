@@ -0,0 +1,199 @@
+# Async Schwab market data client (pooled session, token refresh, bounded concurrency, retries)
+import time
+import base64
+import random
+import asyncio
+import aiohttp
+import pandas as pd
+from src.api.schwab_data import price_history_params, candles_to_df
+from src.monitoring.metrics import metrics
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class AsyncSchwabClient:
+    """
+    asyncio client for the Schwab Trader API that reuses one pooled HTTP session.
+
+    Access tokens are refreshed through the OAuth refresh-token flow shortly before they expire
+    (or after a 401), requests are bounded by a semaphore, and 429 / 5xx responses are retried
+    with exponential backoff (honouring Retry-After).
+
+    Usage:
+        async with AsyncSchwabClient(client_id, client_secret, refresh_token=rt) as client:
+            quotes = await client.get_quotes(["/MESM5", "/MESU5"])
+            bars = await client.get_price_histories(["MESM5", "MESU5"], lookback_days=2)
+
+    Args:
+        client_id, client_secret: App credentials used for the refresh flow.
+        access_token, refresh_token: Current OAuth tokens.
+        expires_at (float): Epoch seconds when access_token expires (None = unknown, refresh on first use
+            if no access token is given).
+        base_url (str): API root; point it at a local mock server for tests.
+        max_concurrency (int): Maximum in-flight requests (also the connection pool size).
+        max_retries (int): Retries for 429 / 5xx / connection errors.
+        backoff (float): Base backoff in seconds (doubled per retry, with jitter).
+        refresh_margin (float): Refresh this many seconds before expiry.
+        on_token_refresh: Optional callback receiving the token response dict (e.g. to persist tokens).
+    """
+
+    def __init__(self, client_id: str, client_secret: str, access_token: str = None, refresh_token: str = None,
+                 expires_at: float = None, base_url: str = "https://api.schwabapi.com", max_concurrency: int = 8,
+                 max_retries: int = 5, backoff: float = 0.5, refresh_margin: float = 60.0, timeout: float = 30.0,
+                 on_token_refresh=None):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.access_token = access_token
+        self.refresh_token = refresh_token
+        self.expires_at = expires_at
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.refresh_margin = refresh_margin
+        self.timeout = timeout
+        self.on_token_refresh = on_token_refresh
+        self._session = None
+        self._semaphore = None
+        self._refresh_lock = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def open(self):
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(connector=connector,
+                                                  timeout=aiohttp.ClientTimeout(total=self.timeout))
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._refresh_lock = asyncio.Lock()
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    # === Auth ===
+    def _token_expiring(self) -> bool:
+        if not self.access_token:
+            return True
+        return self.expires_at is not None and time.time() >= self.expires_at - self.refresh_margin
+
+    async def refresh_tokens(self, force: bool = False, rejected_token: str = None) -> dict:
+        """
+        Exchanges the refresh token for a new access token. Concurrent callers share one refresh:
+        a forced refresh after a 401 is skipped if another request already replaced `rejected_token`.
+        """
+        await self.open()
+        async with self._refresh_lock:
+            if not force and not self._token_expiring():
+                return None
+            if force and rejected_token is not None and rejected_token != self.access_token:
+                return None
+            if not self.refresh_token:
+                raise Exception("Schwab access token expired and no refresh token is available")
+
+            credentials = base64.b64encode(f"{self.client_id}:{self.client_secret}".encode()).decode()
+            headers = {
+                "Authorization": f"Basic {credentials}",
+                "Content-Type": "application/x-www-form-urlencoded"
+            }
+            payload = {"grant_type": "refresh_token", "refresh_token": self.refresh_token}
+            async with self._session.post(f"{self.base_url}/v1/oauth/token", headers=headers, data=payload) as response:
+                if response.status != 200:
+                    raise Exception(f"Token refresh failed: {response.status} {await response.text()}")
+                tokens = await response.json()
+
+            self.access_token = tokens["access_token"]
+            self.refresh_token = tokens.get("refresh_token", self.refresh_token)
+            self.expires_at = time.time() + float(tokens.get("expires_in", 1800))
+            if self.on_token_refresh is not None:
+                self.on_token_refresh(tokens)
+            return tokens
+
+    # === Requests ===
+    def _retry_delay(self, attempt: int, retry_after: str = None) -> float:
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return self.backoff * (2 ** attempt) * (0.5 + random.random())
+
+    async def _get(self, path: str, params: dict) -> dict:
+        await self.open()
+        refreshed_on_401 = False
+        attempt = 0
+        while True:
+            if self._token_expiring():
+                await self.refresh_tokens()
+            token = self.access_token
+            headers = {"Authorization": f"Bearer {token}"}
+            try:
+                async with self._semaphore:
+                    async with self._session.get(f"{self.base_url}{path}", headers=headers, params=params) as response:
+                        status = response.status
+                        metrics.count("api_calls", endpoint=path.rsplit("/", 1)[-1], status=status)
+                        if status == 200:
+                            return await response.json()
+                        text = await response.text()
+                        retry_after = response.headers.get("Retry-After")
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                metrics.count("api_errors", endpoint=path.rsplit("/", 1)[-1])
+                if attempt >= self.max_retries:
+                    raise
+                await asyncio.sleep(self._retry_delay(attempt))
+                attempt += 1
+                continue
+
+            if status == 401 and not refreshed_on_401 and self.refresh_token:
+                refreshed_on_401 = True
+                await self.refresh_tokens(force=True, rejected_token=token)
+                continue
+            if status in RETRY_STATUSES and attempt < self.max_retries:
+                await asyncio.sleep(self._retry_delay(attempt, retry_after))
+                attempt += 1
+                continue
+            raise Exception(f"Schwab API error: {status} - {text}")
+
+    async def get_quotes(self, symbols: list, chunk_size: int = 100) -> dict:
+        """
+        Latest quote snapshots for many symbols (e.g. several contract months), fetched concurrently
+        in chunks of `chunk_size` symbols per request.
+
+        Returns:
+            dict: {symbol: quote}; symbols missing from the response are left out.
+        """
+        chunks = [symbols[i:i + chunk_size] for i in range(0, len(symbols), chunk_size)]
+        responses = await asyncio.gather(*(self._get("/marketdata/v1/quotes", {"symbols": ",".join(chunk)})
+                                           for chunk in chunks))
+        quotes = {}
+        for data in responses:
+            quotes.update({s: q for s, q in data.items() if s in symbols})
+        return quotes
+
+    async def get_price_history(self, symbol: str, lookback_days: int = 5, start_date=None,
+                                end_date=None) -> pd.DataFrame:
+        """
+        1-minute OHLCV candles for one symbol, in the same format as `fetch_mes_data` (None if no candles).
+        """
+        data = await self._get("/marketdata/v1/pricehistory",
+                               price_history_params(symbol, lookback_days, start_date, end_date))
+        candles = data.get("candles")
+        if not isinstance(candles, list) or not candles:
+            return None
+        return candles_to_df(candles)
+
+    async def get_price_histories(self, symbols: list, **kwargs) -> dict:
+        """
+        Price history for many symbols concurrently (bounded by max_concurrency).
+
+        Returns:
+            dict: {symbol: DataFrame or None}.
+        """
+        frames = await asyncio.gather(*(self.get_price_history(symbol, **kwargs) for symbol in symbols))
+        return dict(zip(symbols, frames))
@@ -1,12 +1,18 @@
 import requests
 import pandas as pd
 from datetime import datetime
+from src.data.contracts import front_month
+from src.monitoring.log import get_logger
+from src.monitoring.metrics import metrics
 
-def get_futures_quote(access_token: str, symbol: str = "/MESM5") -> dict:
+logger = get_logger(__name__)
+
+def get_futures_quote(access_token: str, symbol: str = None) -> dict:
     """
     Get latest quote snapshot for a futures contract.
-    Schwab futures use a '/' prefix and month/year code (e.g., /MESM5).
+    Schwab futures use a '/' prefix and month/year code (e.g., /MESM5); defaults to the MES front month.
     """
+    symbol = symbol or "/" + front_month("MES")
     url = "https://api.schwabapi.com/marketdata/v1/quotes"
     headers = {
         "Authorization": f"Bearer {access_token}"
@@ -15,8 +21,10 @@ def get_futures_quote(access_token: str, symbol: str = "/MESM5") -> dict:
         "symbols": symbol
     }
 
-    response = requests.get(url, headers=headers, params=params)
-    
+    with metrics.span("fetch_quote"):
+        response = requests.get(url, headers=headers, params=params)
+    metrics.count("api_calls", endpoint="quotes", status=response.status_code)
+
     if not response.ok:
         raise Exception(f"Schwab API error: {response.status_code} - {response.text}")
 
@@ -26,35 +34,71 @@ def get_futures_quote(access_token: str, symbol: str = "/MESM5") -> dict:
 
     return data[symbol]
 
-def fetch_mes_data(access_token: str, symbol: str = "MESM5", interval: str = "1min", lookback_days: int = 5) -> pd.DataFrame:
+def price_history_params(symbol: str, lookback_days: int = 5, start_date: datetime = None,
+                         end_date: datetime = None) -> dict:
+    """
+    Builds pricehistory query parameters for 1-minute candles, either for the last `lookback_days`
+    or for an explicit [start_date, end_date] range (UTC).
+    """
+    params = {
+        "symbol": symbol,
+        "frequencyType": "minute",  # or 'daily'
+        "frequency": 1,             # every 1 minute
+        "periodType": "day",
+        "period": lookback_days,
+        "needExtendedHoursData": "false"
+    }
+    if start_date is not None:
+        end = pd.Timestamp(end_date) if end_date is not None else pd.Timestamp.now(tz="UTC")
+        params.pop("period")
+        params["startDate"] = int(pd.Timestamp(start_date).timestamp() * 1000)
+        params["endDate"] = int(end.timestamp() * 1000)
+    return params
+
+def candles_to_df(candles: list) -> pd.DataFrame:
+    """
+    Converts pricehistory candles to an OHLCV DataFrame indexed by datetime (None if candles carry no datetime).
+    """
+    df = pd.DataFrame(candles)
+    if "datetime" not in df.columns:
+        return None
+
+    df["datetime"] = pd.to_datetime(df["datetime"], unit="ms")
+    df.set_index("datetime", inplace=True)
+
+    return df[["open", "high", "low", "close", "volume"]].rename(columns={
+        "open": "Open", "high": "High", "low": "Low", "close": "Close", "volume": "Volume"
+    })
+
+def fetch_mes_data(access_token: str, symbol: str = None, interval: str = "1min", lookback_days: int = 5,
+                   start_date: datetime = None, end_date: datetime = None) -> pd.DataFrame:
     """
     Fetches historical MES futures data from Schwab Trader API.
     
     Args:
         access_token: OAuth2 token.
-        symbol: Schwab-compatible symbol for MES.
-        interval: Interval like '1min', '5min', '1day'.
+        symbol: Schwab-compatible symbol for MES (defaults to the front month under the calendar roll).
+        interval: Interval like '1min', '5min', '15min', '1h', 'session', '1day'. Candles are always
+            requested at 1 minute and coarser intervals are built from them (CME session aware).
         lookback_days: How many days back to fetch.
+        start_date: Optional start of the range (UTC); used instead of lookback_days to fetch only a missing tail.
+        end_date: Optional end of the range (UTC), defaults to now when start_date is set.
 
     Returns:
         DataFrame with OHLCV data.
     """
+    symbol = symbol or front_month("MES")
     url = f"https://api.schwabapi.com/marketdata/v1/pricehistory"
     headers = {
         "Authorization": f"Bearer {access_token}"
     }
-    params = {
-        "symbol": symbol,
-        "frequencyType": "minute",  # or 'daily'
-        "frequency": 1,             # every 1 minute
-        "periodType": "day",
-        "period": lookback_days,
-        "needExtendedHoursData": "false"
-    }
+    params = price_history_params(symbol, lookback_days, start_date, end_date)
 
-    print(f"📡 Requesting data for: {symbol}")
-    response = requests.get(url, headers=headers, params=params)
-    print(response.status_code)
+    logger.debug(f"📡 Requesting data for: {symbol}")
+    with metrics.span("fetch"):
+        response = requests.get(url, headers=headers, params=params)
+    metrics.count("api_calls", endpoint="pricehistory", status=response.status_code)
+    logger.debug(f"Status {response.status_code}")
 
     if response.status_code != 200:
         raise Exception(f"Schwab API error: {response.status_code} {response.text}")
@@ -62,28 +106,20 @@ def fetch_mes_data(access_token: str, symbol: str = "MESM5", interval: str = "1m
     try:
         data = response.json()
     except Exception as e:
-        print("❌ Failed to parse JSON:", e)
-        print("Response content:", response.text[:300])
+        logger.error(f"❌ Failed to parse JSON: {e}; response content: {response.text[:300]}")
         return None
 
     if "candles" not in data or not isinstance(data["candles"], list) or len(data["candles"]) == 0:
-        print("⚠️ No candles found in data.")
-        print("Raw data keys:", data.keys())
+        logger.warning(f"⚠️ No candles found in data (keys: {list(data.keys())})")
         return None
 
-    print(f"✅ Received {len(data['candles'])} candles")
-    print("🕰 Sample candle:", data["candles"][0])
-
-    df = pd.DataFrame(data["candles"])
-
-    if "datetime" not in df.columns:
-        print("❌ 'datetime' field not found in candles")
-        print("🧾 DataFrame columns:", df.columns.tolist())
-        return None
+    logger.info(f"✅ Received {len(data['candles'])} candles for {symbol}")
+    logger.debug(f"🕰 Sample candle: {data['candles'][0]}")
 
-    df["datetime"] = pd.to_datetime(df["datetime"], unit="ms")
-    df.set_index("datetime", inplace=True)
-
-    return df[["open", "high", "low", "close", "volume"]].rename(columns={
-        "open": "Open", "high": "High", "low": "Low", "close": "Close", "volume": "Volume"
-    })
+    df = candles_to_df(data["candles"])
+    if df is None:
+        logger.error(f"❌ 'datetime' field not found in candles (keys: {list(data['candles'][0].keys())})")
+    elif interval != "1min":
+        from src.data.bars import resample_bars
+        df = resample_bars(df, interval)
+    return df
@@ -0,0 +1,202 @@
+# === suite.py (offline timing / peak-memory benchmarks for the pipeline hot paths) ===
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+import tracemalloc
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from src.benchmarks.synthetic import synthetic_ohlcv, CannedFred
+from src.config.strategy_params import best_strategy_params, best_rf_params
+from src.features.engineering import add_features, final_features
+from src.features.incremental import IncrementalFeatureEngine
+from src.models.ml_models import train_random_forest_model
+from src.strategies.live_recommender import LiveTradeRecommender
+from src.strategies.walkforward import run_wfv_with_params
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+# Per-fold and per-row stages are capped (last N rows) so a 10M-bar run finishes
+STAGE_LIMITS = {
+    "incremental_features": 50_000,
+    "run_wfv_with_params": 2_000,
+    "run_wfv_vectorized": 2_000,
+    "generate": 200,
+}
+
+
+def _stage_inputs(bars, fred):
+    """Feature frame and fitted model shared by the downstream stages."""
+    features_df = add_features(bars.copy(), None, verbose=False, fred_cache=fred)
+    model = train_random_forest_model(features_df, final_features, best_rf_params)
+    return features_df, model
+
+
+def build_stages(bars, fred, features_df, model):
+    """
+    Returns {stage name: (callable, rows processed)} for one bar count.
+    """
+    recommender = LiveTradeRecommender(model, final_features, best_strategy_params)
+
+    def limit(name, df):
+        return df.iloc[-STAGE_LIMITS[name]:] if name in STAGE_LIMITS else df
+
+    incremental_bars = limit("incremental_features", bars)
+    wfv_df = limit("run_wfv_with_params", features_df)
+    generate_rows = limit("generate", features_df)
+
+    def incremental():
+        engine = IncrementalFeatureEngine()
+        engine.warm_up(incremental_bars)
+
+    def generate():
+        for _, row in generate_rows.iterrows():
+            recommender.generate(row, verbose=False)
+
+    return {
+        "add_features": (lambda: add_features(bars.copy(), None, verbose=False, fred_cache=fred), len(bars)),
+        "incremental_features": (incremental, len(incremental_bars)),
+        "train_random_forest_model": (
+            lambda: train_random_forest_model(features_df, final_features, best_rf_params), len(features_df)),
+        "run_wfv_with_params": (
+            lambda: run_wfv_with_params(wfv_df, final_features, RandomForestClassifier, best_rf_params,
+                                        plot=False, **best_strategy_params), len(wfv_df)),
+        "run_wfv_vectorized": (
+            lambda: run_wfv_with_params(wfv_df, final_features, RandomForestClassifier, best_rf_params,
+                                        plot=False, vectorized_exits=True, **best_strategy_params), len(wfv_df)),
+        "generate": (generate, len(generate_rows)),
+        "generate_batch": (lambda: recommender.generate_batch(features_df), len(features_df)),
+    }
+
+
+def measure(fn, repeat=3, memory=True):
+    """
+    Times `fn` (best of `repeat`, output suppressed) and records its peak traced memory in a separate
+    run, since tracemalloc slows Python-heavy stages down several times.
+
+    Returns:
+        dict: seconds, peak_mb (None when memory is off).
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    if not memory:
+        return {"seconds": min(timings), "peak_mb": None}
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": min(timings), "peak_mb": peak / 2**20}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(sizes=None, stages=None, freq="1min", repeat=3, seed=0, memory=True, verbose=True) -> dict:
+    """
+    Runs every stage on synthetic bars for each size in `sizes`, fully offline.
+
+    Returns:
+        dict: {'meta': {...}, 'results': [{'stage', 'bars', 'rows', 'seconds', 'peak_mb', 'per_row_us'}, ...]}
+    """
+    results = []
+    for size in sizes or DEFAULT_SIZES:
+        bars = synthetic_ohlcv(size, freq=freq, seed=seed)
+        fred = CannedFred(bars.index, seed=seed)
+        features_df, model = _stage_inputs(bars, fred)
+
+        for name, (fn, rows) in build_stages(bars, fred, features_df, model).items():
+            if stages and name not in stages:
+                continue
+            m = measure(fn, repeat=repeat, memory=memory)
+            result = {"stage": name, "bars": size, "rows": rows, **m,
+                      "per_row_us": m["seconds"] / max(rows, 1) * 1e6}
+            results.append(result)
+            if verbose:
+                print(f"⏱ {name:<27} bars={size:>10,} rows={rows:>10,} "
+                      f"{m['seconds']:>9.4f}s {result['per_row_us']:>10.2f}us/row "
+                      f"{m['peak_mb'] if m['peak_mb'] is not None else float('nan'):>9.1f}MB")
+
+    meta = {
+        "commit": _git_commit(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "freq": freq,
+        "repeat": repeat,
+    }
+    return {"meta": meta, "results": results}
+
+
+def compare(baseline: dict, current: dict, threshold=0.2, memory_threshold=0.2) -> list:
+    """
+    Lists stages that got slower (or used more memory) than the baseline by more than the thresholds.
+
+    Returns:
+        list[dict]: One entry per regression with the baseline and current values.
+    """
+    base = {(r["stage"], r["bars"]): r for r in baseline["results"]}
+    regressions = []
+    for r in current["results"]:
+        b = base.get((r["stage"], r["bars"]))
+        if b is None:
+            continue
+        for metric, limit in (("seconds", threshold), ("peak_mb", memory_threshold)):
+            if b[metric] and r[metric] is not None and r[metric] > b[metric] * (1 + limit):
+                regressions.append({"stage": r["stage"], "bars": r["bars"], "metric": metric,
+                                    "baseline": b[metric], "current": r[metric],
+                                    "ratio": r[metric] / b[metric]})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the MES pipeline hot paths.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="bar counts (1k .. 10M)")
+    parser.add_argument("--stages", nargs="+", help="subset of stages to run")
+    parser.add_argument("--freq", default="1min", help="synthetic bar frequency")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory run")
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown (0.2 = 20%%)")
+    parser.add_argument("--memory-threshold", type=float, default=0.2, help="allowed peak-memory growth")
+    args = parser.parse_args(argv)
+
+    current = run_suite(args.sizes, args.stages, freq=args.freq, repeat=args.repeat, memory=not args.no_memory)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"✅ Results written to {args.out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, current, args.threshold, args.memory_threshold)
+        for r in regressions:
+            print(f"❌ {r['stage']} @ {r['bars']:,} bars: {r['metric']} {r['baseline']:.4g} → {r['current']:.4g} "
+                  f"({r['ratio']:.2f}x)")
+        if regressions:
+            return 1
+        print(f"✅ No regressions against {args.baseline} (baseline commit {baseline['meta'].get('commit')})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+# === synthetic.py (offline MES-like bars and a canned FRED stand-in for benchmarks) ===
+import numpy as np
+import pandas as pd
+
+FRED_SERIES = {
+    "T10Y2Y": (0.5, 0.02),
+    "DFF": (4.5, 0.01),
+    "CPIAUCSL": (300.0, 0.05),
+    "VIXCLS": (17.0, 0.04),
+}
+
+
+def synthetic_ohlcv(n_bars: int, freq: str = "1min", end: str = "2025-01-03", start_price: float = 5000.0,
+                    seed: int = 0) -> pd.DataFrame:
+    """
+    Generates MES-like OHLCV bars: a random walk in log price with volatility clustering,
+    prices rounded to the 0.25 tick, in the same layout as `fetch_mes_data`.
+
+    Args:
+        n_bars (int): Number of bars.
+        freq (str): Bar frequency (pandas offset alias).
+        end (str): Timestamp of the last bar.
+        start_price (float): First close.
+        seed (int): Random seed.
+    """
+    rng = np.random.default_rng(seed)
+    # Volatility clustering: log-vol is a moving average of noise over roughly one session
+    window = 390
+    noise = np.concatenate([np.zeros(1), np.cumsum(rng.standard_normal(n_bars + window))])
+    log_vol = np.log(2e-4) + 0.3 * (noise[window:window + n_bars] - noise[:n_bars]) / np.sqrt(window)
+    returns = rng.standard_normal(n_bars) * np.exp(log_vol)
+
+    close = start_price * np.exp(np.cumsum(returns))
+    open_ = np.concatenate([[start_price], close[:-1]])
+    spread = np.abs(rng.standard_normal(n_bars)) * np.exp(log_vol) * close
+    high = np.maximum(open_, close) + spread
+    low = np.minimum(open_, close) - spread
+
+    tick = 0.25
+    index = pd.date_range(end=end, periods=n_bars, freq=freq, name="datetime")
+    return pd.DataFrame({
+        "Open": np.round(open_ / tick) * tick,
+        "High": np.round(high / tick) * tick,
+        "Low": np.round(low / tick) * tick,
+        "Close": np.round(close / tick) * tick,
+        "Volume": rng.integers(50, 5000, n_bars).astype(float),
+    }, index=index)
+
+
+class CannedFred:
+    """
+    Offline stand-in for `FredCache` that serves synthetic macro series for `add_features`.
+
+    The VIX stand-in is sampled on the bar index itself so the ES-VIX correlation is defined for
+    intraday bars too; the other series are daily.
+
+    Args:
+        index (pd.DatetimeIndex): Bar timestamps the series must cover.
+        seed (int): Random seed.
+    """
+
+    def __init__(self, index, seed=0):
+        rng = np.random.default_rng(seed)
+        days = pd.date_range(index.min().normalize(), index.max().normalize(), freq="D")
+        self.series = {}
+        for series_id, (level, vol) in FRED_SERIES.items():
+            obs_index = index if series_id == "VIXCLS" else days
+            walk = np.exp(np.cumsum(rng.normal(0, vol / np.sqrt(len(obs_index) or 1), len(obs_index))))
+            self.series[series_id] = pd.Series(level * walk, index=obs_index, name="value")
+
+    def get(self, series_ids, api_key=None, verbose=True):
+        return {sid: self.series[sid] for sid in series_ids if sid in self.series}
@@ -0,0 +1,263 @@
+# === cli.py (command-line entry point: live, backtest, tune, fetch) ===
+import os
+import sys
+import json
+import time
+import argparse
+
+# Startup is measured from here; everything heavy is imported inside the subcommand that needs it
+_START = time.perf_counter()
+
+
+def _elapsed():
+    return time.perf_counter() - _START
+
+
+def _report_startup(logger, budget, stage="ready"):
+    """Logs time since CLI import against the startup budget (warning when over it)."""
+    from src.monitoring.metrics import metrics
+    seconds = _elapsed()
+    metrics.latency.record(f"startup.{stage}", seconds)
+    if budget is not None and seconds > budget:
+        logger.warning(f"⏱ Startup ({stage}) took {seconds:.2f}s, over the {budget:.2f}s budget")
+    else:
+        logger.info(f"⏱ Startup ({stage}) took {seconds:.2f}s")
+    return seconds
+
+
+def _load_bars(args):
+    # Bars for backtest / tune: a CSV of fetch_mes_data output or a CandleStore range
+    import pandas as pd
+    if args.csv:
+        return pd.read_csv(args.csv, index_col=0, parse_dates=True)
+    from src.data.candle_store import CandleStore
+    from src.data.contracts import front_month
+    bars = CandleStore(args.store).read(args.symbol or front_month("MES"), start=args.start, end=args.end)
+    if args.interval != "1min":
+        from src.data.bars import resample_bars
+        bars = resample_bars(bars, args.interval)
+    return bars
+
+
+def _fred_cache(args):
+    if not (args.fred_cache or args.fred_key):
+        return None
+    from src.data.fred_cache import FredCache
+    return FredCache(args.fred_cache or "data/fred", api_key=args.fred_key, offline=args.fred_offline)
+
+
+def _result_cache(args):
+    if not args.result_cache:
+        return None
+    from src.strategies.result_cache import ResultCache
+    return ResultCache(args.result_cache)
+
+
+def _params(args):
+    from src.config.strategy_params import best_strategy_params, best_rf_params, load_params
+    if args.params:
+        return load_params(args.params)
+    return best_strategy_params, best_rf_params
+
+
+def cmd_fetch(args, logger):
+    from src.api.schwab_data import fetch_mes_data
+    _report_startup(logger, args.startup_budget)
+    if args.store:
+        from src.data.candle_store import CandleStore
+        df = CandleStore(args.store).sync(args.token, symbol=args.symbol, lookback_days=args.lookback_days)
+    else:
+        df = fetch_mes_data(args.token, symbol=args.symbol, interval=args.interval, lookback_days=args.lookback_days)
+    if df is None or df.empty:
+        logger.warning("⚠️ No candles returned")
+        return 1
+    if args.out:
+        df.to_csv(args.out)
+    logger.info(f"✅ {len(df)} candles, {df.index.min()} → {df.index.max()}")
+    return 0
+
+
+def cmd_live(args, logger):
+    from src.features.engineering import final_features
+    fred_cache = _fred_cache(args)
+    registry = store = None
+    if args.registry:
+        from src.models.registry import ModelRegistry
+        registry = ModelRegistry(args.registry, refit_every=args.refit_every)
+    if args.store:
+        from src.data.candle_store import CandleStore
+        store = CandleStore(args.store)
+
+    if args.once:
+        from src.strategies.live_recommender import run_live_signal
+        _report_startup(logger, args.startup_budget)
+        result = run_live_signal(args.token, final_features, registry=registry, store=store,
+                                 fred_api_key=args.fred_key, fred_cache=fred_cache)
+        _report_startup(logger, None, stage="first_signal")
+        print(json.dumps(result, default=str))
+        return 0
+
+    from src.strategies.live_engine import run_live_engine
+    _report_startup(logger, args.startup_budget)
+    summary = run_live_engine(args.token, final_features, symbol=args.symbol, lookback_days=args.lookback_days,
+                              fred_api_key=args.fred_key, fred_cache=fred_cache, registry=registry, store=store,
+                              max_bars=args.max_bars, verbose=True)
+    print(json.dumps(summary, default=str, indent=2))
+    return 0
+
+
+def cmd_backtest(args, logger):
+    from src.features.engineering import add_features, final_features
+    from src.strategies.walkforward import run_wfv_with_params
+    _report_startup(logger, args.startup_budget)
+    strategy_params, rf_params = _params(args)
+    if args.stream:
+        if not args.store or args.interval != "1min":
+            logger.error("❌ --stream reads 1-minute bars from --store")
+            return 2
+        from src.data.candle_store import CandleStore
+        from src.data.contracts import front_month
+    else:
+        df = add_features(_load_bars(args), args.fred_key, verbose=True, fred_cache=_fred_cache(args))
+    if args.model == "random_forest":
+        from sklearn.ensemble import RandomForestClassifier as model_cls
+    else:
+        from src.models.backends import BACKENDS
+        model_cls = BACKENDS[args.model]
+        rf_params = {}
+    if args.model_params:
+        rf_params = json.loads(args.model_params)
+    if args.stream:
+        from src.features.engineering import iter_feature_chunks
+        from src.strategies.streaming import run_wfv_streaming
+        symbol = args.symbol or front_month("MES")
+        chunks = iter_feature_chunks(CandleStore(args.store).iter_chunks(symbol, args.start, args.end),
+                                     args.fred_key, fred_cache=_fred_cache(args))
+        stats = run_wfv_streaming(chunks, final_features, model_cls, rf_params, args.stream,
+                                  train_size=args.train_size, test_size=args.test_size, n_jobs=args.n_jobs,
+                                  seed=args.seed, plot=args.plot, vectorized_exits=True,
+                                  **{k: v for k, v in strategy_params.items() if k != 'short_signals'},
+                                  short_signals=strategy_params.get('short_signals', args.short))
+        print(json.dumps({k: float(v) for k, v in stats.items()}, indent=2))
+        return 0
+    results, trades, stats = run_wfv_with_params(
+        df, final_features, model_cls, rf_params, train_size=args.train_size, test_size=args.test_size,
+        plot=args.plot or False, n_jobs=args.n_jobs, seed=args.seed, vectorized_exits=True,
+        result_cache=_result_cache(args),
+        **{k: v for k, v in strategy_params.items() if k != 'short_signals'},
+        short_signals=strategy_params.get('short_signals', args.short))
+    if args.out:
+        results.to_csv(args.out)
+    if args.trades:
+        trades.to_csv(args.trades, index=False)
+    print(json.dumps({k: float(v) for k, v in stats.items()}, indent=2))
+    return 0
+
+
+def cmd_tune(args, logger):
+    from src.features.engineering import add_features, final_features
+    from src.strategies.tuning import tune
+    _report_startup(logger, args.startup_budget)
+    df = add_features(_load_bars(args), args.fred_key, verbose=True, fred_cache=_fred_cache(args))
+    study, path = tune(df, final_features, n_trials=args.trials, n_workers=args.workers, study_name=args.study,
+                       storage_path=args.storage, seed=args.seed, output_dir=args.output_dir,
+                       result_cache=_result_cache(args),
+                       wfv_kwargs={"train_size": args.train_size, "test_size": args.test_size})
+    print(json.dumps({"score": study.best_value, "params": study.best_params, "path": path}, indent=2))
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m src", description="MES trade recommender.")
+    parser.add_argument("--log-level", default="INFO")
+    parser.add_argument("--json-logs", action="store_true", help="one JSON object per log line")
+    parser.add_argument("--metrics", help="write spans and counters to this JSON file on exit")
+    parser.add_argument("--startup-budget", type=float, default=1.0,
+                        help="seconds from launch to a ready subcommand before a warning is logged")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def common(p, token=True):
+        if token:
+            p.add_argument("--token", default=os.environ.get("SCHWAB_ACCESS_TOKEN"),
+                           help="Schwab access token (default $SCHWAB_ACCESS_TOKEN)")
+        p.add_argument("--symbol", help="contract symbol (default MES front month)")
+        p.add_argument("--fred-key", default=os.environ.get("FRED_API_KEY"), help="default $FRED_API_KEY")
+        p.add_argument("--fred-cache", help="FRED cache directory")
+        p.add_argument("--fred-offline", action="store_true", help="serve FRED series from the cache only")
+        p.add_argument("--store", help="CandleStore directory")
+
+    def data(p):
+        common(p, token=False)
+        p.add_argument("--csv", help="bars CSV (fetch_mes_data output) instead of --store")
+        p.add_argument("--start")
+        p.add_argument("--end")
+        p.add_argument("--interval", default="1min", help="bar resolution (1min, 5min, 15min, 1h, session, daily)")
+        p.add_argument("--params", help="tuned parameter file (default src.config.strategy_params)")
+        p.add_argument("--train-size", type=int, default=60)
+        p.add_argument("--test-size", type=int, default=10)
+        p.add_argument("--seed", type=int, default=0)
+        p.add_argument("--result-cache", help="directory caching finished walk-forward runs by data and parameters")
+
+    p = sub.add_parser("fetch", help="download candles into a CSV or candle store")
+    common(p)
+    p.add_argument("--interval", default="1min")
+    p.add_argument("--lookback-days", type=int, default=5)
+    p.add_argument("--out", help="CSV path")
+    p.set_defaults(run=cmd_fetch)
+
+    p = sub.add_parser("live", help="run the live engine (or one signal with --once)")
+    common(p)
+    p.add_argument("--registry", help="model registry directory")
+    p.add_argument("--refit-every", default="1D",
+                   help="reuse a stored model until the data moves on by this much (default 1D)")
+    p.add_argument("--lookback-days", type=int, default=5)
+    p.add_argument("--max-bars", type=int)
+    p.add_argument("--once", action="store_true", help="score the latest bar and exit")
+    p.set_defaults(run=cmd_live)
+
+    p = sub.add_parser("backtest", help="walk-forward backtest")
+    data(p)
+    p.add_argument("--model", default="random_forest", choices=["random_forest", "hist_gb", "logistic"])
+    p.add_argument("--model-params", help="model hyperparameters as JSON (default: tuned RF params for the forest)")
+    p.add_argument("--short", action="store_true", help="take short signals")
+    p.add_argument("--n-jobs", type=int, default=1)
+    p.add_argument("--plot", help="save the cumulative return chart here (headless)")
+    p.add_argument("--out", help="per-bar results CSV")
+    p.add_argument("--trades", help="trade log CSV")
+    p.add_argument("--stream", metavar="DIR", help="out-of-core run over --store, writing results to DIR")
+    p.set_defaults(run=cmd_backtest)
+
+    p = sub.add_parser("tune", help="parallel Optuna search over the walk-forward backtest")
+    data(p)
+    p.add_argument("--trials", type=int, default=500)
+    p.add_argument("--workers", type=int)
+    p.add_argument("--study", default="mes_wfv")
+    p.add_argument("--storage", default="optuna_journal.log")
+    p.add_argument("--output-dir", default="data/tuned", help="where tuned parameter files are written")
+    p.set_defaults(run=cmd_tune)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    from src.monitoring.log import configure_logging
+    logger = configure_logging(args.log_level, json_format=args.json_logs)
+    if getattr(args, "token", "") is None:
+        logger.error("❌ A Schwab access token is required (--token or $SCHWAB_ACCESS_TOKEN)")
+        return 2
+    if hasattr(args, "csv") and not (args.csv or args.store):
+        logger.error("❌ Pass bars with --csv or --store")
+        return 2
+    if args.command != "fetch" and not (args.fred_key or args.fred_cache):
+        logger.error("❌ The macro features need FRED data (--fred-key, $FRED_API_KEY or --fred-cache)")
+        return 2
+    try:
+        return args.run(args, logger)
+    finally:
+        if args.metrics:
+            from src.monitoring.metrics import metrics
+            metrics.to_json(args.metrics)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,5 @@
+import json
+
 best_strategy_params = {
     'confidence_threshold': 0.551569875903487,
     'atr_mult': 2.4844849418131574,
@@ -8,3 +10,15 @@ best_strategy_params = {
 }
 
 best_rf_params = {'n_estimators': 27, 'max_depth': 2}
+
+
+def load_params(path: str):
+    """
+    Loads a tuned parameter file.
+
+    Returns:
+        (dict, dict): best_strategy_params and best_rf_params.
+    """
+    with open(path) as f:
+        config = json.load(f)
+    return config["best_strategy_params"], config["best_rf_params"]
@@ -0,0 +1,261 @@
+# === bars.py (multi-resolution OHLCV bars from the 1-minute stream, CME session aware) ===
+import os
+import json
+import numpy as np
+import pandas as pd
+from src.data.candle_store import CANDLE_DTYPE, _to_records, _to_frame
+from src.monitoring.metrics import metrics
+
+OHLCV = ["Open", "High", "Low", "Close", "Volume"]
+EXCHANGE_TZ = "America/Chicago"
+
+# CME equity index futures: the trade day runs 17:00 CT (previous evening) to 16:00 CT, and the
+# regular (day) session 08:30-15:15 CT. Shifting by 7h maps 17:00 CT onto midnight of the trade date.
+TRADE_DAY_SHIFT = pd.Timedelta(hours=7)
+TRADE_DAY_END = pd.Timedelta(hours=16)
+RTH_START = pd.Timedelta(hours=8, minutes=30)
+RTH_END = pd.Timedelta(hours=15, minutes=15)
+
+INTRADAY_SECONDS = {"1min": 60, "5min": 300, "15min": 900, "1h": 3600}
+RESOLUTIONS = list(INTRADAY_SECONDS) + ["session", "daily"]
+ALIASES = {"1day": "daily", "60min": "1h"}
+
+# Bars per year, for annualising per-bar statistics (about 23 trading hours a day, 252 days)
+PERIODS_PER_YEAR = {"1min": 252 * 23 * 60, "5min": 252 * 23 * 12, "15min": 252 * 23 * 4, "1h": 252 * 23,
+                    "session": 252, "daily": 252}
+
+
+def resolution_name(resolution: str) -> str:
+    name = ALIASES.get(resolution, resolution)
+    if name not in RESOLUTIONS:
+        raise ValueError(f"Unknown bar resolution '{resolution}', expected one of {RESOLUTIONS}")
+    return name
+
+
+def _utc_ns(index) -> np.ndarray:
+    return np.asarray(index.values, dtype="datetime64[ns]").astype(np.int64)
+
+
+def _local_ns(utc_ns: np.ndarray) -> np.ndarray:
+    local = pd.DatetimeIndex(utc_ns).tz_localize("UTC").tz_convert(EXCHANGE_TZ).tz_localize(None)
+    return local.asi8
+
+
+def bucket_labels(utc_ns, resolution: str, local_ns=None):
+    """
+    Bucket label (ns) of every 1-minute bar for one resolution, plus a mask of bars that belong to any bucket.
+
+    Intraday buckets are labelled by their start time (like the 1-minute bars), 'session' by the
+    date of the regular session (overnight bars are excluded) and 'daily' by the CME trade date
+    (bars in the daily maintenance break are excluded).
+    """
+    resolution = resolution_name(resolution)
+    if resolution in INTRADAY_SECONDS:
+        width = INTRADAY_SECONDS[resolution] * 1_000_000_000
+        return utc_ns - utc_ns % width, np.ones(len(utc_ns), dtype=bool)
+
+    local_ns = _local_ns(utc_ns) if local_ns is None else local_ns
+    day = 86_400 * 1_000_000_000
+    if resolution == "session":
+        time_of_day = local_ns % day
+        mask = (time_of_day >= RTH_START.value) & (time_of_day < RTH_END.value)
+        return local_ns - time_of_day, mask
+    # Bars inside the 16:00-17:00 CT maintenance break belong to no trade day
+    time_of_day = local_ns % day
+    mask = (time_of_day < TRADE_DAY_END.value) | (time_of_day >= day - TRADE_DAY_SHIFT.value)
+    shifted = local_ns + TRADE_DAY_SHIFT.value
+    return shifted - shifted % day, mask
+
+
+def _reduce(labels, o, h, l, c, v) -> pd.DataFrame:
+    if len(labels) == 0:
+        return pd.DataFrame({col: np.empty(0) for col in OHLCV},
+                            index=pd.DatetimeIndex([], name="datetime"))
+    starts = np.flatnonzero(np.r_[True, labels[1:] != labels[:-1]])
+    ends = np.r_[starts[1:], len(labels)] - 1
+    index = pd.DatetimeIndex(labels[starts].astype("datetime64[ns]"), name="datetime")
+    return pd.DataFrame({
+        "Open": o[starts],
+        "High": np.maximum.reduceat(h, starts),
+        "Low": np.minimum.reduceat(l, starts),
+        "Close": c[ends],
+        "Volume": np.add.reduceat(v, starts),
+    }, index=index)
+
+
+def resample_all(df: pd.DataFrame, resolutions=RESOLUTIONS) -> dict:
+    """
+    Builds coarser OHLCV bars from 1-minute bars for several resolutions at once. Prices and
+    timestamps are extracted (and converted to exchange time) once and shared by every resolution.
+
+    Args:
+        df (pd.DataFrame): 1-minute OHLCV bars indexed by naive UTC timestamp (`fetch_mes_data` layout).
+        resolutions: Names from RESOLUTIONS (or ALIASES).
+
+    Returns:
+        dict: {resolution: OHLCV DataFrame}.
+    """
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+    utc_ns = _utc_ns(df.index)
+    cols = [df[col].to_numpy(dtype=float) for col in OHLCV]
+    local_ns = None
+    bars = {}
+    for resolution in resolutions:
+        name = resolution_name(resolution)
+        if name not in INTRADAY_SECONDS and local_ns is None:
+            local_ns = _local_ns(utc_ns)
+        labels, mask = bucket_labels(utc_ns, name, local_ns)
+        if mask.all():
+            out = _reduce(labels, *cols)
+        else:
+            out = _reduce(labels[mask], *(col[mask] for col in cols))
+        # Keep the input's datetime resolution (ms for CandleStore reads)
+        out.index = out.index.as_unit(df.index.unit)
+        bars[resolution] = out
+    return bars
+
+
+def resample_bars(df: pd.DataFrame, resolution: str) -> pd.DataFrame:
+    """Coarser OHLCV bars for a single resolution (see `resample_all`)."""
+    return resample_all(df, [resolution])[resolution]
+
+
+class BarAggregator:
+    """
+    Streaming counterpart of `resample_all`: feeds 1-minute bars one at a time and emits each
+    coarser bar as soon as its last minute has closed (or, for gaps, when the next bucket starts).
+
+    Args:
+        resolutions: Resolutions to build.
+        base_seconds (int): Length of the incoming bars.
+    """
+
+    def __init__(self, resolutions=("5min", "15min", "1h", "session", "daily"), base_seconds=60):
+        self.resolutions = [resolution_name(r) for r in resolutions]
+        self.base_ns = base_seconds * 1_000_000_000
+        self._open = {}
+
+    def update(self, timestamp, candle) -> list:
+        """
+        Adds one 1-minute bar.
+
+        Returns:
+            list: Completed (resolution, timestamp, bar dict) tuples, possibly empty.
+        """
+        utc_ns = np.array([pd.Timestamp(timestamp).value], dtype=np.int64)
+        local_ns = None
+        bar = [float(candle[col]) for col in OHLCV]
+        completed = []
+        for resolution in self.resolutions:
+            if resolution not in INTRADAY_SECONDS and local_ns is None:
+                local_ns = _local_ns(utc_ns)
+            labels, mask = bucket_labels(utc_ns, resolution, local_ns)
+            if not mask[0]:
+                continue
+            label = int(labels[0])
+
+            current = self._open.get(resolution)
+            if current is not None and current[0] != label:
+                completed.append(self._emit(resolution))
+                current = None
+            if current is None:
+                self._open[resolution] = [label] + bar
+            else:
+                current[2] = max(current[2], bar[1])
+                current[3] = min(current[3], bar[2])
+                current[4] = bar[3]
+                current[5] += bar[4]
+
+            if self._closes_bucket(resolution, label, utc_ns[0], local_ns):
+                completed.append(self._emit(resolution))
+        return completed
+
+    def _closes_bucket(self, resolution, label, utc_ns, local_ns) -> bool:
+        if resolution in INTRADAY_SECONDS:
+            return utc_ns + self.base_ns >= label + INTRADAY_SECONDS[resolution] * 1_000_000_000
+        end = label + (RTH_END.value if resolution == "session" else TRADE_DAY_END.value)
+        return local_ns[0] + self.base_ns >= end
+
+    def _emit(self, resolution):
+        label, *values = self._open.pop(resolution)
+        return resolution, pd.Timestamp(label), dict(zip(OHLCV, values))
+
+    def flush(self) -> list:
+        """Emits every partially built bar (e.g. at the end of a replay)."""
+        return [self._emit(resolution) for resolution in list(self._open)]
+
+
+class BarCache:
+    """
+    Resampled bars per symbol and resolution, built from a `CandleStore` and kept on disk so
+    features and walk-forward runs at any resolution do not refetch or re-resample history.
+
+    Layout: <root>/<symbol>/<resolution>.npy (CANDLE_DTYPE records) with a .json sidecar holding
+    the source range it was built from. When new minutes are appended only the last (possibly
+    incomplete) bucket onwards is rebuilt; a change at the start of the source rebuilds everything.
+
+    Args:
+        store (CandleStore): Source of 1-minute bars.
+        root (str): Cache directory (defaults to <store.root>/_bars).
+    """
+
+    def __init__(self, store, root=None):
+        self.store = store
+        self.root = root or os.path.join(store.root, "_bars")
+
+    def _paths(self, symbol: str, resolution: str):
+        base = os.path.join(self.root, symbol.lstrip("/"), resolution)
+        return base + ".npy", base + ".json"
+
+    def _load(self, symbol, resolution):
+        npy_path, meta_path = self._paths(symbol, resolution)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            return np.load(npy_path), meta
+        except (OSError, ValueError):
+            return None, None
+
+    def _save(self, symbol, resolution, records, meta):
+        npy_path, meta_path = self._paths(symbol, resolution)
+        os.makedirs(os.path.dirname(npy_path), exist_ok=True)
+        for path, dump in ((npy_path, lambda f: np.save(f, records)),
+                           (meta_path, lambda f: f.write(json.dumps(meta).encode()))):
+            with open(path + ".tmp", "wb") as f:
+                dump(f)
+            os.replace(path + ".tmp", path)
+
+    def get(self, symbol: str, resolution: str, start=None, end=None) -> pd.DataFrame:
+        """
+        Bars of `resolution` with labels in [start, end], refreshing the cache from the store first.
+        """
+        resolution = resolution_name(resolution)
+        days = self.store.days(symbol)
+        if not days:
+            return _to_frame(np.empty(0, dtype=CANDLE_DTYPE))
+        first = str(self.store.read(symbol, end=f"{days[0]} 23:59:59.999").index[0])
+        last = str(self.store.last_timestamp(symbol))
+
+        records, meta = self._load(symbol, resolution)
+        if records is None or meta["source_first"] != first:
+            records, meta = np.empty(0, dtype=CANDLE_DTYPE), {"tail_start": None}
+        if meta.get("source_last") == last:
+            metrics.count("cache_hits", cache="bars")
+        else:
+            metrics.count("cache_misses", cache="bars")
+            minutes = self.store.read(symbol, start=meta["tail_start"])
+            bars = resample_bars(minutes, resolution)
+            if len(bars):
+                records = records[records["datetime"] < _to_records(bars)["datetime"][0]]
+                records = np.concatenate([records, _to_records(bars)])
+                labels, mask = bucket_labels(_utc_ns(minutes.index), resolution)
+                tail = np.flatnonzero(mask & (labels == labels[mask][-1]))[0]
+                meta["tail_start"] = str(minutes.index[tail])
+            meta.update(source_first=first, source_last=last)
+            self._save(symbol, resolution, records, meta)
+
+        bars = _to_frame(records)
+        lo = None if start is None else pd.Timestamp(start)
+        hi = None if end is None else pd.Timestamp(end)
+        return bars.loc[lo:hi]
@@ -0,0 +1,146 @@
+# === candle_store.py (local day-partitioned OHLCV store with incremental Schwab backfill) ===
+import os
+import numpy as np
+import pandas as pd
+from src.api.schwab_data import fetch_mes_data
+from src.data.contracts import front_month
+
+CANDLE_DTYPE = np.dtype([
+    ("datetime", "i8"), ("Open", "f8"), ("High", "f8"), ("Low", "f8"), ("Close", "f8"), ("Volume", "f8"),
+])
+OHLCV = ["Open", "High", "Low", "Close", "Volume"]
+MS_PER_DAY = 86_400_000
+
+
+def _to_records(df: pd.DataFrame) -> np.ndarray:
+    records = np.empty(len(df), dtype=CANDLE_DTYPE)
+    records["datetime"] = df.index.values.astype("datetime64[ms]").astype("int64")
+    for col in OHLCV:
+        records[col] = df[col].to_numpy(dtype=float)
+    return records
+
+
+def _to_frame(records: np.ndarray) -> pd.DataFrame:
+    index = pd.to_datetime(records["datetime"], unit="ms")
+    index.name = "datetime"
+    return pd.DataFrame({col: records[col] for col in OHLCV}, index=index)
+
+
+class CandleStore:
+    """
+    Append-only candle store with one memory-mappable .npy partition per symbol and UTC day.
+
+    Layout: <root>/<symbol>/<YYYY-MM-DD>.npy, each a sorted structured array of
+    (datetime ms, Open, High, Low, Close, Volume).
+
+    Args:
+        root (str): Directory holding the store.
+    """
+
+    def __init__(self, root="data/candles"):
+        self.root = root
+
+    def _dir(self, symbol: str) -> str:
+        return os.path.join(self.root, symbol.lstrip("/"))
+
+    def days(self, symbol: str) -> list:
+        """Sorted list of stored day partitions (as 'YYYY-MM-DD' strings)."""
+        try:
+            return sorted(f[:-4] for f in os.listdir(self._dir(symbol)) if f.endswith(".npy"))
+        except FileNotFoundError:
+            return []
+
+    def _load_day(self, symbol: str, day: str, mmap=True) -> np.ndarray:
+        return np.load(os.path.join(self._dir(symbol), f"{day}.npy"), mmap_mode="r" if mmap else None)
+
+    def last_timestamp(self, symbol: str):
+        """Timestamp of the latest stored candle, or None if the symbol has no data."""
+        days = self.days(symbol)
+        if not days:
+            return None
+        return pd.to_datetime(int(self._load_day(symbol, days[-1])["datetime"][-1]), unit="ms")
+
+    def append(self, symbol: str, df: pd.DataFrame) -> int:
+        """
+        Merges candles into their day partitions. Candles with an already stored timestamp replace
+        the stored one (the last candle of a previous fetch may have been incomplete).
+
+        Returns:
+            int: Number of candles written.
+        """
+        if df is None or df.empty:
+            return 0
+        os.makedirs(self._dir(symbol), exist_ok=True)
+        records = _to_records(df)
+        day_ids = records["datetime"] // MS_PER_DAY
+
+        for day_id in np.unique(day_ids):
+            new = records[day_ids == day_id]
+            day = str(np.datetime64(int(day_id), "D"))
+            path = os.path.join(self._dir(symbol), f"{day}.npy")
+            if os.path.exists(path):
+                new = np.concatenate([new, self._load_day(symbol, day, mmap=False)])
+            # np.unique keeps the first occurrence, i.e. the freshly fetched candle
+            _, keep = np.unique(new["datetime"], return_index=True)
+            merged = new[keep]
+
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                np.save(f, merged)
+            os.replace(tmp, path)
+        return len(records)
+
+    def read(self, symbol: str, start=None, end=None) -> pd.DataFrame:
+        """
+        Reads candles in [start, end] from the memory-mapped day partitions, in the same
+        format as `fetch_mes_data`.
+        """
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+        days = [d for d in self.days(symbol)
+                if (start is None or d >= str(start.date())) and (end is None or d <= str(end.date()))]
+        if not days:
+            return _to_frame(np.empty(0, dtype=CANDLE_DTYPE))
+
+        records = np.concatenate([self._load_day(symbol, d) for d in days])
+        times = records["datetime"]
+        lo = 0 if start is None else np.searchsorted(times, int(start.value // 1_000_000), side="left")
+        hi = len(times) if end is None else np.searchsorted(times, int(end.value // 1_000_000), side="right")
+        return _to_frame(records[lo:hi])
+
+    def iter_chunks(self, symbol: str, start=None, end=None, days_per_chunk: int = 20):
+        """
+        Yields candles in [start, end] as consecutive frames of `days_per_chunk` day partitions,
+        so long histories can be processed without loading them whole.
+        """
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+        days = [d for d in self.days(symbol)
+                if (start is None or d >= str(start.date())) and (end is None or d <= str(end.date()))]
+        for k in range(0, len(days), days_per_chunk):
+            group = days[k:k + days_per_chunk]
+            lo = max(start, pd.Timestamp(group[0])) if start is not None else group[0]
+            hi = f"{group[-1]} 23:59:59.999"
+            if end is not None and end < pd.Timestamp(hi):
+                hi = end
+            chunk = self.read(symbol, start=lo, end=hi)
+            if len(chunk):
+                yield chunk
+
+    def sync(self, access_token: str, symbol: str = None, lookback_days: int = 5) -> pd.DataFrame:
+        """
+        Fetches only the candles newer than the last stored one (or the full lookback on first use),
+        appends them and returns the last `lookback_days` of stored candles. `symbol` defaults to the MES front month.
+        """
+        symbol = symbol or front_month("MES")
+        last = self.last_timestamp(symbol)
+        if last is None:
+            fetched = fetch_mes_data(access_token, symbol=symbol, lookback_days=lookback_days)
+        else:
+            fetched = fetch_mes_data(access_token, symbol=symbol, start_date=last)
+        self.append(symbol, fetched)
+
+        latest = self.last_timestamp(symbol)
+        if latest is None:
+            return None
+        return self.read(symbol, start=latest.normalize() - pd.Timedelta(days=lookback_days - 1))
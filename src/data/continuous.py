@@ -0,0 +1,219 @@
+# === continuous.py (back-adjusted continuous futures series stitched across quarterly rolls) ===
+import os
+import json
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from src.api.schwab_data import fetch_mes_data
+from src.data.bars import bucket_labels, _utc_ns
+from src.data.candle_store import CANDLE_DTYPE, _to_records, _to_frame
+from src.data.contracts import contract_months, contract_symbol, contract_symbols, parse_symbol, expiry, roll_date
+from src.monitoring.log import get_logger
+from src.monitoring.metrics import metrics
+
+logger = get_logger(__name__)
+
+PRICES = ["Open", "High", "Low", "Close"]
+
+
+def _trade_days(df: pd.DataFrame) -> np.ndarray:
+    labels, _ = bucket_labels(_utc_ns(df.index), "daily")
+    return labels
+
+
+def _volume_roll(cur, nxt, cur_days, nxt_days, last_day):
+    """First trade date after the next contract's daily volume overtook the current one's (None if it never did)."""
+    cur_volume = pd.Series(cur["Volume"].to_numpy(dtype=float)).groupby(cur_days).sum()
+    nxt_volume = pd.Series(nxt["Volume"].to_numpy(dtype=float)).groupby(nxt_days).sum()
+    both = pd.concat([cur_volume, nxt_volume], axis=1, keys=["cur", "nxt"]).dropna()
+    both = both[both.index <= last_day]
+    crossed = both.index[both["nxt"] > both["cur"]]
+    if len(crossed) == 0:
+        return None
+    # Volume is only known once the day is over, so switch on the following trade date
+    later = np.unique(nxt_days[nxt_days > crossed[0]])
+    return int(later[0]) if len(later) else None
+
+
+def stitch(frames: dict, method="volume", adjustment="difference"):
+    """
+    Stitches consecutive contract months into one continuous series.
+
+    Roll dates are detected per pair of contracts: with method='volume' on the trade date after
+    the next contract's daily volume first exceeds the current one's (falling back to the calendar
+    roll when it never does, e.g. on missing data), with method='calendar' on the CME roll date
+    (8 days before expiry). Open interest is not part of Schwab candles, so it is not used.
+
+    Prices before each roll are back-adjusted so the series has no roll gaps: adjustment='difference'
+    adds the price gap between the contracts at the last bar before the roll, 'ratio' multiplies by
+    their price ratio and 'none' leaves the raw prices.
+
+    Args:
+        frames (dict): {symbol: 1-minute OHLCV DataFrame}, oldest contract first.
+        method (str): 'volume' or 'calendar'.
+        adjustment (str): 'difference', 'ratio' or 'none'.
+
+    Returns:
+        (pd.DataFrame, pd.DataFrame): The continuous OHLCV series and one row per roll
+        (date, from, to, timestamp, gap).
+    """
+    if method not in ("volume", "calendar"):
+        raise ValueError(f"Unknown roll method '{method}'")
+    if adjustment not in ("difference", "ratio", "none"):
+        raise ValueError(f"Unknown adjustment '{adjustment}'")
+
+    symbols = [s for s, df in frames.items() if df is not None and len(df)]
+    if not symbols:
+        return _to_frame(np.empty(0, dtype=CANDLE_DTYPE)), pd.DataFrame(
+            columns=["date", "from", "to", "timestamp", "gap"])
+    frames = {s: frames[s].sort_index() for s in symbols}
+    days = {s: _trade_days(frames[s]) for s in symbols}
+
+    # Trade-date boundaries: contract k is used for trade dates in [bounds[k - 1], bounds[k])
+    bounds = []
+    for cur, nxt in zip(symbols, symbols[1:]):
+        _, year, month = parse_symbol(cur, reference=frames[cur].index[-1])
+        boundary = None
+        if method == "volume":
+            boundary = _volume_roll(frames[cur], frames[nxt], days[cur], days[nxt], expiry(year, month).value)
+        if boundary is None:
+            boundary = roll_date(year, month).value
+        bounds.append(max(boundary, bounds[-1]) if bounds else boundary)
+
+    segments, rolls = [], []
+    for k, symbol in enumerate(symbols):
+        lo = bounds[k - 1] if k > 0 else np.iinfo(np.int64).min
+        hi = bounds[k] if k < len(bounds) else np.iinfo(np.int64).max
+        segments.append(frames[symbol][(days[symbol] >= lo) & (days[symbol] < hi)])
+
+    for k in range(len(bounds)):
+        old, new = segments[k], frames[symbols[k + 1]]
+        ts, gap = None, 1.0 if adjustment == "ratio" else 0.0
+        if not old.empty:
+            ts = old.index[-1]
+            old_price = old["Close"].iloc[-1]
+            # Prefer the new contract's close at the same bar, else its first open after the roll
+            same_bar = new["Close"][new.index <= ts]
+            if len(same_bar):
+                new_price = same_bar.iloc[-1]
+            elif len(segments[k + 1]):
+                new_price = segments[k + 1]["Open"].iloc[0]
+            else:
+                new_price = old_price
+            gap = new_price / old_price if adjustment == "ratio" else new_price - old_price
+        rolls.append({"date": pd.Timestamp(bounds[k]), "from": symbols[k], "to": symbols[k + 1],
+                      "timestamp": ts, "gap": gap})
+
+    # Each segment is shifted by every roll gap that comes after it
+    gaps = [roll["gap"] for roll in rolls]
+    adjusted = []
+    for k, segment in enumerate(segments):
+        segment = segment.copy()
+        if adjustment == "difference":
+            segment[PRICES] = segment[PRICES] + sum(gaps[k:])
+        elif adjustment == "ratio":
+            segment[PRICES] = segment[PRICES] * np.prod(gaps[k:])
+        adjusted.append(segment)
+
+    series = pd.concat(adjusted)
+    return series[["Open", "High", "Low", "Close", "Volume"]], pd.DataFrame(rolls)
+
+
+class ContinuousContract:
+    """
+    Builds and caches the continuous series of one futures root (e.g. 'MES') from the contract
+    months held in a `CandleStore`.
+
+    The stitched series is written to <cache_dir>/<root>_<method>_<adjustment>.npy with a .json
+    sidecar recording the rolls and the state of every source contract, so it is only rebuilt when
+    a contract month gains data (back-adjustment changes the whole history at each roll).
+
+    Args:
+        store (CandleStore): Holds 1-minute candles per contract symbol.
+        root (str): Futures root symbol.
+        method, adjustment: See `stitch`.
+        cache_dir (str): Defaults to <store.root>/_continuous.
+    """
+
+    def __init__(self, store, root="MES", method="volume", adjustment="difference", cache_dir=None):
+        self.store = store
+        self.root = root
+        self.method = method
+        self.adjustment = adjustment
+        self.cache_dir = cache_dir or os.path.join(store.root, "_continuous")
+
+    def contracts(self, start, end=None) -> list:
+        return contract_symbols(self.root, start, end if end is not None else pd.Timestamp.now())
+
+    def sync(self, access_token, start, end=None, max_workers=4) -> dict:
+        """
+        Fetches missing candles for every contract month between start and end concurrently.
+        Contracts that already hold data through expiry are skipped.
+
+        Returns:
+            dict: {symbol: candles written}.
+        """
+        now = pd.Timestamp.now(tz="UTC").tz_localize(None)
+        months = contract_months(start, end if end is not None else now)
+        symbols = [contract_symbol(self.root, year, month) for year, month in months]
+
+        def fetch(symbol, year, month):
+            last = self.store.last_timestamp(symbol)
+            if last is not None and last >= expiry(year, month):
+                return 0
+            until = min(expiry(year, month) + pd.Timedelta(days=1), now)
+            # Start a few weeks before the previous roll so the volume crossover is covered
+            since = last if last is not None else \
+                roll_date(year, month) - pd.DateOffset(months=3) - pd.Timedelta(days=21)
+            return self.store.append(symbol, fetch_mes_data(access_token, symbol=symbol, start_date=since,
+                                                            end_date=until))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return dict(zip(symbols, pool.map(fetch, symbols, *zip(*months))))
+
+    def _paths(self):
+        base = os.path.join(self.cache_dir, f"{self.root}_{self.method}_{self.adjustment}")
+        return base + ".npy", base + ".json"
+
+    def build(self, start, end=None, verbose=True):
+        """
+        Returns the continuous series in [start, end] and its rolls, from the cache when no source
+        contract changed since it was built.
+
+        Returns:
+            (pd.DataFrame, pd.DataFrame): OHLCV series and rolls (see `stitch`).
+        """
+        symbols = self.contracts(start, end)
+        state = {s: [len(self.store.days(s)), str(self.store.last_timestamp(s))] for s in symbols}
+        npy_path, meta_path = self._paths()
+
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            cached = meta["contracts"] == state
+        except (OSError, ValueError):
+            cached = False
+
+        if cached:
+            metrics.count("cache_hits", cache="continuous")
+            if verbose:
+                logger.info(f"♻️ Using cached {self.root} continuous series")
+            series = _to_frame(np.load(npy_path))
+            rolls = pd.DataFrame(meta["rolls"], columns=["date", "from", "to", "timestamp", "gap"])
+            rolls[["date", "timestamp"]] = rolls[["date", "timestamp"]].apply(pd.to_datetime)
+        else:
+            metrics.count("cache_misses", cache="continuous")
+            if verbose:
+                logger.info(f"🧵 Stitching {self.root} from {len(symbols)} contracts ({self.method} roll, {self.adjustment})")
+            series, rolls = stitch({s: self.store.read(s) for s in symbols}, self.method, self.adjustment)
+            os.makedirs(self.cache_dir, exist_ok=True)
+            meta = {"contracts": state, "rolls": json.loads(rolls.to_json(orient="records", date_format="iso"))}
+            for path, mode, dump in ((npy_path, "wb", lambda f: np.save(f, _to_records(series))),
+                                     (meta_path, "w", lambda f: json.dump(meta, f, indent=2))):
+                with open(path + ".tmp", mode) as f:
+                    dump(f)
+                os.replace(path + ".tmp", path)
+
+        lo = pd.Timestamp(start)
+        hi = pd.Timestamp(end) if end is not None else None
+        return series.loc[lo:hi], rolls
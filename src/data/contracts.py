@@ -0,0 +1,70 @@
+# === contracts.py (quarterly futures contract calendar: symbols, expiries, roll dates) ===
+import re
+import pandas as pd
+
+MONTH_CODES = {3: "H", 6: "M", 9: "U", 12: "Z"}
+CODE_MONTHS = {code: month for month, code in MONTH_CODES.items()}
+# CME equity index futures roll 8 days before expiry (the Thursday before the third-Friday expiry week)
+ROLL_DAYS_BEFORE_EXPIRY = 8
+
+_SYMBOL = re.compile(r"^/?(?P<root>[A-Z0-9]+?)(?P<code>[HMUZ])(?P<year>\d{1,2})$")
+
+
+def contract_symbol(root: str, year: int, month: int) -> str:
+    """Schwab-style contract symbol, e.g. ('MES', 2025, 6) -> 'MESM5'."""
+    return f"{root}{MONTH_CODES[month]}{year % 10}"
+
+
+def parse_symbol(symbol: str, reference=None):
+    """
+    Splits a contract symbol into (root, year, month). Single-digit years resolve to the decade
+    closest to `reference` (defaults to today).
+
+    Returns:
+        (str, int, int)
+    """
+    match = _SYMBOL.match(symbol)
+    if match is None:
+        raise ValueError(f"Not a quarterly contract symbol: {symbol}")
+    year = int(match["year"])
+    if len(match["year"]) == 1:
+        ref_year = pd.Timestamp(reference if reference is not None else "now").year
+        year = min((ref_year // 10 * 10 + d * 10 + year for d in (-1, 0, 1)), key=lambda y: abs(y - ref_year))
+    else:
+        year += 2000
+    return match["root"], year, CODE_MONTHS[match["code"]]
+
+
+def expiry(year: int, month: int) -> pd.Timestamp:
+    """Expiry date (third Friday of the contract month)."""
+    first = pd.Timestamp(year=year, month=month, day=1)
+    return first + pd.Timedelta(days=(4 - first.dayofweek) % 7 + 14)
+
+
+def roll_date(year: int, month: int) -> pd.Timestamp:
+    """Calendar roll date: trading moves to the next contract from this date on."""
+    return expiry(year, month) - pd.Timedelta(days=ROLL_DAYS_BEFORE_EXPIRY)
+
+
+def contract_months(start, end) -> list:
+    """(year, month) of every quarterly contract traded as front month between start and end."""
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    year, month = start.year, (start.month - 1) // 3 * 3 + 3
+    months = []
+    while True:
+        if roll_date(year, month) > start.normalize() or months:
+            months.append((year, month))
+        if roll_date(year, month) > end.normalize():
+            return months
+        year, month = (year + 1, 3) if month == 12 else (year, month + 3)
+
+
+def contract_symbols(root: str, start, end) -> list:
+    """Front-month contract symbols for `root` between start and end, oldest first."""
+    return [contract_symbol(root, year, month) for year, month in contract_months(start, end)]
+
+
+def front_month(root: str = "MES", when=None) -> str:
+    """Front-month contract symbol on `when` (defaults to now) under the calendar roll."""
+    when = pd.Timestamp(when if when is not None else "now")
+    return contract_symbols(root, when, when)[0]
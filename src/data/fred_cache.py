@@ -0,0 +1,147 @@
+# === fred_cache.py (on-disk FRED observation cache with concurrent incremental refresh) ===
+import os
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from src.monitoring.log import get_logger
+from src.monitoring.metrics import metrics
+
+logger = get_logger(__name__)
+
+FRED_API_URL = "https://api.stlouisfed.org/fred/series/observations"
+
+
+class FredCache:
+    """
+    Local store of FRED series observations so feature rebuilds do not re-download macro history.
+
+    Each series lives in <root>/<series_id>.csv (date, value, vintage) with a <series_id>.json
+    sidecar recording when it was last refreshed. A series older than `ttl` is refreshed by
+    requesting only observations from `revision_days` before its last stored date onwards, so
+    recent revisions (e.g. CPI) replace the stored values.
+
+    Args:
+        root (str): Cache directory.
+        api_key (str): FRED API key (can also be passed to `get`).
+        ttl (float): Seconds a cached series is considered fresh.
+        revision_days (int): How far back a refresh re-requests observations to pick up revisions.
+        base_url (str): Observations endpoint; point it at a local stand-in for offline runs.
+        offline (bool): Never touch the network, serve whatever is cached.
+        max_workers (int): Concurrent downloads (and pooled connections).
+        observation_start (str): Start date for series not cached yet.
+    """
+
+    def __init__(self, root="data/fred", api_key=None, ttl=12 * 3600, revision_days=90,
+                 base_url=FRED_API_URL, offline=False, max_workers=4, observation_start="2000-01-01"):
+        self.root = root
+        self.api_key = api_key
+        self.ttl = ttl
+        self.revision_days = revision_days
+        self.base_url = base_url
+        self.offline = offline
+        self.max_workers = max_workers
+        self.observation_start = observation_start
+        self._session = None
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            self._session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+            self._session.mount("https://", adapter)
+            self._session.mount("http://", adapter)
+        return self._session
+
+    def _paths(self, series_id: str):
+        base = os.path.join(self.root, series_id)
+        return base + ".csv", base + ".json"
+
+    def _read(self, series_id: str):
+        csv_path, meta_path = self._paths(series_id)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            stored = pd.read_csv(csv_path, parse_dates=["date"], index_col="date")
+        except (OSError, ValueError):
+            return None, None
+        return stored, meta
+
+    def _write(self, series_id: str, stored: pd.DataFrame):
+        os.makedirs(self.root, exist_ok=True)
+        csv_path, meta_path = self._paths(series_id)
+        meta = {"fetched_at": time.time(), "last_date": str(stored.index.max().date()) if len(stored) else None}
+        stored.to_csv(csv_path + ".tmp", index_label="date")
+        with open(meta_path + ".tmp", "w") as f:
+            json.dump(meta, f)
+        # Replace the data before the meta so a fresh timestamp never points at old data
+        os.replace(csv_path + ".tmp", csv_path)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    def _fetch(self, series_id: str, api_key: str, start: str) -> pd.DataFrame:
+        params = {
+            "series_id": series_id,
+            "api_key": api_key,
+            "file_type": "json",
+            "observation_start": start,
+        }
+        response = self.session.get(self.base_url, params=params, timeout=30)
+        if not response.ok:
+            raise Exception(f"FRED API error for {series_id}: {response.status_code}")
+
+        fred_df = pd.DataFrame(response.json().get("observations", []))
+        if fred_df.empty:
+            return pd.DataFrame(columns=["value", "vintage"], index=pd.DatetimeIndex([], name="date"))
+        fred_df["date"] = pd.to_datetime(fred_df["date"])
+        fred_df["value"] = pd.to_numeric(fred_df["value"], errors="coerce")
+        fred_df["vintage"] = fred_df.get("realtime_start")
+        return fred_df.set_index("date")[["value", "vintage"]]
+
+    def _refresh(self, series_id: str, api_key: str, stored: pd.DataFrame):
+        if stored is None or stored.empty:
+            fresh = self._fetch(series_id, api_key, self.observation_start)
+            merged = fresh
+        else:
+            start = (stored.index.max() - pd.Timedelta(days=self.revision_days)).strftime("%Y-%m-%d")
+            fresh = self._fetch(series_id, api_key, start)
+            merged = pd.concat([stored[stored.index < start], fresh])
+        merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+        self._write(series_id, merged)
+        return merged
+
+    def get(self, series_ids: list, api_key: str = None, verbose=True) -> dict:
+        """
+        Returns {series_id: pd.Series of values indexed by date}, refreshing stale or missing
+        series concurrently. Series that cannot be fetched fall back to stale cached data, or are
+        left out if nothing is cached.
+        """
+        api_key = api_key or self.api_key
+        result, stale = {}, {}
+        for series_id in series_ids:
+            stored, meta = self._read(series_id)
+            if stored is not None and (self.offline or time.time() - meta["fetched_at"] < self.ttl):
+                result[series_id] = stored
+                metrics.count("cache_hits", cache="fred")
+            elif not self.offline:
+                stale[series_id] = stored
+                metrics.count("cache_misses", cache="fred")
+            elif verbose:
+                logger.warning(f"⚠️ FRED series {series_id} not cached (offline)")
+
+        if stale:
+            if verbose:
+                logger.info(f"📦 Refreshing FRED series: {', '.join(stale)}")
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = {sid: pool.submit(self._refresh, sid, api_key, stored) for sid, stored in stale.items()}
+            for series_id, future in futures.items():
+                try:
+                    result[series_id] = future.result()
+                except Exception as e:
+                    if verbose:
+                        logger.warning(f"⚠️ Failed to refresh {series_id}: {e}")
+                    if stale[series_id] is not None:
+                        result[series_id] = stale[series_id]
+
+        return {sid: result[sid]["value"].astype(float) for sid in series_ids if sid in result}
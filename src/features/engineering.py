@@ -1,29 +1,69 @@
 # Engineer the features
-def add_features(df, fred_api_key, verbose=True):
-    print("Adding features")
+import logging
+import numpy as np
+import pandas as pd
+import requests
+from src.features.indicators import compute_indicators, indicator_features
+from src.monitoring.log import get_logger
+from src.monitoring.metrics import metrics
+
+logger = get_logger(__name__)
+
+final_features = [
+    'log_return', 'rsi', 'macd', 'bb_mavg', 'bb_width', 'atr',
+    'rsi_lag1', 'macd_lag1', 'momentum_3', 'momentum_5', 'vol_5',
+    'yield_spread_10y_2y', 'fed_funds_rate', 'cpi_inflation', 'vix_level', 'es_vix_corr'
+]
+
+# FRED series id -> feature column
+fred_indicators = {
+    "T10Y2Y": "yield_spread_10y_2y",
+    "DFF": "fed_funds_rate",
+    "CPIAUCSL": "cpi_inflation",
+    "VIXCLS": "vix_level"
+}
+
+
+# Price columns the strategy needs next to the model features (signals, stops, targets)
+price_columns = ['High', 'Low', 'Close']
+
+
+def add_features(df, fred_api_key, verbose=True, fred_cache=None, dtype=None):
+    """
+    Adds the indicator, lag / momentum and (optionally) FRED macro feature columns to `df` in place
+    and returns the rows where all of `final_features` are present.
+
+    Args:
+        df (pd.DataFrame): OHLCV frame indexed by timestamp (modified in place).
+        fred_api_key (str): FRED API key; macros are skipped without a key or `fred_cache`.
+        verbose (bool): Log FRED downloads and the final shape.
+        fred_cache (FredCache): Serves macro series from disk instead of the FRED API.
+        dtype: Storage dtype of the feature columns (e.g. np.float32 halves their memory; prices keep
+            their dtype). Each stage is computed in float64 and downcast as soon as it is done.
+    """
+    with metrics.span("features"):
+        return _add_features(df, fred_api_key, verbose, fred_cache, dtype)
+
+
+def _downcast(df, columns, dtype):
+    if dtype is not None:
+        columns = [c for c in columns if c in df.columns]
+        df[columns] = df[columns].astype(dtype)
+
+
+def _add_features(df, fred_api_key, verbose, fred_cache, dtype):
+    logger.debug("Adding features")
 
     if len(df) < 20:
         raise ValueError(f"🚫 Not enough rows to compute indicators safely. Need at least 20 rows, got {len(df)}.")
 
-    close = df['Close']
-    high = df['High']
-    low = df['Low']
-    print("Adding indicators")
-    df['log_return'] = np.log(close / close.shift(1))
-    df['rsi'] = RSIIndicator(close=df['Close'], window=14).rsi()
-    df['macd'] = MACD(close=df['Close']).macd_diff()
-    bb = BollingerBands(close=df['Close'])
-    df['bb_mavg'] = bb.bollinger_mavg()
-    df['bb_width'] = bb.bollinger_hband() - bb.bollinger_lband()
-    df['atr'] = AverageTrueRange(high=df['High'], low=df['Low'], close=df['Close']).average_true_range()
-
-    # Lagged and momentum
-    print("Lagged and Momentum")
-    df['rsi_lag1'] = df['rsi'].shift(1)
-    df['macd_lag1'] = df['macd'].shift(1)
-    df['momentum_3'] = df['Close'] / df['Close'].shift(3) - 1
-    df['momentum_5'] = df['Close'] / df['Close'].shift(5) - 1
-    df['vol_5'] = df['log_return'].rolling(window=5).std()
+    # Price indicators, lags and momentum in one pass over the raw arrays
+    with metrics.span("features.indicators"):
+        values = compute_indicators(df['High'].to_numpy(dtype=float), df['Low'].to_numpy(dtype=float),
+                                    df['Close'].to_numpy(dtype=float))
+        for k, name in enumerate(indicator_features):
+            df[name] = values[:, k] if dtype is None else values[:, k].astype(dtype)
+        del values
 
     # Ensure index is datetime for merging with FRED
     if not isinstance(df.index, pd.DatetimeIndex):
@@ -32,75 +72,72 @@ def add_features(df, fred_api_key, verbose=True):
         else:
             raise ValueError("DataFrame must have a DatetimeIndex or a 'Date' column to align with FRED data.")
 
-    print("🕰 df.index sample:", df.index[:5])
-    print("📐 Index dtype:", df.index.dtype)
+    logger.debug(f"🕰 Index {df.index.dtype}, sample: {list(df.index[:5])}")
 
-    # === FRED API ===
-    print(f"Fred api key:{fred_api_key}")
     # === Optional: Add FRED Macros ===
-    if fred_api_key:
-        print("Adding FRED macros")
-        fred_api_url = "https://api.stlouisfed.org/fred/series/observations"
-        fred_indicators = {
-            "T10Y2Y": "yield_spread_10y_2y",
-            "DFF": "fed_funds_rate",
-            "CPIAUCSL": "cpi_inflation",
-            "VIXCLS": "vix_level"
-        }
-        fred_data = {}
-        for code, col_name in fred_indicators.items():
-            if verbose:
-                print(f"📦 Downloading FRED series: {code} → {col_name}")
-            params = {
-                "series_id": code,
-                "api_key": fred_api_key,
-                "file_type": "json",
-                "observation_start": "2000-01-01",
-            }
-            response = requests.get(fred_api_url, params=params)
-            if response.ok:
-                observations = response.json().get("observations", [])
-                fred_df = pd.DataFrame(observations)
-
-                # ✅ Force-clean columns before proceeding
-                fred_df.columns = [str(c) for c in fred_df.columns]
-
-                # 🔍 Print column types
-                print("🧪 FRED raw columns:", fred_df.columns.tolist())
-
-                fred_df['date'] = pd.to_datetime(fred_df['date'])
-                fred_df.set_index('date', inplace=True)
-                fred_df['value'] = pd.to_numeric(fred_df['value'], errors='coerce')
-                df[col_name] = fred_df['value'].reindex(df.index, method='ffill')
-                fred_data[col_name] = fred_df['value']
-                print(f"✅ Merged {col_name}, final dtype: {df[col_name].dtype}")
-
+    if fred_api_key or fred_cache is not None:
+        with metrics.span("features.fred"):
+            logger.debug("Adding FRED macros")
+            fred_api_url = "https://api.stlouisfed.org/fred/series/observations"
+            fred_data = {}
+            # Serve series from the local cache when one is given (refreshing only what is stale)
+            cached = fred_cache.get(list(fred_indicators), fred_api_key, verbose=verbose) if fred_cache is not None else {}
+            for code, col_name in fred_indicators.items():
+                if code in cached:
+                    df[col_name] = cached[code].reindex(df.index, method='ffill')
+                    fred_data[col_name] = cached[code]
+                    continue
+                if fred_cache is not None:
+                    logger.warning(f"⚠️ Failed to fetch {code}")
+                    continue
+                if verbose:
+                    logger.info(f"📦 Downloading FRED series: {code} → {col_name}")
+                params = {
+                    "series_id": code,
+                    "api_key": fred_api_key,
+                    "file_type": "json",
+                    "observation_start": "2000-01-01",
+                }
+                response = requests.get(fred_api_url, params=params)
+                metrics.count("api_calls", endpoint="fred", status=response.status_code)
+                if response.ok:
+                    observations = response.json().get("observations", [])
+                    fred_df = pd.DataFrame(observations)
+
+                    # ✅ Force-clean columns before proceeding
+                    fred_df.columns = [str(c) for c in fred_df.columns]
+
+                    logger.debug(f"🧪 FRED raw columns: {fred_df.columns.tolist()}")
+
+                    fred_df['date'] = pd.to_datetime(fred_df['date'])
+                    fred_df.set_index('date', inplace=True)
+                    fred_df['value'] = pd.to_numeric(fred_df['value'], errors='coerce')
+                    df[col_name] = fred_df['value'].reindex(df.index, method='ffill')
+                    fred_data[col_name] = fred_df['value']
+                    logger.debug(f"✅ Merged {col_name}, final dtype: {df[col_name].dtype}")
+
+                else:
+                    logger.warning(f"⚠️ Failed to fetch {code}: {response.status_code}")
+
+            logger.debug(f"📅 Data index range: {df.index.min()} to {df.index.max()}")
+            # === ES-VIX Correlation ===
+            if 'vix_level' in fred_data:
+                logger.debug("🧠 Calculating ES-VIX correlation")
+                df_returns = pd.DataFrame(index=df.index)
+                df_returns['ES_ret'] = df['log_return']
+                df_returns['VIX_ret'] = np.log(fred_data['vix_level'] / fred_data['vix_level'].shift(1))
+                df_returns['es_vix_corr'] = df_returns['ES_ret'].rolling(10).corr(df_returns['VIX_ret'])
+                df['es_vix_corr'] = df_returns['es_vix_corr']
+                logger.debug("✅ ES-VIX correlation added")
             else:
-                print(f"⚠️ Failed to fetch {code}: {response.status_code}")
-
-        print("📅 Data index range:", df.index.min(), "to", df.index.max())
-         # === ES-VIX Correlation ===
-        if 'vix_level' in fred_data:
-            print("🧠 Calculating ES-VIX correlation")
-            df_returns = pd.DataFrame(index=df.index)
-            df_returns['ES_ret'] = df['log_return']
-            df_returns['VIX_ret'] = np.log(fred_data['vix_level'] / fred_data['vix_level'].shift(1))
-            df_returns['es_vix_corr'] = df_returns['ES_ret'].rolling(10).corr(df_returns['VIX_ret'])
-            df['es_vix_corr'] = df_returns['es_vix_corr']
-            print("✅ ES-VIX correlation added")
-        else:
-            print("⚠️ VIX data not found for correlation computation")
+                logger.warning("⚠️ VIX data not found for correlation computation")
+        _downcast(df, list(fred_indicators.values()) + ['es_vix_corr'], dtype)
 
     # Restrict final DataFrame to rows where all required features are present
-    final_features = [
-        'log_return', 'rsi', 'macd', 'bb_mavg', 'bb_width', 'atr',
-        'rsi_lag1', 'macd_lag1', 'momentum_3', 'momentum_5', 'vol_5',
-        'yield_spread_10y_2y', 'fed_funds_rate', 'cpi_inflation', 'vix_level', 'es_vix_corr'
-    ]
-
     # === Drop Rows with Missing Values ===
-    print("\n🚨 NaN summary (before drop):")
-    print(df[final_features].isnull().sum().sort_values(ascending=False))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("🚨 NaN summary (before drop):\n"
+                     + df[final_features].isnull().sum().sort_values(ascending=False).to_string())
 
     # Preserve latest row before drop
     latest_date = df.index.max()
@@ -110,9 +147,83 @@ def add_features(df, fred_api_key, verbose=True):
 
     # === Patch: Restore latest row if not fully NaN ===
     if latest_date not in df.index and not latest_row[final_features].isnull().all(axis=1).any():
-        print(f"🩹 Re-adding {latest_date.date()} row for live prediction")
+        logger.info(f"🩹 Re-adding {latest_date.date()} row for live prediction")
         df = pd.concat([df, latest_row])
 
-    print(f"✅ Final shape after drop/fill: {df.shape}")
-    print(f"📅 Final index range: {df.index.min().date()} → {df.index.max().date()}")
+    if verbose:
+        logger.info(f"✅ Final shape after drop/fill: {df.shape}, "
+                    f"index {df.index.min().date()} → {df.index.max().date()}")
     return df
+
+
+def compact_frame(df, features=None, dtype=np.float32, keep=None):
+    """
+    Drops every column the model and strategy do not read and stores the features as one
+    contiguous `dtype` block (prices stay float64 for exits and targets).
+
+    Args:
+        df (pd.DataFrame): Output of `add_features`.
+        features (list): Model feature columns (defaults to `final_features`).
+        dtype: Feature dtype; float32 is lossless for scikit-learn trees, which split on float32.
+        keep (list): Extra columns kept as they are (defaults to `price_columns`).
+    """
+    features = list(final_features if features is None else features)
+    keep = [c for c in (price_columns if keep is None else keep) if c in df.columns and c not in features]
+    X = pd.DataFrame(np.ascontiguousarray(df[features].to_numpy(dtype=dtype)), index=df.index, columns=features)
+    return pd.concat([df[keep].astype(float), X], axis=1) if keep else X
+
+
+def iter_feature_chunks(chunks, fred_api_key, overlap=1_000, verbose=False, fred_cache=None, dtype=np.float32,
+                        columns=None):
+    """
+    Featurizes a stream of consecutive OHLCV chunks (e.g. `CandleStore.iter_chunks`), computing
+    each one with the last `overlap` raw rows of the previous chunk as warm-up, and yields one
+    feature frame per chunk.
+
+    The exponential indicators (RSI, MACD, ATR) forget their starting point geometrically; with
+    the default overlap their values agree with a single pass to float precision. Chunks are
+    downcast to `dtype` and reduced to `columns` (features plus `price_columns` by default).
+    Pass a `fred_cache` so macro series are read once from disk rather than downloaded per chunk.
+    """
+    if overlap < 0:
+        raise ValueError("overlap must be non-negative")
+    reduce = compact_frame if columns is None else (lambda out, dtype: out[columns])
+    chunks = iter(chunks)
+    warm = None
+    upcoming = next(chunks, None)
+    while upcoming is not None:
+        block, upcoming = upcoming, next(chunks, None)
+        if block is None or block.empty:
+            continue
+        frame = block.copy() if warm is None else pd.concat([warm, block])
+        if len(frame) < 20 and upcoming is not None:
+            # Too short to compute indicators on; merge it into the next chunk
+            upcoming = pd.concat([block, upcoming])
+            continue
+        warm = frame.iloc[max(len(frame) - overlap, 0):].copy() if overlap else None
+        out = add_features(frame, fred_api_key, verbose=verbose, fred_cache=fred_cache, dtype=dtype)
+        out = out[out.index >= block.index[0]]
+        if upcoming is not None:
+            # Only the final chunk may keep its partially-featured latest row for live prediction
+            out = out.dropna(subset=final_features)
+        del frame
+        yield reduce(out, dtype=dtype)
+
+
+def add_features_chunked(df, fred_api_key, chunk_size=250_000, overlap=1_000, verbose=False, fred_cache=None,
+                         dtype=np.float32, columns=None):
+    """
+    `add_features` over a long in-memory history in blocks of `chunk_size` rows (see
+    `iter_feature_chunks`), so peak memory scales with the block instead of the history.
+
+    Args:
+        df (pd.DataFrame): OHLCV frame indexed by timestamp (not modified).
+        chunk_size (int): Output rows per block.
+        overlap (int): Warm-up rows recomputed in front of every block after the first.
+        columns (list): Columns of the result (features plus `price_columns` by default).
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    blocks = (df.iloc[lo:lo + chunk_size] for lo in range(0, len(df), chunk_size))
+    return pd.concat(list(iter_feature_chunks(blocks, fred_api_key, overlap=overlap, verbose=verbose,
+                                              fred_cache=fred_cache, dtype=dtype, columns=columns)))
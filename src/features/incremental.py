@@ -0,0 +1,275 @@
+# === incremental.py (streaming, per-candle version of add_features) ===
+import math
+from collections import deque
+import numpy as np
+import pandas as pd
+from src.features.engineering import final_features
+
+NAN = float('nan')
+
+# Pushes between exact re-summations of a running window, bounding float drift of the running sums
+_RESUM_EVERY = 1024
+
+
+class IncrementalFeatureEngine:
+    """
+    Keeps running indicator state and updates `final_features` from one new candle at a time,
+    reproducing `add_features` (the Wilder RSI, EMA MACD, Bollinger Bands and ATR of
+    `src.features.indicators`) without recomputing over the whole history.
+
+    Args:
+        macro (dict): Optional FRED observations per column name (e.g. {'vix_level': pd.Series}),
+            as downloaded by `add_features`. Values are forward-filled onto candle timestamps and
+            'vix_level' also drives 'es_vix_corr'.
+        rsi_window, macd_fast, macd_slow, macd_sign, bb_window, bb_dev, atr_window: Indicator
+            windows, defaulting to the ones used by `add_features`.
+    """
+
+    def __init__(self, macro=None, rsi_window=14, macd_fast=12, macd_slow=26, macd_sign=9,
+                 bb_window=20, bb_dev=2, atr_window=14):
+        self.rsi_window = rsi_window
+        self.macd_fast, self.macd_slow, self.macd_sign = macd_fast, macd_slow, macd_sign
+        self.bb_window, self.bb_dev = bb_window, bb_dev
+        self.atr_window = atr_window
+
+        self._macro = {}
+        for col, series in (macro or {}).items():
+            series = series.sort_index()
+            self._macro[col] = (series.index, series.to_numpy(dtype=float))
+        self._vix_ret = {}
+        if 'vix_level' in (macro or {}):
+            vix = macro['vix_level']
+            self._vix_ret = np.log(vix / vix.shift(1)).to_dict()
+
+        self.reset()
+
+    def reset(self):
+        """Clears all running state."""
+        self.count = 0
+        self.timestamp = None
+        self._prev_close = None
+        self._closes = deque(maxlen=6)
+        self._bb = _RunningWindow(self.bb_window)
+        self._log_returns = _RunningWindow(5)
+        self._corr_pairs = _RunningCorr(10)
+
+        self._rsi_up = self._rsi_down = 0.0
+        self._ema_fast = self._ema_slow = None
+        self._macd_line_count = 0
+        self._macd_signal = None
+
+        self._tr_sum = 0.0
+        self._atr = 0.0
+
+        self.values = dict.fromkeys(final_features, NAN)
+
+    def warm_up(self, df):
+        """Feeds every candle of an OHLC DataFrame through the engine and returns the last feature values."""
+        for ts, high, low, close in zip(df.index, df['High'].to_numpy(dtype=float),
+                                        df['Low'].to_numpy(dtype=float), df['Close'].to_numpy(dtype=float)):
+            self._step(ts, high, low, close)
+        return dict(self.values)
+
+    def update(self, timestamp, candle):
+        """
+        Updates all features with a single new candle.
+
+        Args:
+            timestamp: Candle timestamp (used for macro alignment).
+            candle: Mapping with 'High', 'Low' and 'Close' keys, e.g. a row of `fetch_mes_data` output.
+
+        Returns:
+            dict: Feature values for this candle, keyed like `final_features`.
+        """
+        return dict(self._step(timestamp, float(candle['High']), float(candle['Low']), float(candle['Close'])))
+
+    def row(self):
+        """Returns the latest features plus OHLC context as a Series named by timestamp, ready for `LiveTradeRecommender.generate`."""
+        data = dict(self.values, Close=self._prev_close)
+        return pd.Series(data, name=self.timestamp)
+
+    def _step(self, ts, high, low, close):
+        prev_close = self._prev_close
+        values = self.values
+        t = self.count
+
+        # Log return, momentum and rolling volatility
+        log_return = math.log(close / prev_close) if prev_close is not None else NAN
+        self._closes.append(close)
+        self._log_returns.push(log_return)
+        closes = self._closes
+        values['log_return'] = log_return
+        values['momentum_3'] = close / closes[-4] - 1 if len(closes) >= 4 else NAN
+        values['momentum_5'] = close / closes[-6] - 1 if len(closes) >= 6 else NAN
+        values['vol_5'] = self._log_returns.std(ddof=1) if self._log_returns.full else NAN
+
+        # RSI (Wilder smoothing; ta treats the first, undefined diff as zero movement)
+        diff = close - prev_close if prev_close is not None else 0.0
+        alpha = 1 / self.rsi_window
+        up, down = (diff if diff > 0 else 0.0), (-diff if diff < 0 else 0.0)
+        if t == 0:
+            self._rsi_up, self._rsi_down = up, down
+        else:
+            self._rsi_up = (1 - alpha) * self._rsi_up + alpha * up
+            self._rsi_down = (1 - alpha) * self._rsi_down + alpha * down
+        values['rsi_lag1'] = values['rsi']
+        if t + 1 >= self.rsi_window:
+            values['rsi'] = 100.0 if self._rsi_down == 0 else 100 - 100 / (1 + self._rsi_up / self._rsi_down)
+
+        # MACD histogram (EMA fast - EMA slow, minus its EMA signal line)
+        self._ema_fast = _ema(self._ema_fast, close, self.macd_fast)
+        self._ema_slow = _ema(self._ema_slow, close, self.macd_slow)
+        values['macd_lag1'] = values['macd']
+        if t + 1 >= self.macd_slow:
+            macd_line = self._ema_fast - self._ema_slow
+            self._macd_signal = _ema(self._macd_signal, macd_line, self.macd_sign)
+            self._macd_line_count += 1
+            if self._macd_line_count >= self.macd_sign:
+                values['macd'] = macd_line - self._macd_signal
+
+        # Bollinger Bands
+        self._bb.push(close)
+        if self._bb.full:
+            mavg = self._bb.mean()
+            mstd = self._bb.std(ddof=0)
+            values['bb_mavg'] = mavg
+            values['bb_width'] = (mavg + self.bb_dev * mstd) - (mavg - self.bb_dev * mstd)
+
+        # ATR (ta seeds with a simple mean of the first window and reports 0 before that)
+        tr = high - low if prev_close is None else max(high - low, abs(high - prev_close), abs(low - prev_close))
+        if t + 1 < self.atr_window:
+            self._tr_sum += tr
+        elif t + 1 == self.atr_window:
+            self._atr = (self._tr_sum + tr) / self.atr_window
+        else:
+            self._atr = (self._atr * (self.atr_window - 1) + tr) / float(self.atr_window)
+        values['atr'] = self._atr
+
+        # FRED macros, forward-filled onto the candle timestamp
+        for col, (index, obs) in self._macro.items():
+            pos = index.searchsorted(ts, side='right') - 1
+            values[col] = obs[pos] if pos >= 0 else NAN
+        if self._vix_ret:
+            self._corr_pairs.push(log_return, self._vix_ret.get(ts, NAN))
+            values['es_vix_corr'] = self._corr_pairs.corr()
+
+        self._prev_close = close
+        self.timestamp = ts
+        self.count = t + 1
+        return values
+
+
+def _ema(prev, x, span):
+    if prev is None:
+        return x
+    alpha = 2 / (span + 1)
+    return (1 - alpha) * prev + alpha * x
+
+
+class _RunningWindow:
+    """
+    Last `size` values with running sums of their deviations from a shift (a recent value, so the
+    sums stay small and the variance does not cancel), updated in O(1) per value. NaN values are
+    kept out of the sums; the window only reports statistics once it is full and NaN-free.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.values = deque(maxlen=size)
+        self.shift = None
+        self.sum = self.sumsq = 0.0
+        self.nans = 0
+        self.run = 0
+        self._pushes = 0
+
+    @property
+    def full(self):
+        return len(self.values) == self.size and self.nans == 0
+
+    def push(self, x):
+        values = self.values
+        if len(values) == self.size:
+            # The deque drops its oldest value on append
+            self._add(values[0], -1.0)
+        # Length of the trailing run of identical values (NaN never repeats)
+        self.run = self.run + 1 if values and x == values[-1] else 1
+        values.append(x)
+        self._add(x, 1.0)
+        self._pushes += 1
+        if self._pushes % _RESUM_EVERY == 0:
+            self.resum()
+
+    def _add(self, x, sign):
+        if math.isnan(x):
+            self.nans += int(sign)
+            return
+        if self.shift is None:
+            self.shift = x
+        d = x - self.shift
+        self.sum += sign * d
+        self.sumsq += sign * d * d
+
+    def resum(self):
+        """Recomputes the sums exactly, re-centred on the latest value."""
+        finite = [v for v in self.values if not math.isnan(v)]
+        self.shift = finite[-1] if finite else None
+        self.sum = self.sumsq = 0.0
+        for v in finite:
+            d = v - self.shift
+            self.sum += d
+            self.sumsq += d * d
+
+    def mean(self):
+        return self.shift + self.sum / self.size
+
+    def std(self, ddof):
+        # Windows of identical values are exactly 0, as in `src.features.indicators.rolling_std`
+        if self.run >= self.size:
+            return 0.0
+        var = (self.sumsq - self.sum * self.sum / self.size) / (self.size - ddof)
+        return math.sqrt(var) if var > 0 else 0.0
+
+
+class _RunningCorr:
+    """
+    Rolling Pearson correlation of the last `size` (x, y) pairs from running shifted sums, updated
+    in O(1) per pair. NaN until the window holds `size` complete pairs, and for constant x or y.
+    """
+
+    def __init__(self, size):
+        self.x = _RunningWindow(size)
+        self.y = _RunningWindow(size)
+        self.sumxy = 0.0
+
+    def push(self, x, y):
+        wx, wy = self.x, self.y
+        if len(wx.values) == wx.size:
+            self._cross(wx.values[0], wy.values[0], -1.0)
+        resum = (wx._pushes + 1) % _RESUM_EVERY == 0
+        wx.push(x)
+        wy.push(y)
+        if resum:
+            self.resum()
+        else:
+            self._cross(x, y, 1.0)
+
+    def _cross(self, x, y, sign):
+        if math.isnan(x) or math.isnan(y):
+            return
+        self.sumxy += sign * (x - self.x.shift) * (y - self.y.shift)
+
+    def resum(self):
+        self.sumxy = 0.0
+        for x, y in zip(self.x.values, self.y.values):
+            if not (math.isnan(x) or math.isnan(y)):
+                self.sumxy += (x - self.x.shift) * (y - self.y.shift)
+
+    def corr(self):
+        wx, wy = self.x, self.y
+        if not (wx.full and wy.full) or wx.run >= wx.size or wy.run >= wy.size:
+            return NAN
+        n = wx.size
+        var_x = wx.sumsq - wx.sum * wx.sum / n
+        var_y = wy.sumsq - wy.sum * wy.sum / n
+        cov = self.sumxy - wx.sum * wy.sum / n
+        return cov / math.sqrt(var_x * var_y) if var_x > 0 and var_y > 0 else NAN
@@ -0,0 +1,221 @@
+# === indicators.py (NumPy indicator kernels behind add_features) ===
+import math
+import numpy as np
+
+# Price-derived columns of `final_features`, in the column order of `compute_indicators`
+indicator_features = [
+    'log_return', 'rsi', 'macd', 'bb_mavg', 'bb_width', 'atr',
+    'rsi_lag1', 'macd_lag1', 'momentum_3', 'momentum_5', 'vol_5',
+]
+
+# Largest exponent of the per-block decay weights in `ewm` (e**300 stays far from float64 overflow)
+_MAX_EXP = 300.0
+# Rows per partial-sum block in `rolling_mean`; bounds the magnitude, and so the rounding, of the sums
+_SUM_BLOCK = 1024
+
+
+def ewm(x, alpha, out=None):
+    """
+    Exponential moving average y[t] = (1 - alpha) * y[t-1] + alpha * x[t] seeded with y[0] = x[0],
+    i.e. pandas' `ewm(alpha=alpha, adjust=False).mean()` without min_periods.
+
+    The recursion is solved in blocks: within a block y is a cumulative sum of x weighted by
+    (1 - alpha) ** -j, rescaled and joined to the previous block's last value, so the Python
+    loop runs once per block rather than once per row.
+    """
+    x = np.asarray(x, dtype=float)
+    out = np.empty(len(x)) if out is None else out
+    if not len(x):
+        return out
+    decay = 1.0 - alpha
+    if decay <= 0.0:
+        out[:] = x
+        return out
+
+    block = max(1, min(len(x), int(_MAX_EXP / -math.log(decay))))
+    grow = decay ** -np.arange(block, dtype=float)
+    scale = alpha / grow
+    carry_in = decay ** np.arange(1, block + 1, dtype=float)
+    carry = x[0]
+    for lo in range(0, len(x), block):
+        m = min(block, len(x) - lo)
+        seg = out[lo:lo + m]
+        np.multiply(x[lo:lo + m], grow[:m], out=seg)
+        np.cumsum(seg, out=seg)
+        seg *= scale[:m]
+        seg += carry * carry_in[:m]
+        carry = seg[-1]
+    return out
+
+
+def rsi(close, window=14, out=None):
+    """Wilder RSI as in `ta.momentum.RSIIndicator` (the first, undefined change counts as no move)."""
+    close = np.asarray(close, dtype=float)
+    out = np.empty(len(close)) if out is None else out
+    diff = np.zeros(len(close))
+    np.subtract(close[1:], close[:-1], out=diff[1:])
+    up = ewm(np.maximum(diff, 0.0), 1.0 / window)
+    down = ewm(np.maximum(-diff, 0.0), 1.0 / window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(100.0, 1.0 + up / down, out=out)
+    np.subtract(100.0, out, out=out)
+    out[down == 0] = 100.0
+    out[:window - 1] = np.nan
+    return out
+
+
+def macd_diff(close, fast=12, slow=26, sign=9, out=None):
+    """MACD histogram as in `ta.trend.MACD.macd_diff` (EMA spans, values once every EMA has its full span)."""
+    close = np.asarray(close, dtype=float)
+    out = np.full(len(close), np.nan) if out is None else out
+    first = slow - 1
+    if len(close) <= first:
+        out[:] = np.nan
+        return out
+    line = ewm(close, 2.0 / (fast + 1))
+    line -= ewm(close, 2.0 / (slow + 1))
+    line = line[first:]
+    signal = ewm(line, 2.0 / (sign + 1))
+    out[:first + sign - 1] = np.nan
+    np.subtract(line[sign - 1:], signal[sign - 1:], out=out[first + sign - 1:])
+    return out
+
+
+def rolling_mean(x, window, out=None):
+    """
+    Rolling mean over complete windows (NaN before), from cumulative sums restarted every
+    `_SUM_BLOCK` rows so long series do not lose precision to one ever-growing sum.
+    """
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    out = np.empty(n) if out is None else out
+    out[:window - 1] = np.nan
+    if n < window:
+        return out
+    block = max(_SUM_BLOCK, window)
+    padded = np.zeros(-(-n // block) * block)
+    padded[:n] = x
+    sums = padded.reshape(-1, block).cumsum(axis=1)
+    totals = sums[:, -1].copy()
+    sums = sums.ravel()
+
+    # Window (j, i]: both ends lie in the same block or in adjacent ones (window <= block)
+    i = np.arange(window - 1, n)
+    j = i - window
+    total = sums[i].copy()
+    inner = j >= 0
+    total[inner] -= sums[j[inner]]
+    crosses = inner & (i // block != j // block)
+    total[crosses] += totals[j[crosses] // block]
+    np.divide(total, window, out=out[window - 1:])
+    return out
+
+
+def rolling_std(x, window, ddof=1, mean=None, out=None):
+    """
+    Rolling standard deviation over complete windows from deviations to the window mean (one
+    vectorised pass per lag). Constant windows are exactly 0, where pandas' online update can
+    leave a rounding residue that depends on the preceding history.
+    """
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    out = np.empty(n) if out is None else out
+    out[:window - 1] = np.nan
+    if n < window:
+        return out
+    mean = rolling_mean(x, window) if mean is None else mean
+    m = mean[window - 1:]
+    acc = out[window - 1:]
+    acc[:] = 0.0
+    dev = np.empty(n - window + 1)
+    for lag in range(window):
+        np.subtract(x[window - 1 - lag:n - lag], m, out=dev)
+        dev *= dev
+        acc += dev
+    acc /= window - ddof
+    np.sqrt(acc, out=acc)
+
+    # Windows of identical values are exactly 0, not a rounding residue
+    changes = np.zeros(n, dtype=np.int64)
+    np.cumsum(x[1:] != x[:-1], out=changes[1:])
+    acc[changes[window - 1:] == changes[:n - window + 1]] = 0.0
+    return out
+
+
+def true_range(high, low, close, out=None):
+    """High - low, widened to the previous close (the first bar has no previous close)."""
+    high, low, close = (np.asarray(a, dtype=float) for a in (high, low, close))
+    out = np.empty(len(close)) if out is None else out
+    np.subtract(high, low, out=out)
+    if len(close) > 1:
+        prev = close[:-1]
+        np.maximum(out[1:], np.abs(high[1:] - prev), out=out[1:])
+        np.maximum(out[1:], np.abs(low[1:] - prev), out=out[1:])
+    return out
+
+
+def atr(high, low, close, window=14, out=None):
+    """
+    ATR as in `ta.volatility.AverageTrueRange`: 0 for the first window - 1 bars, then the mean
+    true range of the first window followed by Wilder smoothing.
+    """
+    tr = true_range(high, low, close)
+    out = np.zeros(len(tr)) if out is None else out
+    out[:window - 1] = 0.0
+    if len(tr) < window:
+        out[:] = 0.0
+        return out
+    # Seeding the smoother with the first-window mean makes it an EMA from that bar on
+    seeded = tr[window - 1:].copy()
+    seeded[0] = tr[:window].mean()
+    ewm(seeded, 1.0 / window, out=out[window - 1:])
+    return out
+
+
+def compute_indicators(high, low, close, out=None, rsi_window=14, macd_fast=12, macd_slow=26, macd_sign=9,
+                       bb_window=20, bb_dev=2, atr_window=14):
+    """
+    Computes every column of `indicator_features` from raw price arrays into one preallocated
+    (n, 11) float64 matrix, matching the ta / pandas implementations `add_features` used to call.
+
+    Args:
+        high, low, close: Finite price arrays of equal length.
+        out (np.ndarray): Optional (n, len(indicator_features)) float64 array to fill; columns
+            are written in place, so a Fortran-ordered array avoids strided writes.
+        rsi_window, macd_fast, macd_slow, macd_sign, bb_window, bb_dev, atr_window: Indicator windows.
+
+    Returns:
+        np.ndarray: The filled matrix, columns ordered as `indicator_features`.
+    """
+    high, low, close = (np.asarray(a, dtype=float) for a in (high, low, close))
+    n = len(close)
+    out = np.empty((n, len(indicator_features)), order='F') if out is None else out
+    col = {name: out[:, k] for k, name in enumerate(indicator_features)}
+
+    log_return = col['log_return']
+    log_return[0] = np.nan
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(close[1:], close[:-1], out=log_return[1:])
+        np.log(log_return[1:], out=log_return[1:])
+
+        rsi(close, rsi_window, out=col['rsi'])
+        macd_diff(close, macd_fast, macd_slow, macd_sign, out=col['macd'])
+
+        # Bollinger width is the upper minus the lower band, each bb_dev population deviations from the mean
+        mavg = rolling_mean(close, bb_window, out=col['bb_mavg'])
+        width = rolling_std(close, bb_window, ddof=0, mean=mavg, out=col['bb_width'])
+        width *= bb_dev
+        np.subtract(mavg + width, mavg - width, out=width)
+        atr(high, low, close, atr_window, out=col['atr'])
+
+        for lagged, source in (('rsi_lag1', 'rsi'), ('macd_lag1', 'macd')):
+            col[lagged][0] = np.nan
+            col[lagged][1:] = col[source][:-1]
+        for name, lag in (('momentum_3', 3), ('momentum_5', 5)):
+            col[name][:lag] = np.nan
+            np.divide(close[lag:], close[:-lag], out=col[name][lag:])
+            col[name][lag:] -= 1.0
+        # The first return is undefined, so the volatility windows start one bar later
+        col['vol_5'][0] = np.nan
+        rolling_std(log_return[1:], 5, ddof=1, out=col['vol_5'][1:])
+    return out
@@ -0,0 +1,155 @@
+# === backends.py (interchangeable model backends with incremental updates) ===
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.preprocessing import StandardScaler
+from src.models.compact import FlatForest
+
+
+class ModelBackend:
+    """
+    Common interface of the model backends. A backend is constructed from keyword parameters
+    (so it can be passed as `model_cls` to `run_wfv_with_params`) and exposes:
+
+    - fit(X, y): train from scratch on a window.
+    - update(X, y, n_new): move the fitted model to the current window X, y whose last `n_new` rows
+      are new since the previous fit; backends without an incremental mode refit on the window.
+    - predict_proba(X): (n_rows, 2) class probabilities.
+    - compact(): a lighter predictor for live single-row inference (the backend itself if none).
+    """
+
+    incremental = False
+
+    def __init__(self, **params):
+        self.params = params
+        self.model = None
+
+    def _build(self):
+        raise NotImplementedError
+
+    def fit(self, X, y):
+        self.model = self._build()
+        self.model.fit(X, y)
+        return self
+
+    def update(self, X, y, n_new=None):
+        return self.fit(X, y)
+
+    def predict_proba(self, X):
+        return self.model.predict_proba(X)
+
+    def predict(self, X):
+        return self.model.predict(X)
+
+    @property
+    def classes_(self):
+        return self.model.classes_
+
+    def compact(self):
+        return self
+
+
+class RandomForestBackend(ModelBackend):
+    """
+    RandomForestClassifier that grows `grow_trees` additional trees on each update's window
+    (`warm_start`) instead of refitting all of them, dropping the oldest trees beyond `max_trees`
+    so the forest keeps tracking the sliding window.
+
+    Args:
+        grow_trees (int): Trees added per update (0 refits on update).
+        max_trees (int): Upper bound on forest size (defaults to n_estimators + 4 * grow_trees).
+        **params: RandomForestClassifier parameters.
+    """
+
+    def __init__(self, grow_trees=10, max_trees=None, **params):
+        super().__init__(**params)
+        self.grow_trees = grow_trees
+        self.max_trees = max_trees or params.get('n_estimators', 100) + 4 * grow_trees
+        self.incremental = grow_trees > 0
+
+    def _build(self):
+        return RandomForestClassifier(**self.params)
+
+    def update(self, X, y, n_new=None):
+        if self.model is None or not self.incremental:
+            return self.fit(X, y)
+        if len(np.unique(y)) < 2:
+            # Trees grown on a single-class window would not line up with the forest's classes
+            return self
+        self.model.set_params(warm_start=True, n_estimators=len(self.model.estimators_) + self.grow_trees)
+        self.model.fit(X, y)
+        if len(self.model.estimators_) > self.max_trees:
+            self.model.estimators_ = self.model.estimators_[-self.max_trees:]
+            self.model.set_params(n_estimators=self.max_trees)
+        return self
+
+    def compact(self):
+        return FlatForest.from_sklearn(self.model)
+
+
+class HistGBBackend(ModelBackend):
+    """
+    HistGradientBoostingClassifier (binned features, native NaN handling); updates refit on
+    the new window, which is still much cheaper than a comparable forest.
+    """
+
+    def _build(self):
+        return HistGradientBoostingClassifier(**self.params)
+
+
+class LogisticBackend(ModelBackend):
+    """
+    Standardised logistic regression with two incremental modes:
+
+    - 'partial_fit': SGD on the log loss; updates take one pass over the new rows only.
+    - 'warm_start': LogisticRegression refit on the new window starting from the previous
+      coefficients, which converges in a few iterations.
+
+    Args:
+        mode (str): 'partial_fit' or 'warm_start'.
+        **params: SGDClassifier or LogisticRegression parameters.
+    """
+
+    incremental = True
+
+    def __init__(self, mode='partial_fit', **params):
+        if mode not in ('partial_fit', 'warm_start'):
+            raise ValueError(f"Unknown logistic mode '{mode}'")
+        super().__init__(**params)
+        self.mode = mode
+        self.scaler = None
+
+    def _build(self):
+        if self.mode == 'partial_fit':
+            return SGDClassifier(loss='log_loss', **self.params)
+        return LogisticRegression(warm_start=True, **self.params)
+
+    def fit(self, X, y):
+        self.scaler = StandardScaler().fit(X)
+        return super().fit(self.scaler.transform(X), y)
+
+    def update(self, X, y, n_new=None):
+        if self.model is None:
+            return self.fit(X, y)
+        if self.mode == 'partial_fit':
+            if n_new is not None:
+                X, y = X[len(X) - n_new:], y[len(y) - n_new:]
+            if len(X):
+                self.scaler.partial_fit(X)
+                self.model.partial_fit(self.scaler.transform(X), y)
+        elif len(np.unique(y)) >= 2:
+            self.model.fit(self.scaler.transform(X), y)
+        return self
+
+    def predict_proba(self, X):
+        return self.model.predict_proba(self.scaler.transform(X))
+
+    def predict(self, X):
+        return self.model.predict(self.scaler.transform(X))
+
+
+BACKENDS = {
+    'random_forest': RandomForestBackend,
+    'hist_gb': HistGBBackend,
+    'logistic': LogisticBackend,
+}
@@ -0,0 +1,112 @@
+# === compact.py (fitted scikit-learn forests exported to flat arrays for low-latency inference) ===
+import numpy as np
+
+
+class FlatForest:
+    """
+    A fitted scikit-learn tree ensemble (RandomForest / ExtraTrees / DecisionTree classifier)
+    flattened into contiguous node arrays, predicting without scikit-learn's per-call input
+    validation and joblib dispatch.
+
+    All trees are walked together, one level per step, so a single row costs about max_depth
+    small array operations. Splits follow scikit-learn exactly (inputs are compared as float32
+    and missing values follow each node's learned direction); probabilities match
+    `predict_proba` up to float rounding of the average over trees.
+
+    Args:
+        feature, threshold, left, right, missing_left: Per-node split arrays over all trees (leaves point at themselves).
+        value (np.ndarray): Per-node probability of the positive class.
+        roots (np.ndarray): Root node of each tree.
+        max_depth (int): Deepest tree depth.
+        classes (np.ndarray): Class labels, as `classes_` of the source model.
+    """
+
+    def __init__(self, feature, threshold, left, right, missing_left, value, roots, max_depth, classes):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_left = missing_left
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.classes_ = classes
+
+    @classmethod
+    def from_sklearn(cls, model):
+        """Flattens a fitted binary tree classifier or forest of them."""
+        trees = [est.tree_ for est in getattr(model, "estimators_", [model])]
+        if len(model.classes_) != 2:
+            raise ValueError("FlatForest supports binary classifiers only")
+
+        sizes = [t.node_count for t in trees]
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)
+        left, right = [], []
+        for t, offset in zip(trees, offsets):
+            leaf = t.children_left == -1
+            # Leaves point at themselves so a level step on a finished tree is a no-op
+            own = np.arange(t.node_count) + offset
+            left.append(np.where(leaf, own, t.children_left + offset))
+            right.append(np.where(leaf, own, t.children_right + offset))
+
+        value = np.concatenate([t.value[:, 0, :] for t in trees])
+        return cls(
+            feature=np.concatenate([np.maximum(t.feature, 0) for t in trees]).astype(np.int64),
+            threshold=np.concatenate([t.threshold for t in trees]),
+            left=np.concatenate(left),
+            right=np.concatenate(right),
+            missing_left=np.concatenate([t.missing_go_to_left for t in trees]).astype(bool),
+            value=value[:, 1] / value.sum(axis=1),
+            roots=offsets,
+            max_depth=max(t.max_depth for t in trees),
+            classes=np.asarray(model.classes_),
+        )
+
+    _ARRAYS = ("feature", "threshold", "left", "right", "missing_left", "value", "roots", "classes_")
+
+    def save(self, file):
+        """Writes the flat arrays to an .npz path or binary file (loadable without scikit-learn)."""
+        np.savez(file, max_depth=self.max_depth, **{name: getattr(self, name) for name in self._ARRAYS})
+
+    @classmethod
+    def load(cls, file):
+        with np.load(file, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in cls._ARRAYS}
+            return cls(arrays["feature"], arrays["threshold"], arrays["left"], arrays["right"],
+                       arrays["missing_left"], arrays["value"], arrays["roots"], int(data["max_depth"]),
+                       arrays["classes_"])
+
+    @property
+    def n_estimators(self):
+        return len(self.roots)
+
+    def _leaves(self, X):
+        # X: (n_rows, n_features) float32; returns the leaf node of every (row, tree)
+        node = np.broadcast_to(self.roots, (len(X), len(self.roots))).copy()
+        rows = np.arange(len(X))[:, None]
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[node]]
+            go_left = np.where(np.isnan(x), self.missing_left[node], x <= self.threshold[node])
+            node = np.where(go_left, self.left[node], self.right[node])
+        return node
+
+    def predict_proba(self, X):
+        """Class probabilities, shaped like scikit-learn's (n_rows, 2)."""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        p = self.value[self._leaves(X)].mean(axis=1)
+        return np.column_stack([1 - p, p])
+
+    def predict_one(self, x) -> float:
+        """Positive-class probability of a single feature row."""
+        x = np.asarray(x, dtype=np.float32).ravel()
+        node = self.roots
+        for _ in range(self.max_depth):
+            v = x[self.feature[node]]
+            go_left = np.where(np.isnan(v), self.missing_left[node], v <= self.threshold[node])
+            node = np.where(go_left, self.left[node], self.right[node])
+        return float(self.value[node].mean())
+
+    def predict(self, X):
+        return self.classes_[(self.predict_proba(X)[:, 1] > 0.5).astype(int)]
@@ -1,8 +1,8 @@
-from sklearn.ensemble import RandomForestClassifier
 import numpy as np
 import pandas as pd
+from src.monitoring.metrics import metrics
 
-def train_random_forest_model(df: pd.DataFrame, features: list, params: dict) -> RandomForestClassifier:
+def train_random_forest_model(df: pd.DataFrame, features: list, params: dict):
     """
     Trains a RandomForestClassifier using log-return target labels.
 
@@ -14,14 +14,40 @@ def train_random_forest_model(df: pd.DataFrame, features: list, params: dict) ->
     Returns:
         RandomForestClassifier: A trained model.
     """
-    df = df.copy()
-    df['target'] = (np.log(df['Close'].shift(-1) / df['Close']) > 0).astype(int)
-    df.dropna(subset=features + ['target'], inplace=True)
+    return train_model(df, features, params)
 
-    X = df[features]
-    y = df['target']
 
-    model = RandomForestClassifier(**params, random_state=15)
-    model.fit(X, y)
+def train_model(df: pd.DataFrame, features: list, params: dict, model_cls=None, random_state=15):
+    """
+    Trains any classifier or model backend (see `src.models.backends`) using log-return target labels.
+
+    Args:
+        df (pd.DataFrame): The input DataFrame with OHLCV and features.
+        features (list): List of column names used as features.
+        params (dict): Model hyperparameters.
+        model_cls: Classifier class or backend constructed with `params` and `random_state`
+            (defaults to RandomForestClassifier).
+        random_state (int): Seed passed to the model.
+
+    Returns:
+        A fitted model.
+    """
+    # Next-bar direction (the last row has no next bar and is labelled 0); only the feature
+    # columns of the kept rows are copied, not the whole frame
+    close = df['Close'].to_numpy(dtype=float)
+    target = np.zeros(len(df), dtype=int)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        target[:-1] = np.log(close[1:] / close[:-1]) > 0
+    keep = df[features].notna().all(axis=1).to_numpy()
+
+    X = df.loc[keep, features]
+    y = pd.Series(target[keep], index=X.index, name='target')
+
+    if model_cls is None:
+        # Imported on first use so loading a stored model does not pay for scikit-learn's import
+        from sklearn.ensemble import RandomForestClassifier as model_cls
+    model = model_cls(**params, random_state=random_state)
+    with metrics.span("fit"):
+        model.fit(X, y)
 
     return model
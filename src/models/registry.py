@@ -0,0 +1,138 @@
+# === registry.py (on-disk cache of fitted models for the live loop) ===
+import os
+import json
+import time
+import pickle
+import hashlib
+import pandas as pd
+from src.models.compact import FlatForest
+from src.models.ml_models import train_random_forest_model
+from src.monitoring.log import get_logger
+from src.monitoring.metrics import metrics
+
+logger = get_logger(__name__)
+
+
+def _digest(obj) -> str:
+    return hashlib.sha1(json.dumps(obj, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+
+
+def window_hash(df: pd.DataFrame, features: list) -> str:
+    """
+    Hashes the training window (index plus feature and Close values) a model would be fitted on.
+    """
+    cols = [c for c in dict.fromkeys(features + ['Close']) if c in df.columns]
+    hashed = pd.util.hash_pandas_object(df[cols], index=True).values
+    return hashlib.sha1(hashed.tobytes()).hexdigest()[:16]
+
+
+def _flatten(model):
+    # FlatForest copy of a tree model (or backend), None for models without one
+    try:
+        flat = model.compact() if hasattr(model, "compact") else FlatForest.from_sklearn(model)
+    except (AttributeError, ValueError):
+        return None
+    return flat if isinstance(flat, FlatForest) else None
+
+
+class ModelRegistry:
+    """
+    Stores fitted models on disk, one slot per (feature list, model params) pair, together with the
+    hash and end timestamp of the data window they were trained on. Tree models are also stored as
+    flat `FlatForest` arrays, which load without importing scikit-learn.
+
+    Args:
+        root (str): Directory holding the registry.
+        max_age (float): Seconds after which a stored model is considered stale regardless of data (None = never).
+        refit_every (pd.Timedelta): Reuse a stored model until the data window has rolled forward by this much.
+            None reuses a model only when the training window is identical.
+    """
+
+    def __init__(self, root="models", max_age=None, refit_every=None):
+        self.root = root
+        self.max_age = max_age
+        self.refit_every = pd.Timedelta(refit_every) if refit_every is not None else None
+
+    def slot(self, features: list, params: dict) -> str:
+        return os.path.join(self.root, _digest({"features": list(features), "params": params}))
+
+    def load(self, features: list, params: dict, df: pd.DataFrame = None, compact=False):
+        """
+        Returns the stored model if it is fresh for `df` under the registry policy, otherwise None.
+        With `compact` the stored FlatForest is returned when the slot has one.
+        """
+        path = self.slot(features, params)
+        try:
+            with open(os.path.join(path, "meta.json")) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if self.max_age is not None and time.time() - meta["trained_at"] > self.max_age:
+            return None
+
+        if df is not None:
+            if self.refit_every is None:
+                if meta["window_hash"] != window_hash(df, features):
+                    return None
+            elif df.index.max() - pd.Timestamp(meta["window_end"]) >= self.refit_every:
+                return None
+
+        if compact and os.path.exists(os.path.join(path, "compact.npz")):
+            return FlatForest.load(os.path.join(path, "compact.npz"))
+        with open(os.path.join(path, "model.pkl"), "rb") as f:
+            return pickle.load(f)
+
+    def save(self, model, features: list, params: dict, df: pd.DataFrame):
+        """
+        Writes the model and its training metadata, replacing whatever was in the slot.
+        """
+        path = self.slot(features, params)
+        os.makedirs(path, exist_ok=True)
+        meta = {
+            "features": list(features),
+            "params": params,
+            "window_hash": window_hash(df, features),
+            "window_start": str(df.index.min()),
+            "window_end": str(df.index.max()),
+            "rows": len(df),
+            "trained_at": time.time(),
+        }
+        files = [("model.pkl", "wb", lambda f: pickle.dump(model, f))]
+        flat = _flatten(model)
+        if flat is not None:
+            files.append(("compact.npz", "wb", flat.save))
+        elif os.path.exists(os.path.join(path, "compact.npz")):
+            os.remove(os.path.join(path, "compact.npz"))
+        files.append(("meta.json", "w", lambda f: json.dump(meta, f, indent=2, default=str)))
+        # Write to temp files first so a concurrent reader never sees a half-written model
+        for name, mode, dump in files:
+            tmp = os.path.join(path, f".{name}.tmp")
+            with open(tmp, mode) as f:
+                dump(f)
+            os.replace(tmp, os.path.join(path, name))
+
+    def get_or_train(self, df: pd.DataFrame, features: list, params: dict, train_fn=train_random_forest_model,
+                     verbose=True, compact=False):
+        """
+        Loads a fresh model from the registry or trains, stores and returns a new one.
+        With `compact` a tree model is returned as its FlatForest.
+
+        Returns:
+            (model, bool): The model and whether it came from the registry.
+        """
+        model = self.load(features, params, df, compact=compact)
+        if model is not None:
+            metrics.count("cache_hits", cache="model")
+            if verbose:
+                logger.info("♻️ Using cached model from registry")
+            return model, True
+
+        metrics.count("cache_misses", cache="model")
+        if verbose:
+            logger.info("🏋️ Training new model")
+        model = train_fn(df, features, params)
+        self.save(model, features, params, df)
+        if compact:
+            model = _flatten(model) or model
+        return model, False
@@ -0,0 +1,44 @@
+# === log.py (levelled, optionally JSON-structured logging for the pipeline) ===
+import sys
+import json
+import logging
+
+# Package logger every pipeline logger sits under
+ROOT = __name__.split(".")[0]
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record with time, level, logger, message and any `extra` fields."""
+
+    def format(self, record):
+        payload = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        payload.update({k: v for k, v in vars(record).items() if k not in _RESERVED})
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger under the pipeline's package namespace (e.g. get_logger(__name__))."""
+    return logging.getLogger(name if name == ROOT or name.startswith(ROOT + ".") else f"{ROOT}.{name}")
+
+
+def configure_logging(level="INFO", json_format=False, stream=None):
+    """
+    Sends pipeline logs to `stream` (stderr by default) at `level`, as plain text or JSON lines.
+    Without this call only warnings and errors are shown.
+    """
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(JsonFormatter() if json_format else
+                         logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    logger = logging.getLogger(ROOT)
+    logger.handlers[:] = [handler]
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
@@ -0,0 +1,268 @@
+# === metrics.py (timed spans, counters, per-stage profiling and JSON / Prometheus export) ===
+import io
+import os
+import json
+import time
+import pstats
+import cProfile
+import functools
+import threading
+from collections import deque
+from contextlib import contextmanager
+import numpy as np
+
+
+class LatencyStats:
+    """
+    Rolling per-stage latency samples, summarised in milliseconds.
+
+    Args:
+        window (int): Samples kept per stage for the percentiles (counts and totals cover the whole run).
+    """
+
+    def __init__(self, window=1000):
+        self.window = window
+        self.samples = {}
+        self.counts = {}
+        self.totals = {}
+
+    def record(self, stage: str, seconds: float):
+        samples = self.samples.get(stage)
+        if samples is None:
+            samples = self.samples[stage] = deque(maxlen=self.window)
+            self.counts[stage] = 0
+            self.totals[stage] = 0.0
+        samples.append(seconds)
+        self.counts[stage] += 1
+        self.totals[stage] += seconds
+
+    @contextmanager
+    def time(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def summary(self) -> dict:
+        """{stage: {count, total_s, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}}"""
+        summary = {}
+        for stage, samples in list(self.samples.items()):
+            ms = np.fromiter(samples, dtype=float) * 1e3
+            summary[stage] = {
+                "count": self.counts[stage],
+                "total_s": self.totals[stage],
+                "mean_ms": float(ms.mean()),
+                "p50_ms": float(np.percentile(ms, 50)),
+                "p95_ms": float(np.percentile(ms, 95)),
+                "p99_ms": float(np.percentile(ms, 99)),
+                "max_ms": float(ms.max()),
+            }
+        return summary
+
+
+def _key(name, labels):
+    return (name, tuple(sorted(labels.items()))) if labels else (name, ())
+
+
+class Metrics:
+    """
+    Process-wide registry of timed spans and counters for the pipeline hot paths.
+
+    Spans time a block (`with metrics.span("fetch"):` or `@metrics.timed("fit")`) and counters
+    accumulate events (`metrics.count("trades", reason="stop_loss")`). Stages named in `profile`
+    are additionally run under cProfile (every `every`-th call, to bound the overhead) and their
+    stats accumulated per stage.
+
+    Args:
+        window (int): Latency samples kept per span for percentiles.
+        enabled (bool): When False, spans and counters are no-ops.
+    """
+
+    def __init__(self, window=1000, enabled=True):
+        self.enabled = enabled
+        self.latency = LatencyStats(window)
+        self.counters = {}
+        self._lock = threading.Lock()
+        self._profiled = {}
+        self._profile_calls = {}
+        self._profiles = {}
+        self._profiling = False
+        self._captured = None
+
+    def reset(self):
+        """Clears all spans, counters and collected profiles (profiling stays configured)."""
+        with self._lock:
+            self.latency = LatencyStats(self.latency.window)
+            self.counters = {}
+            self._profile_calls = {}
+            self._profiles = {}
+
+    # === Counters ===
+    def count(self, name: str, value=1, **labels):
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def counter(self, name: str, **labels):
+        return self.counters.get(_key(name, labels), 0)
+
+    # === Spans ===
+    @contextmanager
+    def span(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        profiler = self._start_profile(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if profiler is not None:
+                self._stop_profile(name, profiler)
+            with self._lock:
+                self.latency.record(name, elapsed)
+                if self._captured is not None:
+                    self._captured.append((name, elapsed))
+
+    @contextmanager
+    def capture(self):
+        """
+        Also collects the spans recorded inside the block as a list of (name, seconds), e.g. to send
+        the timings of work done in a worker process back to the parent's registry via `merge`.
+        """
+        outer, self._captured = self._captured, []
+        try:
+            yield self._captured
+        finally:
+            captured, self._captured = self._captured, outer
+            if outer is not None:
+                outer.extend(captured)
+
+    def merge(self, spans):
+        """Records (name, seconds) span samples collected elsewhere (see `capture`)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            for name, seconds in spans:
+                self.latency.record(name, seconds)
+
+    def timed(self, name: str = None):
+        """Decorator timing every call of a function as a span (named after the function by default)."""
+        def decorate(fn):
+            span_name = name or fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    # === Profiling ===
+    def profile(self, stages, every=1):
+        """Runs the named spans under cProfile on every `every`-th call (stages=None switches it off)."""
+        self._profiled = {stage: every for stage in (stages or [])}
+
+    def _start_profile(self, name):
+        every = self._profiled.get(name)
+        if every is None or self._profiling:
+            return None
+        calls = self._profile_calls.get(name, 0)
+        self._profile_calls[name] = calls + 1
+        if calls % every:
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active in this process
+            return None
+        self._profiling = True
+        return profiler
+
+    def _stop_profile(self, name, profiler):
+        profiler.disable()
+        self._profiling = False
+        with self._lock:
+            if name in self._profiles:
+                self._profiles[name].add(profiler)
+            else:
+                self._profiles[name] = pstats.Stats(profiler, stream=io.StringIO())
+
+    def profile_report(self, stage: str, sort="cumulative", limit=20) -> str:
+        """Text report of the collected profile for one stage."""
+        stats = self._profiles.get(stage)
+        if stats is None:
+            return ""
+        stream = io.StringIO()
+        stats.stream = stream
+        stats.sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+    def dump_profiles(self, directory: str) -> list:
+        """Writes one <stage>.prof file per profiled stage (for snakeviz / pstats); returns the paths."""
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for stage, stats in self._profiles.items():
+            path = os.path.join(directory, f"{stage}.prof")
+            stats.dump_stats(path)
+            paths.append(path)
+        return paths
+
+    # === Export ===
+    def to_dict(self) -> dict:
+        return {
+            "spans": self.latency.summary(),
+            "counters": [{"name": name, "labels": dict(labels), "value": value}
+                         for (name, labels), value in sorted(self.counters.items())],
+        }
+
+    def to_json(self, path: str = None) -> str:
+        text = json.dumps(self.to_dict(), indent=2)
+        if path:
+            with open(path, "w") as f:
+                f.write(text)
+        return text
+
+    def to_prometheus(self, prefix="mes") -> str:
+        """Prometheus text exposition: counters as *_total, spans as *_seconds summaries."""
+        lines = []
+        seen = set()
+        for (name, labels), value in sorted(self.counters.items()):
+            metric = f"{prefix}_{_metric_name(name)}_total"
+            if metric not in seen:
+                lines.append(f"# TYPE {metric} counter")
+                seen.add(metric)
+            lines.append(f"{metric}{_labels(dict(labels))} {value}")
+        for stage, s in sorted(self.latency.summary().items()):
+            metric = f"{prefix}_{_metric_name(stage)}_seconds"
+            lines.append(f"# TYPE {metric} summary")
+            for q, field in (("0.5", "p50_ms"), ("0.95", "p95_ms"), ("0.99", "p99_ms")):
+                lines.append(f'{metric}{{quantile="{q}"}} {s[field] / 1e3:.9g}')
+            lines.append(f"{metric}_sum {s['total_s']:.9g}")
+            lines.append(f"{metric}_count {s['count']}")
+        return "\n".join(lines) + "\n"
+
+
+def _metric_name(name: str) -> str:
+    return "".join(c if c.isalnum() else "_" for c in name)
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    # Exposition format escapes backslash, double quote and newline inside label values
+    body = ",".join(f'{_metric_name(str(k))}="{_escape(v)}"' for k, v in sorted(labels.items()))
+    return "{" + body + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Shared registry used by the pipeline modules
+metrics = Metrics()
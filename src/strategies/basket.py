@@ -0,0 +1,49 @@
+# === basket.py (features + walk-forward over several continuous futures in parallel) ===
+import os
+from concurrent.futures import ProcessPoolExecutor
+from src.data.continuous import ContinuousContract
+from src.features.engineering import add_features
+from src.strategies.walkforward import run_wfv_with_params
+
+BASKET = ("MES", "MNQ", "M2K")
+
+
+def build_basket(store, start, end=None, roots=BASKET, method="volume", adjustment="difference", verbose=True) -> dict:
+    """
+    Continuous back-adjusted series for every root in the basket (cached per root, see `ContinuousContract`).
+
+    Returns:
+        dict: {root: OHLCV DataFrame}.
+    """
+    return {root: ContinuousContract(store, root, method, adjustment).build(start, end, verbose=verbose)[0]
+            for root in roots}
+
+
+def _run_symbol(root, bars, features, model_cls, params, fred_api_key, fred_cache, wfv_kwargs):
+    df = add_features(bars.copy(), fred_api_key, verbose=False, fred_cache=fred_cache)
+    return root, run_wfv_with_params(df, features, model_cls, params, plot=False, **wfv_kwargs)
+
+
+def run_basket(frames: dict, features, model_cls, params, fred_api_key=None, fred_cache=None, n_jobs=None,
+               **wfv_kwargs) -> dict:
+    """
+    Runs `add_features` and `run_wfv_with_params` for every symbol of a basket, one process per symbol.
+
+    Args:
+        frames (dict): {root: OHLCV DataFrame}, e.g. from `build_basket`.
+        features (list): Model feature columns.
+        model_cls, params: Model class and hyperparameters.
+        fred_api_key, fred_cache: FRED access for the macro features (shared by every symbol).
+        n_jobs (int): Worker processes (defaults to one per symbol, capped at the core count); 1 runs in-process.
+        **wfv_kwargs: Strategy arguments passed to `run_wfv_with_params`.
+
+    Returns:
+        dict: {root: (df_results, trade_log, stats)}.
+    """
+    jobs = [(root, bars, features, model_cls, params, fred_api_key, fred_cache, wfv_kwargs)
+            for root, bars in frames.items()]
+    workers = n_jobs or min(len(jobs), os.cpu_count())
+    if workers == 1 or len(jobs) <= 1:
+        return dict(_run_symbol(*job) for job in jobs)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return dict(pool.map(_run_symbol, *zip(*jobs)))
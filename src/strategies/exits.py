@@ -0,0 +1,81 @@
+# === exits.py (array-based stop / target / trailing / time exit resolution) ===
+import numpy as np
+
+EXIT_REASONS = np.array(['trailing_stop', 'stop_loss', 'take_profit', 'time_exit'], dtype=object)
+
+
+def resolve_exits(high, low, close, entry_idx, direction, stop_loss, take_profit,
+                  trail_offset=None, max_hold=10, trailing_stop=False, end=None):
+    """
+    Resolves the exit of every trade in bulk with a first-touch search over a
+    `max_hold` bar window, following the same rules as the bar-by-bar loop in
+    `run_wfv_with_params`: trailing stop first, then stop-loss, then take-profit,
+    otherwise a time exit at the close of the last bar in the window.
+
+    Args:
+        high, low, close: Price arrays for the bars a trade may run over.
+        entry_idx: Bar index of each entry.
+        direction: 1 for long, -1 for short, per trade.
+        stop_loss, take_profit: Price levels per trade.
+        trail_offset: Distance of the trailing stop from the best price (atr * atr_mult).
+        max_hold: Maximum number of bars held after entry.
+        trailing_stop: Whether the trailing stop is active.
+        end: Exclusive bar index trades cannot run past (defaults to len(close)), either one
+            for all trades or one per trade (e.g. the end of each trade's walk-forward fold).
+
+    Returns:
+        (np.ndarray, np.ndarray, np.ndarray): Exit bar index, exit price and exit reason per trade.
+    """
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+    entry_idx = np.asarray(entry_idx, dtype=np.int64)
+    direction = np.asarray(direction)
+    end = len(close) if end is None else np.asarray(end, dtype=np.int64)
+    n = len(entry_idx)
+
+    if n == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=float), np.empty(0, dtype=object)
+
+    width = max(max_hold, 0)
+    last_idx = np.minimum(entry_idx + width, end - 1)
+    if width == 0:
+        return last_idx, close[last_idx], EXIT_REASONS[np.full(n, 3)]
+
+    bars = entry_idx[:, None] + np.arange(1, width + 1)[None, :]
+    end_col = end[:, None] if np.ndim(end) else end
+    valid = bars < end_col
+    bars = np.minimum(bars, end_col - 1)
+    hi, lo = high[bars], low[bars]
+
+    is_long = (direction == 1)[:, None]
+    sl = np.asarray(stop_loss, dtype=float)[:, None]
+    tp = np.asarray(take_profit, dtype=float)[:, None]
+
+    # A level of exactly 0.0 never triggers in the loop (`if not exit_price`), so mirror that here
+    sl_hit = np.where(is_long, lo <= sl, hi >= sl) & valid & (sl != 0)
+    tp_hit = np.where(is_long, hi >= tp, lo <= tp) & valid & (tp != 0)
+    hit = sl_hit | tp_hit
+    exit_px = np.where(sl_hit, sl, tp)
+    code = np.where(sl_hit, 1, 2)
+
+    if trailing_stop:
+        entry_px = close[entry_idx][:, None]
+        offset = np.asarray(trail_offset, dtype=float)[:, None]
+        best_long = np.maximum.accumulate(np.maximum(hi, entry_px), axis=1)
+        best_short = np.minimum.accumulate(np.minimum(lo, entry_px), axis=1)
+        trail = np.where(is_long, best_long - offset, best_short + offset)
+        trail_hit = np.where(is_long, lo <= trail, hi >= trail) & valid & (trail != 0)
+        hit |= trail_hit
+        exit_px = np.where(trail_hit, trail, exit_px)
+        code = np.where(trail_hit, 0, code)
+
+    rows = np.arange(n)
+    first = hit.argmax(axis=1)
+    touched = hit[rows, first]
+
+    exit_idx = np.where(touched, entry_idx + 1 + first, last_idx)
+    exit_price = np.where(touched, exit_px[rows, first], close[last_idx])
+    reason = EXIT_REASONS[np.where(touched, code[rows, first], 3)]
+
+    return exit_idx, exit_price, reason
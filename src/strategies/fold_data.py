@@ -0,0 +1,116 @@
+# === fold_data.py (walk-forward inputs computed once and shared across runs) ===
+import os
+import json
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from src.strategies.walkforward import _fit_predict_fold, _map_folds
+
+
+class FoldData:
+    """
+    Precomputed walk-forward inputs for one (df, features, train_size, test_size) combination:
+    fold boundaries, a contiguous feature matrix, next-bar targets and row validity, plus a cache
+    of per-fold model probabilities keyed by model class, params and seed.
+
+    Runs that only change strategy parameters (thresholds, atr_mult, rr_ratio, ...) reuse the
+    cached probabilities and skip model fitting entirely.
+
+    Args:
+        df (pd.DataFrame): Feature frame with a 'Close' column.
+        features (list): Model feature columns.
+        train_size, test_size: Fold window sizes in rows.
+        dtype: Feature matrix dtype. float32 is lossless for scikit-learn trees, which cast to
+            float32 internally; use float64 for models that do not.
+        max_cached_models (int): Probability sets kept (least recently used are evicted first).
+    """
+
+    def __init__(self, df, features, train_size=60, test_size=10, dtype=np.float32, max_cached_models=32):
+        self.features = list(features)
+        self.train_size = train_size
+        self.test_size = test_size
+        self.index = df.index
+        self.starts = np.arange(0, max(len(df) - train_size - test_size, 0), test_size)
+
+        self.X = np.ascontiguousarray(df[self.features].to_numpy(dtype=dtype))
+        close = df['Close'].to_numpy(dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.target = np.zeros(len(df), dtype=np.int64)
+            self.target[:-1] = np.log(close[1:] / close[:-1]) > 0
+        # Fold training drops rows with a NaN in any column, as run_wfv_with_params always has
+        self.valid = df.notna().all(axis=1).to_numpy()
+        self.max_cached_models = max_cached_models
+        self._probas = OrderedDict()
+
+    def __len__(self):
+        return len(self.starts)
+
+    def matches(self, df, features, train_size, test_size) -> bool:
+        return (self.features == list(features) and self.train_size == train_size
+                and self.test_size == test_size and len(self.index) == len(df) and self.index.equals(df.index))
+
+    def train(self, k):
+        """
+        Training matrix and targets of fold k (the last training row has no next bar and is labelled 0).
+        The matrix is a view unless the window contains invalid rows.
+        """
+        start = self.starts[k]
+        rows = slice(start, start + self.train_size)
+        y = self.target[rows].copy()
+        y[-1] = 0
+        keep = self.valid[rows]
+        if keep.all():
+            return self.X[rows], y
+        return self.X[rows][keep], y[keep]
+
+    def test(self, k):
+        """Test matrix of fold k (a view, no copy)."""
+        start = self.starts[k] + self.train_size
+        return self.X[start:start + self.test_size]
+
+    def _key(self, model_cls, params, seed):
+        return (f"{model_cls.__module__}.{model_cls.__qualname__}",
+                json.dumps(params, sort_keys=True, default=str), seed)
+
+    def _cached(self, model_cls, params, seed):
+        key = self._key(model_cls, params, seed)
+        cached = self._probas.setdefault(key, [])
+        self._probas.move_to_end(key)
+        while len(self._probas) > self.max_cached_models:
+            self._probas.popitem(last=False)
+        return cached
+
+    def _params(self, params, k, seed):
+        return dict(params, random_state=seed + k) if seed is not None else params
+
+    def iter_probabilities(self, model_cls, params, seed=None):
+        """
+        Yields per-fold probabilities, serving cached folds and fitting (and caching) the rest.
+        Stopping early keeps the folds fitted so far in the cache.
+        """
+        cached = self._cached(model_cls, params, seed)
+        for k in range(len(self.starts)):
+            if k == len(cached):
+                cached.append(_fit_predict_fold(model_cls, self._params(params, k, seed), *self.train(k), self.test(k)))
+            yield cached[k]
+
+    def probabilities(self, model_cls, params, n_jobs=1, seed=None):
+        """
+        Returns the list of per-fold probabilities, fitting missing folds in a process pool when n_jobs != 1.
+        """
+        if n_jobs == 1:
+            return list(self.iter_probabilities(model_cls, params, seed))
+
+        cached = self._cached(model_cls, params, seed)
+        missing = range(len(cached), len(self.starts))
+        if len(missing):
+            workers = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+            folds = ((*self.train(k), self.test(k)) for k in missing)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                cached.extend(_map_folds(pool, model_cls, [self._params(params, k, seed) for k in missing],
+                                         folds, window=workers * 4))
+        return list(cached)
+
+    def clear(self):
+        """Drops all cached probabilities."""
+        self._probas.clear()
@@ -0,0 +1,186 @@
+# === grid.py (walk-forward backtest of a whole parameter grid from one set of fold probabilities) ===
+import itertools
+import numpy as np
+import pandas as pd
+from src.strategies.exits import resolve_exits
+from src.strategies.signals import compute_signals
+from src.strategies.walkforward import fold_probabilities
+
+# Strategy parameters a grid can vary, with the run_wfv_with_params defaults
+GRID_DEFAULTS = {
+    'confidence_threshold': 0.6,
+    'confidence_margin': 0.05,
+    'rsi_filter': 70,
+    'atr_threshold': None,
+    'atr_mult': 1.5,
+    'rr_ratio': 2.0,
+    'max_hold_days': 10,
+    'risk_fraction': 0.01,
+}
+SIGNAL_KEYS = ['confidence_threshold', 'confidence_margin', 'rsi_filter', 'atr_threshold']
+EXIT_KEYS = ['atr_mult', 'atr_threshold', 'rr_ratio', 'max_hold_days']
+
+
+def param_grid(grid: dict, **fixed) -> pd.DataFrame:
+    """
+    Every combination of the values in `grid`, one row each, with the remaining strategy
+    parameters taken from `fixed` or GRID_DEFAULTS.
+    """
+    unknown = set(grid) | set(fixed)
+    unknown -= set(GRID_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unsupported grid parameters: {sorted(unknown)}")
+    keys = list(grid)
+    combos = pd.DataFrame(list(itertools.product(*(list(grid[k]) for k in keys))), columns=keys)
+    for key, default in GRID_DEFAULTS.items():
+        if key not in combos.columns:
+            combos[key] = fixed.get(key, default)
+    return combos[keys + [k for k in GRID_DEFAULTS if k not in keys]]
+
+
+def _codes(combos, keys):
+    # Index of each combination's unique key tuple (None-safe, unlike groupby on NaN)
+    tuples = list(zip(*(combos[k].tolist() for k in keys)))
+    unique = list(dict.fromkeys(tuples))
+    lookup = {t: i for i, t in enumerate(unique)}
+    return unique, np.array([lookup[t] for t in tuples], dtype=np.int64)
+
+
+def run_wfv_grid(df, features, model_cls, best_params, grid, train_size=60, test_size=10, short_signals=False,
+                 trailing_stop=False, atr_mult_low=1.2, initial_capital=1000.0, commission_per_trade=0.0,
+                 slippage_points=0.0, periods_per_year=252, fold_probas=None, fold_data=None, n_jobs=1, seed=None,
+                 chunk_size=None, **fixed):
+    """
+    Walk-forward backtest of every combination in a parameter grid, reproducing the trade rules and
+    statistics of `run_wfv_with_params` without re-fitting models or looping over trades in Python.
+
+    The fold models are fitted once (or taken from `fold_probas` / `fold_data`). Entry signals are
+    computed once per distinct (threshold, margin, RSI, ATR-threshold) tuple and exits once per
+    distinct (atr_mult, atr_threshold, rr_ratio, max_hold_days) tuple; returns and statistics are
+    then evaluated with the combinations as an extra array axis, in chunks of `chunk_size`.
+
+    Args:
+        df, features, model_cls, best_params, train_size, test_size: As for `run_wfv_with_params`.
+        grid (dict): Values to sweep per parameter, e.g. {'confidence_threshold': [0.55, 0.6], 'atr_mult': [1, 2]}.
+            Any key of GRID_DEFAULTS may be swept; others can be fixed through keyword arguments.
+        short_signals, trailing_stop, atr_mult_low, initial_capital, commission_per_trade, slippage_points,
+            periods_per_year: Fixed strategy settings, as for `run_wfv_with_params`.
+        fold_probas (list): Precomputed per-fold probabilities (skips model fitting).
+        fold_data (FoldData): Precomputed fold inputs whose cached probabilities are reused.
+        n_jobs, seed: Fold fitting processes and per-fold seeds (see `fold_probabilities`).
+        chunk_size (int): Combinations evaluated per array chunk (default keeps chunks around 40 MB).
+
+    Returns:
+        pd.DataFrame: One row per combination with its parameters and sharpe, hit_rate,
+        max_drawdown, trade_count and score.
+    """
+    combos = param_grid(grid, **fixed)
+
+    if fold_probas is None:
+        if fold_data is not None:
+            if not fold_data.matches(df, features, train_size, test_size):
+                raise ValueError("fold_data was built for a different frame, feature list or fold sizes")
+            fold_probas = fold_data.probabilities(model_cls, best_params, n_jobs=n_jobs, seed=seed)
+        else:
+            fold_probas = fold_probabilities(df, features, model_cls, best_params, train_size, test_size,
+                                             n_jobs=n_jobs, seed=seed)
+
+    # Test windows of consecutive folds are contiguous, so the whole evaluation range is one slice
+    n_folds = len(fold_probas)
+    n = n_folds * test_size
+    test = df.iloc[train_size:train_size + n]
+    proba = np.concatenate(fold_probas) if n_folds else np.empty(0)
+    close = test['Close'].to_numpy(dtype=float)
+    high = test['High'].to_numpy(dtype=float)
+    low = test['Low'].to_numpy(dtype=float)
+    atr = test['atr'].to_numpy(dtype=float)
+    rsi = test['rsi'].to_numpy(dtype=float) if 'rsi' in test.columns else np.full(n, 50.0)
+    fold_end = (np.arange(n) // test_size + 1) * test_size
+
+    signal_keys, signal_code = _codes(combos, SIGNAL_KEYS)
+    signals = np.array([compute_signals(proba, rsi, atr, threshold, confidence_margin=margin, rsi_filter=rsi_f,
+                                        atr_threshold=atr_t, short_signals=short_signals)[0]
+                        for threshold, margin, rsi_f, atr_t in signal_keys], dtype=np.int8).reshape(-1, n)
+
+    # Per exit tuple: price move in the trade direction and risk per point, for longs and shorts
+    exit_keys, exit_code = _codes(combos, EXIT_KEYS)
+    move = np.zeros((len(exit_keys), 2, n))
+    risk = np.zeros((len(exit_keys), 2, n))
+    for e, (atr_mult, atr_t, rr_ratio, max_hold) in enumerate(exit_keys):
+        used = signals[np.unique(signal_code[exit_code == e])]
+        high_atr = atr > atr_t if atr_t else np.zeros(n, dtype=bool)
+        mult = np.where(high_atr, atr_mult_low, atr_mult)
+        for side, direction in enumerate((1, -1)):
+            entries = np.flatnonzero((used == direction).any(axis=0))
+            entry_close, entry_atr, entry_mult = close[entries], atr[entries], mult[entries]
+            stop_loss = entry_close - direction * entry_atr * entry_mult * -1
+            _, exit_price, _ = resolve_exits(
+                high, low, close, entries, np.full(len(entries), direction), stop_loss=stop_loss,
+                take_profit=entry_close + direction * entry_atr * entry_mult * rr_ratio,
+                trail_offset=entry_atr * entry_mult, max_hold=int(max_hold), trailing_stop=trailing_stop,
+                end=fold_end[entries])
+            move[e, side, entries] = direction * (exit_price - entry_close)
+            risk[e, side, entries] = np.abs(entry_close - stop_loss)
+
+    chunk_size = chunk_size or max(1, 5_000_000 // max(n, 1))
+    stats = []
+    for lo in range(0, len(combos), chunk_size):
+        rows = slice(lo, lo + chunk_size)
+        sig = signals[signal_code[rows]]
+        side = (sig == -1).astype(np.int64)
+        e = exit_code[rows][:, None]
+        cols = np.arange(n)[None, :]
+        trade_move = np.where(sig != 0, move[e, side, cols], 0.0)
+        trade_risk = risk[e, side, cols]
+        rf = combos['risk_fraction'].to_numpy(dtype=float)[rows][:, None]
+        returns = _returns(sig, trade_move, trade_risk, rf, initial_capital, commission_per_trade, slippage_points)
+        stats.append(_stats(returns, (sig != 0).sum(axis=1), periods_per_year))
+
+    result = pd.concat([combos, pd.concat(stats, ignore_index=True)], axis=1) if stats else \
+        combos.assign(sharpe=[], hit_rate=[], max_drawdown=[], trade_count=[], score=[])
+    return result
+
+
+def _returns(sig, move, risk, rf, initial_capital, commission, slippage_points):
+    """Per-bar strategy returns of each combination, compounding position size with equity."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        contracts_per_equity = np.where(risk > 0, rf / risk, 0.0)
+    traded = sig != 0
+
+    if commission == 0:
+        # Without a fixed commission the return of a trade does not depend on the equity level
+        returns = np.where(traded, move * contracts_per_equity - slippage_points * contracts_per_equity, 0.0)
+        growth_ok = (1 + returns) > 0
+        alive = np.ones_like(growth_ok)
+        alive[:, 1:] = np.logical_and.accumulate(growth_ok[:, :-1], axis=1)
+        return np.where(alive, returns, 0.0)
+
+    returns = np.zeros(sig.shape)
+    equity = np.full(sig.shape[0], float(initial_capital))
+    for i in np.flatnonzero(traded.any(axis=0)):
+        contracts = equity * rf[:, 0] / np.where(risk[:, i] > 0, risk[:, i], np.inf)
+        net = move[:, i] * contracts - commission - slippage_points * contracts
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r = np.where(traded[:, i] & (equity > 0), net / equity, 0.0)
+        returns[:, i] = r
+        equity = equity * (1 + r)
+    return returns
+
+
+def _stats(returns, trade_count, periods_per_year):
+    # Same formulas as wfv_stats, along the bar axis
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = returns.mean(axis=1)
+        std = returns.std(axis=1, ddof=1)
+        sharpe = mean / std * np.sqrt(periods_per_year)
+    hit_rate = (returns > 0).mean(axis=1)
+    cum = np.cumsum(returns, axis=1)
+    max_drawdown = (cum - np.maximum.accumulate(cum, axis=1)).min(axis=1) if returns.shape[1] else \
+        np.full(len(returns), np.nan)
+    return pd.DataFrame({
+        'sharpe': sharpe,
+        'hit_rate': hit_rate,
+        'max_drawdown': max_drawdown,
+        'trade_count': trade_count,
+        'score': sharpe - np.abs(max_drawdown) * 0.5 + hit_rate * 0.3,
+    })
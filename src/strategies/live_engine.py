@@ -0,0 +1,344 @@
+# === live_engine.py (long-running, bar-close driven live loop) ===
+import math
+import time
+import pandas as pd
+from src.api.schwab_data import fetch_mes_data
+from src.config.strategy_params import best_strategy_params, best_rf_params
+from src.data.contracts import front_month
+from src.data.fred_cache import FredCache
+from src.features.engineering import add_features, fred_indicators
+from src.features.incremental import IncrementalFeatureEngine
+from src.models.compact import FlatForest
+from src.models.ml_models import train_random_forest_model
+from src.monitoring.log import get_logger
+from src.monitoring.metrics import LatencyStats, metrics
+from src.strategies.live_recommender import LiveTradeRecommender
+
+OHLCV = ["Open", "High", "Low", "Close", "Volume"]
+
+logger = get_logger(__name__)
+
+
+class ReplaySource:
+    """
+    Candle source that replays recorded bars, e.g. a `CandleStore.read` frame or a CSV of
+    `fetch_mes_data` output.
+
+    Args:
+        bars (pd.DataFrame or str): OHLCV frame indexed by bar timestamp, or a CSV path.
+        speed (float): Replay speed relative to the bar timestamps (60 = one minute bar per second).
+            None replays as fast as possible.
+        sleep: Sleep function (injectable for tests).
+    """
+
+    def __init__(self, bars, speed=None, sleep=time.sleep):
+        if isinstance(bars, str):
+            bars = pd.read_csv(bars, index_col=0, parse_dates=True)
+        self.bars = bars
+        self.speed = speed
+        self.sleep = sleep
+
+    def __iter__(self):
+        values = self.bars[OHLCV].to_numpy(dtype=float)
+        prev_ts = None
+        for ts, row in zip(self.bars.index, values):
+            if self.speed and prev_ts is not None:
+                self.sleep(max((ts - prev_ts).total_seconds(), 0.0) / self.speed)
+            prev_ts = ts
+            yield ts, dict(zip(OHLCV, row))
+
+
+class PollingSource:
+    """
+    Candle source that polls Schwab price history once per bar close and yields each newly
+    closed bar exactly once.
+
+    The poll is scheduled against the wall clock (next multiple of `bar_seconds` plus `delay`),
+    so it does not drift the way a fixed sleep does. If the bar that just closed has not been
+    published yet, the poll is retried every `retry_every` seconds up to `max_retries` times.
+
+    Bar timestamps are bar open times in naive UTC, as returned by `fetch_mes_data`.
+
+    Args:
+        access_token (str): Schwab OAuth token.
+        symbol (str): Contract symbol (defaults to the MES front month).
+        bar_seconds (int): Bar length.
+        delay (float): Seconds to wait after the bar close before polling.
+        retry_every (float): Seconds between retries while the closed bar is missing.
+        max_retries (int): Retries per bar close.
+        start_after (pd.Timestamp): Only bars after this timestamp are yielded (e.g. the last warm-up bar).
+        fetch: Price history function with the `fetch_mes_data` signature.
+        clock, sleep: Wall clock (epoch seconds) and sleep functions (injectable for tests).
+    """
+
+    def __init__(self, access_token, symbol=None, bar_seconds=60, delay=2.0, retry_every=1.0,
+                 max_retries=10, start_after=None, fetch=fetch_mes_data, clock=time.time, sleep=time.sleep):
+        self.access_token = access_token
+        self.symbol = symbol or front_month("MES")
+        self.bar_seconds = bar_seconds
+        self.delay = delay
+        self.retry_every = retry_every
+        self.max_retries = max_retries
+        self.last_timestamp = pd.Timestamp(start_after) if start_after is not None else None
+        self.fetch = fetch
+        self.clock = clock
+        self.sleep = sleep
+        self.latency = LatencyStats()
+
+    def next_close(self, now: float) -> float:
+        """Epoch seconds of the first bar close after `now`."""
+        return (math.floor(now / self.bar_seconds) + 1) * self.bar_seconds
+
+    def closed(self, df: pd.DataFrame, now: float = None) -> pd.DataFrame:
+        """Drops bars that have not closed yet at `now` (defaults to the clock)."""
+        now = self.clock() if now is None else now
+        cutoff = pd.Timestamp(now - self.bar_seconds, unit="s")
+        return df[df.index <= cutoff]
+
+    def poll(self) -> pd.DataFrame:
+        """Fetches bars after the last yielded one and returns those that have closed (empty on errors)."""
+        try:
+            with self.latency.time("fetch"):
+                if self.last_timestamp is None:
+                    df = self.fetch(self.access_token, symbol=self.symbol, lookback_days=1)
+                else:
+                    df = self.fetch(self.access_token, symbol=self.symbol, start_date=self.last_timestamp,
+                                    end_date=pd.Timestamp(self.clock(), unit="s"))
+        except Exception as e:
+            metrics.count("poll_errors", source="schwab")
+            logger.warning(f"⚠️ Poll failed: {e}")
+            return pd.DataFrame(columns=OHLCV)
+        if df is None or df.empty:
+            return pd.DataFrame(columns=OHLCV)
+        df = self.closed(df.sort_index())
+        if self.last_timestamp is not None:
+            df = df[df.index > self.last_timestamp]
+        return df[~df.index.duplicated(keep="last")]
+
+    def __iter__(self):
+        catch_up = True
+        while True:
+            now = self.clock()
+            if catch_up:
+                # Yield bars that closed before the loop started without waiting for the next close
+                bar_close, catch_up = math.floor(now / self.bar_seconds) * self.bar_seconds, False
+            else:
+                bar_close = self.next_close(now)
+                self.sleep(max(bar_close + self.delay - now, 0.0))
+            expected = pd.Timestamp(bar_close - self.bar_seconds, unit="s")
+
+            for attempt in range(self.max_retries + 1):
+                bars = self.poll()
+                for ts, row in zip(bars.index, bars[OHLCV].to_numpy(dtype=float)):
+                    self.last_timestamp = ts
+                    self.latency.record("bar_lag", self.clock() - (ts.timestamp() + self.bar_seconds))
+                    yield ts, dict(zip(OHLCV, row))
+                if self.last_timestamp is not None and self.last_timestamp >= expected:
+                    break
+                if attempt < self.max_retries:
+                    self.sleep(self.retry_every)
+
+
+class LiveEngine:
+    """
+    Event-driven live loop: consumes closed bars from a candle source, updates features with an
+    `IncrementalFeatureEngine`, scores every bar with a `LiveTradeRecommender` and tracks open
+    positions against their stop-loss, take-profit and maximum hold.
+
+    Exits follow `run_wfv_with_params`: a position is checked from the bar after entry, stop-loss
+    before take-profit, and closed at the bar close once it has been held `max_hold` bars.
+
+    Usage:
+        engine = LiveEngine(recommender)
+        engine.warm_up(history)
+        engine.run(ReplaySource(recorded_bars, speed=600))
+
+    Args:
+        recommender (LiveTradeRecommender): Fitted model, features and strategy params.
+        feature_engine (IncrementalFeatureEngine): Defaults to a fresh engine without macros.
+        max_hold (int): Bars before a time exit (defaults to params['max_hold_days']).
+        max_positions (int): Open positions allowed at once; further signals are not taken.
+        on_signal, on_exit: Optional callbacks receiving the recommendation / closed trade dict.
+        verbose (bool): Log opened and closed positions.
+    """
+
+    def __init__(self, recommender, feature_engine=None, max_hold=None, max_positions=1, on_signal=None,
+                 on_exit=None, verbose=True):
+        self.recommender = recommender
+        self.feature_engine = feature_engine if feature_engine is not None else IncrementalFeatureEngine()
+        self.max_hold = max_hold if max_hold is not None else recommender.params.get('max_hold_days', 10)
+        self.max_positions = max_positions
+        self.on_signal = on_signal
+        self.on_exit = on_exit
+        self.verbose = verbose
+        self.latency = LatencyStats()
+        self.positions = []
+        self.trade_log = []
+        self.bars = 0
+        self.signals = 0
+
+    def warm_up(self, df):
+        """Feeds historical bars through the feature engine without scoring them."""
+        return self.feature_engine.warm_up(df)
+
+    def on_bar(self, timestamp, candle) -> dict:
+        """
+        Processes one closed bar: exits on open positions, feature update, scoring and entry.
+
+        Returns:
+            dict: timestamp, recommendation, opened (position or None) and closed (list of trades).
+        """
+        start = time.perf_counter()
+        with self.latency.time("positions"):
+            closed = self._update_positions(timestamp, candle)
+
+        with self.latency.time("features"):
+            self.feature_engine.update(timestamp, candle)
+            row = self.feature_engine.row()
+
+        with self.latency.time("score"):
+            if row[self.recommender.features].isna().any():
+                recommendation = {"reason": "missing_features"}
+                metrics.count("rejections", reason="missing_features")
+            else:
+                recommendation = self.recommender.generate(row, verbose=False)
+
+        opened = None
+        if 'direction' in recommendation:
+            self.signals += 1
+            if self.on_signal is not None:
+                self.on_signal(recommendation)
+            if len(self.positions) < self.max_positions:
+                opened = self._open(recommendation)
+
+        self.bars += 1
+        self.latency.record("total", time.perf_counter() - start)
+        return {"timestamp": timestamp, "recommendation": recommendation, "opened": opened, "closed": closed}
+
+    def _open(self, recommendation):
+        position = {
+            'entry_date': recommendation['date'],
+            'direction': recommendation['direction'],
+            'position': 1 if recommendation['direction'] == 'long' else -1,
+            'entry_price': recommendation['entry_price'],
+            'stop_loss': recommendation['stop_loss'],
+            'take_profit': recommendation['take_profit'],
+            'contracts': recommendation['contracts'],
+            'confidence': recommendation['confidence'],
+            'bars_held': 0,
+        }
+        self.positions.append(position)
+        metrics.count("positions_opened", direction=position['direction'])
+        if self.verbose:
+            logger.info(f"📈 Opened {position['direction']} @ {position['entry_price']} "
+                        f"(SL {position['stop_loss']:.2f}, TP {position['take_profit']:.2f}) on {position['entry_date']}")
+        return position
+
+    def _update_positions(self, timestamp, candle):
+        high, low, close = float(candle['High']), float(candle['Low']), float(candle['Close'])
+        closed, still_open = [], []
+        for p in self.positions:
+            p['bars_held'] += 1
+            signal = p['position']
+            exit_price, reason = None, None
+            if signal == 1 and low <= p['stop_loss']:
+                exit_price, reason = p['stop_loss'], 'stop_loss'
+            elif signal == 1 and high >= p['take_profit']:
+                exit_price, reason = p['take_profit'], 'take_profit'
+            elif signal == -1 and high >= p['stop_loss']:
+                exit_price, reason = p['stop_loss'], 'stop_loss'
+            elif signal == -1 and low <= p['take_profit']:
+                exit_price, reason = p['take_profit'], 'take_profit'
+            elif p['bars_held'] >= self.max_hold:
+                exit_price, reason = close, 'time_exit'
+
+            if reason is None:
+                still_open.append(p)
+                continue
+
+            trade = dict(p, exit_date=timestamp, exit_price=exit_price, reason=reason,
+                         dollar_pnl=signal * (exit_price - p['entry_price']) * p['contracts'])
+            self.trade_log.append(trade)
+            closed.append(trade)
+            metrics.count("trades", reason=reason)
+            if self.verbose:
+                logger.info(f"📉 Closed {trade['direction']} @ {exit_price} ({reason}) on {timestamp}: "
+                            f"{trade['dollar_pnl']:+.2f}")
+            if self.on_exit is not None:
+                self.on_exit(trade)
+        self.positions = still_open
+        return closed
+
+    def run(self, source, max_bars=None) -> dict:
+        """
+        Processes bars from `source` until it is exhausted, `max_bars` bars were seen or Ctrl-C.
+
+        Returns:
+            dict: The `summary` of the run.
+        """
+        try:
+            for n, (timestamp, candle) in enumerate(source, start=1):
+                self.on_bar(timestamp, candle)
+                if max_bars is not None and n >= max_bars:
+                    break
+        except KeyboardInterrupt:
+            logger.info("🛑 Live engine stopped")
+        return self.summary(source)
+
+    def summary(self, source=None) -> dict:
+        """Bar and trade counts, realized PnL and per-stage latency (including the source's, if it tracks any)."""
+        latency = self.latency.summary()
+        if source is not None and hasattr(source, "latency"):
+            latency.update(source.latency.summary())
+        return {
+            "bars": self.bars,
+            "signals": self.signals,
+            "open_positions": len(self.positions),
+            "closed_trades": len(self.trade_log),
+            "realized_pnl": float(sum(t['dollar_pnl'] for t in self.trade_log)),
+            "latency": latency,
+        }
+
+
+def run_live_engine(access_token, final_features, symbol=None, lookback_days=5, fred_api_key=None,
+                    fred_cache=None, registry=None, store=None, max_bars=None, compact_model=True, verbose=True,
+                    **engine_kwargs):
+    """
+    Long-running counterpart of `run_live_signal`: fetches and featurizes history once, fits (or
+    loads) the model, warms up the incremental features and then evaluates every new bar close.
+    With `compact_model` the forest is scored through a `FlatForest` for low per-bar latency.
+    As for `run_live_signal`, give the `registry` a refit schedule so restarts reuse the stored model.
+    """
+    symbol = symbol or front_month("MES")
+    history = store.sync(access_token, symbol=symbol) if store is not None else \
+        fetch_mes_data(access_token, symbol=symbol, lookback_days=lookback_days)
+    source = PollingSource(access_token, symbol=symbol)
+    history = source.closed(history)
+    source.last_timestamp = history.index[-1]
+
+    if fred_cache is None and fred_api_key:
+        fred_cache = FredCache(api_key=fred_api_key)
+    df = add_features(history.copy(), fred_api_key, verbose=verbose, fred_cache=fred_cache)
+    if registry is not None:
+        # A stored FlatForest loads without importing scikit-learn, which keeps restarts fast
+        model, _ = registry.get_or_train(df, final_features, best_rf_params, verbose=verbose, compact=compact_model)
+    else:
+        model = train_random_forest_model(df, final_features, best_rf_params)
+    if compact_model and not isinstance(model, FlatForest):
+        model = FlatForest.from_sklearn(model)
+
+    macro = {}
+    if fred_cache is not None:
+        series = fred_cache.get(list(fred_indicators), fred_api_key, verbose=verbose)
+        macro = {fred_indicators[code]: s for code, s in series.items()}
+
+    recommender = LiveTradeRecommender(
+        model=model,
+        features=final_features,
+        params=best_strategy_params,
+        initial_capital=1000.0,
+        risk_fraction=0.02,
+    )
+    engine = LiveEngine(recommender, IncrementalFeatureEngine(macro=macro), verbose=verbose, **engine_kwargs)
+    engine.warm_up(history)
+    return engine.run(source, max_bars=max_bars)
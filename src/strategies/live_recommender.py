@@ -3,8 +3,13 @@ import numpy as np
 import pandas as pd
 from src.features.engineering import add_features
 from src.models.ml_models import train_random_forest_model
-from src.api.schwab_data import fetch_mes_data  # ✅ ADD THIS
+from src.api.schwab_data import fetch_mes_data
 from src.config.strategy_params import best_strategy_params, best_rf_params
+from src.strategies.signals import compute_signals
+from src.monitoring.log import get_logger
+from src.monitoring.metrics import metrics
+
+logger = get_logger(__name__)
 
 class LiveTradeRecommender:
     def __init__(self, model, features, params, initial_capital=1000.0,
@@ -20,7 +25,8 @@ class LiveTradeRecommender:
     def generate(self, row, verbose=True):
         # Extract inputs
         x = row[self.features].values.reshape(1, -1)
-        proba = self.model.predict_proba(x)[0][1]
+        with metrics.span("predict"):
+            proba = self.model.predict_proba(x)[0][1]
         confidence_threshold = self.params['confidence_threshold']
         confidence_margin = self.params.get('confidence_margin', 0.05)
         rr_ratio = self.params['rr_ratio']
@@ -35,22 +41,21 @@ class LiveTradeRecommender:
         # Risk-adjusted ATR multiplier
         adj_atr_mult = self.atr_mult_low if atr_threshold and atr > atr_threshold else atr_mult
 
-        # Skip trades too close to neutral
-        if abs(proba - 0.5) < confidence_margin:
-            return {"reason": "confidence_margin_rejection", "confidence": proba}
-
-        if proba > confidence_threshold and rsi < self.params.get('rsi_filter', 70):
-            direction = 'long'
-            signal = 1
-        elif proba < (1 - confidence_threshold) and self.params.get('short_signals', True):
-            direction = 'short'
-            signal = -1
-        else:
-            return {"reason": "threshold_not_crossed", "confidence": proba}
-
-        # Reject long trades on high ATR if threshold hit
-        if signal == 1 and atr_threshold and atr > atr_threshold:
-            return {"reason": "high_atr_rejection", "atr": atr, "confidence": proba}
+        # Margin, threshold, RSI and ATR filters (shared with generate_batch)
+        signals, reasons = compute_signals([proba], [rsi], [atr], confidence_threshold,
+                                           confidence_margin=confidence_margin,
+                                           rsi_filter=self.params.get('rsi_filter', 70),
+                                           atr_threshold=atr_threshold,
+                                           short_signals=self.params.get('short_signals', True), rules='live')
+        signal, reason = int(signals[0]), reasons[0]
+        if signal == 0:
+            metrics.count("rejections", reason=reason)
+        if reason == "high_atr_rejection":
+            return {"reason": reason, "atr": atr, "confidence": proba}
+        if signal == 0:
+            return {"reason": reason, "confidence": proba}
+        direction = 'long' if signal == 1 else 'short'
+        metrics.count("signals", direction=direction)
 
         # Risk and sizing
         stop_loss = close - signal * atr * adj_atr_mult * -1
@@ -72,16 +77,103 @@ class LiveTradeRecommender:
         }
 
         if verbose:
-            print("\n📈 Live Trade Signal")
-            for k, v in result.items():
-                print(f"{k:>15}: {v}")
+            logger.info("📈 Live Trade Signal\n" + "\n".join(f"{k:>15}: {v}" for k, v in result.items()),
+                        extra={"signal": result})
 
         return result
-        
-def run_live_signal(access_token, final_features, vix_data=None, verbose=True):
-    df = fetch_mes_data(access_token)
-    df = add_features(df)
-    model = train_random_forest_model(df, final_features, best_rf_params)
+
+    def generate_batch(self, df, verbose=False):
+        """
+        Vectorized `generate` over every row of `df`: one predict_proba call for the whole
+        feature matrix, then the same margin / threshold / RSI / ATR filters and sizing as arrays.
+
+        Returns:
+            pd.DataFrame: One row per input row (same index) with the fields `generate` would return;
+            rejected rows carry only reason and confidence (plus atr for high_atr_rejection).
+        """
+        n = len(df)
+        with metrics.span("predict_batch"):
+            proba = self.model.predict_proba(df[self.features].values)[:, 1] if n else np.empty(0)
+        confidence_threshold = self.params['confidence_threshold']
+        confidence_margin = self.params.get('confidence_margin', 0.05)
+        rr_ratio = self.params['rr_ratio']
+        atr_mult = self.params['atr_mult']
+        atr_threshold = self.params.get('atr_threshold', None)
+
+        close = df['Close'].to_numpy(dtype=float)
+        atr = df['atr'].to_numpy(dtype=float)
+        rsi = df['rsi'].to_numpy(dtype=float) if 'rsi' in df.columns else np.full(n, 50.0)
+
+        high_atr = atr > atr_threshold if atr_threshold else np.zeros(n, dtype=bool)
+        adj_atr_mult = np.where(high_atr, self.atr_mult_low, atr_mult)
+
+        signal, reason = compute_signals(proba, rsi, atr, confidence_threshold,
+                                         confidence_margin=confidence_margin,
+                                         rsi_filter=self.params.get('rsi_filter', 70),
+                                         atr_threshold=atr_threshold,
+                                         short_signals=self.params.get('short_signals', True), rules='live')
+        accepted = signal != 0
+        atr_rejected = reason == 'high_atr_rejection'
+
+        # Risk and sizing
+        stop_loss = close - signal * atr * adj_atr_mult * -1
+        take_profit = close + signal * atr * adj_atr_mult * rr_ratio
+        risk_per_point = np.abs(close - stop_loss)
+        capital_at_risk = self.initial_capital * self.risk_fraction
+        contracts = np.divide(capital_at_risk, risk_per_point, out=np.zeros(n), where=risk_per_point > 0)
+
+        for r, c in zip(*np.unique(reason[~accepted], return_counts=True)):
+            metrics.count("rejections", int(c), reason=str(r))
+        for d, label in ((1, 'long'), (-1, 'short')):
+            metrics.count("signals", int((signal == d).sum()), direction=label)
+
+        reason[accepted] = 'Live signal with filtered confidence and ATR'
+
+        result = pd.DataFrame({
+            'direction': np.select([signal == 1, signal == -1], ['long', 'short'], '').astype(object),
+            'entry_price': np.where(accepted, close, np.nan),
+            'stop_loss': np.where(accepted, stop_loss, np.nan),
+            'take_profit': np.where(accepted, take_profit, np.nan),
+            'confidence': proba,
+            'expected_rr': np.where(accepted, rr_ratio, np.nan),
+            'contracts': np.where(accepted, contracts, np.nan),
+            'reason': reason,
+            'atr': np.where(atr_rejected, atr, np.nan),
+        }, index=df.index)
+        result.loc[~accepted, 'direction'] = None
+
+        if verbose:
+            logger.info(f"📈 Batch signals: {int(accepted.sum())} of {n} rows\n"
+                        + result['reason'].value_counts().to_string())
+
+        return result
+
+
+def run_live_signal(access_token, final_features, vix_data=None, verbose=True, registry=None, store=None,
+                    fred_api_key=None, fred_cache=None):
+    """
+    Fetches recent bars, builds features, fits (or loads) the model and returns the recommendation
+    for the latest bar.
+
+    Args:
+        access_token (str): Schwab access token.
+        final_features (list): Model feature columns.
+        vix_data: Optional VIX levels passed to `LiveTradeRecommender`.
+        registry (ModelRegistry): Reuses a stored model instead of training on every call. Build it
+            with a refit schedule (e.g. `ModelRegistry("models", refit_every="1D")`): with the default
+            refit_every=None a model is only reused for an identical data window, and every new
+            candle changes the window, so each call would retrain.
+        store (CandleStore): Syncs only the missing tail from Schwab instead of refetching history.
+        fred_api_key (str), fred_cache (FredCache): Macro data for `add_features`; one is required.
+    """
+    # With a local candle store only the missing tail is requested from Schwab
+    df = store.sync(access_token) if store is not None else fetch_mes_data(access_token)
+    df = add_features(df, fred_api_key, verbose=verbose, fred_cache=fred_cache)
+    # Reuse a cached model from the registry when it is still fresh for this data window
+    if registry is not None:
+        model, _ = registry.get_or_train(df, final_features, best_rf_params, verbose=verbose)
+    else:
+        model = train_random_forest_model(df, final_features, best_rf_params)
     today_row = df.iloc[-1]
 
     live_reco = LiveTradeRecommender(
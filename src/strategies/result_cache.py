@@ -0,0 +1,161 @@
+# === result_cache.py (content-addressed on-disk cache of walk-forward results) ===
+import os
+import json
+import pickle
+import hashlib
+import numpy as np
+import pandas as pd
+from src.monitoring.log import get_logger
+from src.monitoring.metrics import metrics
+
+logger = get_logger(__name__)
+
+# Bump when a change to the fold simulation makes stored results stale
+CACHE_VERSION = 1
+
+
+def frame_hash(obj) -> str:
+    """Hashes a DataFrame or Series (index, column names and values)."""
+    hashed = pd.util.hash_pandas_object(obj, index=True).to_numpy()
+    digest = hashlib.sha1(hashed.tobytes())
+    if isinstance(obj, pd.DataFrame):
+        digest.update(json.dumps([str(c) for c in obj.columns]).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _fingerprint(value):
+    # JSON-able stand-in for a run argument; pandas / numpy data is replaced by its content hash
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return {"frame": frame_hash(value)}
+    if isinstance(value, np.ndarray):
+        return {"array": hashlib.sha1(np.ascontiguousarray(value).tobytes()).hexdigest(), "dtype": str(value.dtype),
+                "shape": list(value.shape)}
+    if isinstance(value, dict):
+        return {str(k): _fingerprint(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_fingerprint(v) for v in value]
+    if isinstance(value, type):
+        return f"{value.__module__}.{value.__qualname__}"
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class ResultCache:
+    """
+    Stores complete `run_wfv_with_params` results (per-bar results, trade log and stats) on disk,
+    keyed by a hash of everything that determines them: the input frame, feature list, model class
+    and params, fold sizes, seed and strategy settings. Repeating a configuration returns the
+    stored result without fitting a single fold.
+
+    Layout: <root>/<key>.pkl, one pickle per run. Reads refresh the file's modification time and
+    the least recently used entries are evicted once the cache exceeds `max_bytes`.
+
+    Runs without a seed are cached too, although refitting them would draw new random forests;
+    the stored result is then simply the first draw.
+
+    Args:
+        root (str): Cache directory.
+        max_bytes (int): Size bound of all entries together.
+    """
+
+    def __init__(self, root="data/wfv_results", max_bytes=2 * 1024 ** 3):
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def key(self, df, features, model_cls, params, **settings) -> str:
+        """Hex digest identifying a run; `settings` are the remaining result-affecting arguments."""
+        payload = {
+            "version": CACHE_VERSION,
+            "data": frame_hash(df),
+            "features": list(features),
+            "model": _fingerprint(model_cls),
+            "params": _fingerprint(params),
+            "settings": _fingerprint(settings),
+        }
+        return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.pkl")
+
+    def get(self, key: str):
+        """
+        Returns the stored entry (dict with results, trades, stats and fold_trades) or None.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+            os.utime(path)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            metrics.count("cache_misses", cache="wfv")
+            return None
+        metrics.count("cache_hits", cache="wfv")
+        logger.debug(f"♻️ Walk-forward result {key[:12]} served from cache")
+        return entry
+
+    def put(self, key: str, results: pd.DataFrame, trades: pd.DataFrame, stats: dict, fold_trades=None):
+        """
+        Stores a finished run, then evicts least recently used entries beyond `max_bytes`.
+
+        Args:
+            fold_trades (list): Cumulative trade count after each fold, replayed to fold callbacks on a hit.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        entry = {"results": results, "trades": trades, "stats": stats, "fold_trades": list(fold_trades or [])}
+        # Write to a temp file first so a concurrent reader (e.g. another tuning worker) never sees half an entry
+        tmp = os.path.join(self.root, f".{key}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self._path(key))
+        self.evict()
+
+    def entries(self) -> list:
+        """(mtime, bytes, path) of every stored entry, least recently used first."""
+        found = []
+        try:
+            names = os.listdir(self.root)
+        except FileNotFoundError:
+            return found
+        for name in names:
+            if not name.endswith(".pkl"):
+                continue
+            path = os.path.join(self.root, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            found.append((stat.st_mtime, stat.st_size, path))
+        return sorted(found)
+
+    def size(self) -> int:
+        """Total bytes of all stored entries."""
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, max_bytes=None) -> int:
+        """
+        Removes least recently used entries until the cache fits `max_bytes` (default: the cache bound).
+
+        Returns:
+            int: Number of entries removed.
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        if removed:
+            metrics.count("cache_evictions", value=removed, cache="wfv")
+        return removed
+
+    def clear(self):
+        """Removes every stored entry."""
+        self.evict(max_bytes=0)
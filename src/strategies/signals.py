@@ -0,0 +1,69 @@
+# === signals.py (shared entry rules for the backtester and the live recommender) ===
+import numpy as np
+
+
+# RSI filter scope per caller: the backtest has always filtered every trade on RSI, the live
+# recommender only longs (a long needs rsi < rsi_filter, so NaN RSI blocks it)
+RULES = {
+    'backtest': 'all',
+    'live': 'long',
+}
+
+
+def compute_signals(proba, rsi, atr, confidence_threshold, confidence_margin=0.05, rsi_filter=70,
+                    atr_threshold=None, short_signals=False, rules='backtest'):
+    """
+    Turns model probabilities into entry signals with the confidence-margin, long/short threshold,
+    RSI and ATR filters, evaluated as array rules.
+
+    Both callers go through the same rule chain, checked in this order:
+
+    1. confidence margin: |proba - 0.5| < confidence_margin rejects the bar,
+    2. RSI filter (see below),
+    3. ATR filter: longs are rejected when atr > atr_threshold,
+    4. proba > confidence_threshold goes long, proba < 1 - confidence_threshold goes short
+       (with short_signals), anything else is 'threshold_not_crossed'.
+
+    The one intended difference is the scope of the RSI filter, selected by `rules`:
+
+    - 'backtest' (run_wfv_with_params, grid): any trade is rejected when rsi > rsi_filter.
+    - 'live' (LiveTradeRecommender): only longs are filtered, and a long needs rsi < rsi_filter,
+      so shorts ignore RSI and a long at exactly rsi_filter (or with NaN RSI) is rejected.
+
+    Signals agree between the two wherever the RSI filter does not apply, e.g. for every bar with
+    rsi < rsi_filter. Both keep the signals of the original per-row implementations (for
+    confidence_threshold >= 0.5, where a bar cannot be above both thresholds).
+
+    Args:
+        proba, rsi, atr: Arrays of up-probability, RSI and ATR per bar.
+        confidence_threshold (float): Minimum probability for a long (1 - threshold for a short).
+        confidence_margin (float): Minimum distance of the probability from 0.5.
+        rsi_filter (float): RSI level above which trades are filtered.
+        atr_threshold (float): ATR above which longs are rejected (None disables).
+        short_signals (bool): Whether short entries are allowed.
+        rules (str): 'backtest' or 'live'.
+
+    Returns:
+        (np.ndarray, np.ndarray): Signal per bar (1 long, -1 short, 0 flat) and the reason
+        ('accepted' or the rejection that applied).
+    """
+    if rules not in RULES:
+        raise ValueError(f"Unknown signal rules: {rules}")
+    proba = np.asarray(proba, dtype=float)
+    rsi = np.asarray(rsi, dtype=float)
+    atr = np.asarray(atr, dtype=float)
+
+    high_atr = atr > atr_threshold if atr_threshold else np.zeros(proba.shape, dtype=bool)
+    margin_rejected = np.abs(proba - 0.5) < confidence_margin
+    above = proba > confidence_threshold
+    below = (proba < (1 - confidence_threshold)) & bool(short_signals)
+    if RULES[rules] == 'all':
+        rsi_rejected = (above | below) & (rsi > rsi_filter)
+    else:
+        rsi_rejected = above & ~(rsi < rsi_filter)
+
+    conditions = [margin_rejected, rsi_rejected, above & high_atr, above, below]
+    reasons = ['confidence_margin_rejection', 'rsi_rejection', 'high_atr_rejection', 'accepted', 'accepted']
+    signal = np.select(conditions, [0, 0, 0, 1, -1], 0)
+    reason = np.select(conditions, reasons, 'threshold_not_crossed').astype(object)
+    return signal, reason
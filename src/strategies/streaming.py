@@ -0,0 +1,179 @@
+# === streaming.py (out-of-core walk-forward over chunked feature frames) ===
+import os
+import json
+import math
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from src.monitoring.log import get_logger
+from src.strategies.walkforward import (_fold_data, _fit_predict_fold, _map_folds, _simulate_fold, plot_cumulative,
+                                        strategy_settings)
+
+logger = get_logger(__name__)
+
+
+class RunningStats:
+    """
+    `wfv_stats` accumulated fold by fold: count, Welford mean / variance, winning bars and the
+    running cumulative return with its peak and deepest drawdown, without keeping the returns.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.wins = 0
+        self.cum = 0.0
+        self.peak = -math.inf
+        self.max_drawdown = math.nan
+
+    def update(self, returns):
+        returns = np.asarray(returns, dtype=float)
+        if not len(returns):
+            return
+        # Batched Welford update (Chan et al.)
+        n_b, mean_b = len(returns), returns.mean()
+        m2_b = ((returns - mean_b) ** 2).sum()
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + delta ** 2 * self.n * n_b / n
+        self.n = n
+        self.wins += int((returns > 0).sum())
+
+        # Continue the cumulative sum from the previous fold, exactly as one cumsum over the run would
+        cum = np.cumsum(np.concatenate([[self.cum], returns]))[1:]
+        peaks = np.maximum.accumulate(np.concatenate([[self.peak], cum]))[1:]
+        drawdown = (cum - peaks).min()
+        self.max_drawdown = drawdown if math.isnan(self.max_drawdown) else min(self.max_drawdown, drawdown)
+        self.cum, self.peak = cum[-1], peaks[-1]
+
+    def summary(self, trade_count, periods_per_year=252) -> dict:
+        """Same fields as `wfv_stats`."""
+        std = math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else math.nan
+        mean = self.mean if self.n else math.nan
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sharpe = float(np.float64(mean) / std * np.sqrt(periods_per_year))
+        hit_rate = self.wins / self.n if self.n else math.nan
+        return {
+            "sharpe": sharpe,
+            "hit_rate": hit_rate,
+            "max_drawdown": self.max_drawdown,
+            "trade_count": trade_count,
+            "score": sharpe - abs(self.max_drawdown) * 0.5 + hit_rate * 0.3,
+        }
+
+
+def run_wfv_streaming(chunks, features, model_cls, best_params, out_dir, train_size=60, test_size=10,
+                      initial_capital=1000.0, n_jobs=1, seed=None, incremental=False, periods_per_year=252,
+                      plot=None, **strategy):
+    """
+    Out-of-core `run_wfv_with_params`: consumes consecutive feature frames (e.g.
+    `iter_feature_chunks(store.iter_chunks(symbol))`), keeps only the rows from the next fold's
+    start onwards in memory, and appends per-bar results and trades to CSV files as folds finish.
+
+    Folds, model fits and trades are identical to an in-memory run over the concatenated chunks
+    (trades never outlive their fold, so equity is the only state carried forward); statistics are
+    accumulated on the fly and agree with `wfv_stats` to float rounding. Memory is bounded by the
+    chunk size plus one fold window.
+
+    Args:
+        chunks: Iterable of feature frames in time order.
+        features, model_cls, best_params, train_size, test_size, initial_capital, seed, incremental,
+            periods_per_year: As for `run_wfv_with_params`.
+        out_dir (str): Receives results.csv (date, strategy_return, proba, cum_return, cum_pct),
+            trades.csv and stats.json; existing files are replaced.
+        n_jobs (int): Worker processes fitting the folds of each chunk (1 runs in-process).
+        plot (str): Save the cumulative return chart to this path once the run is done.
+        **strategy: Trade-rule arguments of `run_wfv_with_params` (confidence_threshold, atr_mult, ...).
+
+    Returns:
+        dict: The run statistics (also written to stats.json).
+    """
+    if incremental and n_jobs != 1:
+        raise ValueError("incremental folds are fitted sequentially; n_jobs does not apply")
+    strategy = strategy_settings(**strategy)
+    os.makedirs(out_dir, exist_ok=True)
+    results_path = os.path.join(out_dir, "results.csv")
+    trades_path = os.path.join(out_dir, "trades.csv")
+    for path in (results_path, trades_path):
+        if os.path.exists(path):
+            os.remove(path)
+
+    stats = RunningStats()
+    equity = initial_capital
+    trade_count = 0
+    fold = 0
+    buffer, offset, next_start = None, 0, 0
+    model = None
+    workers = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+    pool = ProcessPoolExecutor(max_workers=workers) if n_jobs != 1 else None
+
+    def fold_params(k):
+        return dict(best_params, random_state=seed + k) if seed is not None else best_params
+
+    try:
+        for chunk in chunks:
+            if chunk is None or chunk.empty:
+                continue
+            buffer = chunk if buffer is None else pd.concat([buffer, chunk])
+
+            # A fold runs once a row beyond its test window exists, matching the in-memory fold count
+            starts = []
+            while next_start + train_size + test_size < offset + len(buffer):
+                starts.append(next_start - offset)
+                next_start += test_size
+            if not starts:
+                continue
+
+            if incremental:
+                fold_probas = []
+                for k, start in enumerate(starts, start=fold):
+                    X_train, y_train, X_test = _fold_data(buffer, features, start, train_size, test_size)
+                    if model is None:
+                        model = model_cls(**fold_params(0))
+                        model.fit(X_train, y_train)
+                    else:
+                        n_new = int((X_train.index >= buffer.index[start + train_size - test_size]).sum())
+                        model.update(X_train, y_train, n_new=n_new)
+                    fold_probas.append(model.predict_proba(X_test)[:, 1])
+            elif pool is None:
+                fold_probas = (_fit_predict_fold(model_cls, fold_params(k),
+                                                 *_fold_data(buffer, features, start, train_size, test_size))
+                               for k, start in enumerate(starts, start=fold))
+            else:
+                folds = (_fold_data(buffer, features, start, train_size, test_size) for start in starts)
+                fold_probas = _map_folds(pool, model_cls, [fold_params(k) for k in range(fold, fold + len(starts))],
+                                         folds, window=workers * 4)
+
+            for start, probas in zip(starts, fold_probas):
+                test = buffer.iloc[start + train_size:start + train_size + test_size].copy()
+                trade_log = []
+                fold_returns, equity = _simulate_fold(test, probas, equity, trade_log, **strategy)
+
+                cum_start = stats.cum
+                stats.update(fold_returns)
+                cum_return = np.cumsum(np.concatenate([[cum_start], fold_returns]))[1:]
+                results = pd.DataFrame({'strategy_return': fold_returns, 'proba': probas, 'cum_return': cum_return,
+                                        'cum_pct': np.exp(cum_return) - 1}, index=test.index.rename('date'))
+                results.to_csv(results_path, mode='a', header=fold == 0)
+                if trade_log:
+                    pd.DataFrame(trade_log).to_csv(trades_path, mode='a', header=trade_count == 0, index=False)
+                trade_count += len(trade_log)
+                fold += 1
+
+            # Keep only what the next fold needs
+            buffer = buffer.iloc[next_start - offset:].copy()
+            offset = next_start
+            logger.info(f"🧮 {fold} folds done, equity {equity:.2f}, {trade_count} trades")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    summary = stats.summary(trade_count, periods_per_year)
+    with open(os.path.join(out_dir, "stats.json"), "w") as f:
+        json.dump({**summary, "folds": fold, "final_equity": equity}, f, indent=2)
+    if plot and fold:
+        cum_pct = pd.read_csv(results_path, usecols=['date', 'cum_pct'], index_col='date', parse_dates=True)
+        plot_cumulative(cum_pct['cum_pct'], path=plot)
+    return summary
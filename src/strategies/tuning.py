@@ -0,0 +1,164 @@
+# === tuning.py (parallel Optuna search over run_wfv_with_params) ===
+import os
+import json
+import glob
+import math
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+import optuna
+from optuna.storages import JournalStorage
+from optuna.storages.journal import JournalFileBackend
+from sklearn.ensemble import RandomForestClassifier
+from src.strategies.walkforward import run_wfv_with_params, wfv_stats
+from src.strategies.fold_data import FoldData
+from src.monitoring.log import get_logger
+
+logger = get_logger(__name__)
+
+
+def suggest_params(trial):
+    """
+    Search space for the parameters stored in `src.config.strategy_params`.
+
+    Returns:
+        (dict, dict): Strategy parameters and RandomForest parameters.
+    """
+    strategy_params = {
+        'confidence_threshold': trial.suggest_float('confidence_threshold', 0.5, 0.7),
+        'atr_mult': trial.suggest_float('atr_mult', 1.0, 3.0),
+        'rr_ratio': trial.suggest_float('rr_ratio', 1.0, 3.0),
+        'confidence_margin': trial.suggest_float('confidence_margin', 0.0, 0.1),
+        'atr_threshold': trial.suggest_float('atr_threshold', 20.0, 150.0),
+        'max_hold_days': trial.suggest_int('max_hold_days', 2, 15),
+    }
+    rf_params = {
+        'n_estimators': trial.suggest_int('n_estimators', 10, 200, log=True),
+        'max_depth': trial.suggest_int('max_depth', 2, 10),
+    }
+    return strategy_params, rf_params
+
+
+def make_objective(df, features, wfv_kwargs=None, report_every=0.1, result_cache=None):
+    """
+    Builds an Optuna objective that scores a trial with `run_wfv_with_params` (stats['score']).
+
+    Partial scores are reported to the pruner every `report_every` fraction of the folds, so
+    unpromising trials stop before the remaining folds are fitted. With a `result_cache`
+    (ResultCache), trials repeating an earlier configuration, in this or a previous session,
+    are scored from the stored result.
+    """
+    wfv_kwargs = dict(wfv_kwargs or {})
+    train_size = wfv_kwargs.get('train_size', 60)
+    test_size = wfv_kwargs.get('test_size', 10)
+    n_folds = len(range(0, len(df) - train_size - test_size, test_size))
+    step = max(1, int(n_folds * report_every))
+    # Built once per worker: trials repeating model params skip fitting
+    fold_data = FoldData(df, features, train_size, test_size)
+
+    def objective(trial):
+        strategy_params, rf_params = suggest_params(trial)
+
+        def report(fold, returns, trade_count):
+            if (fold + 1) % step or fold + 1 == n_folds:
+                return
+            score = wfv_stats(returns, trade_count, wfv_kwargs.get('periods_per_year', 252))['score']
+            if math.isfinite(score):
+                trial.report(score, fold)
+                if trial.should_prune():
+                    raise optuna.TrialPruned()
+
+        kwargs = dict(wfv_kwargs, **strategy_params)
+        kwargs.setdefault('seed', 15)
+        _, trade_log, stats = run_wfv_with_params(df, features, RandomForestClassifier, rf_params,
+                                                  plot=False, fold_callback=report, fold_data=fold_data,
+                                                  result_cache=result_cache, **kwargs)
+        trial.set_user_attr('trade_count', int(stats['trade_count']))
+        return stats['score'] if math.isfinite(stats['score']) else float('-inf')
+
+    return objective
+
+
+def _storage(path):
+    return JournalStorage(JournalFileBackend(path))
+
+
+def _run_worker(study_name, storage_path, df, features, n_trials, wfv_kwargs, seed, result_cache=None):
+    study = optuna.load_study(study_name=study_name, storage=_storage(storage_path),
+                              sampler=optuna.samplers.TPESampler(seed=seed),
+                              pruner=optuna.pruners.MedianPruner(n_startup_trials=10, n_warmup_steps=1))
+    study.optimize(make_objective(df, features, wfv_kwargs, result_cache=result_cache), n_trials=n_trials)
+
+
+def tune(df, features, n_trials=500, n_workers=None, study_name="mes_wfv", storage_path="optuna_journal.log",
+         wfv_kwargs=None, seed=0, output_dir="data/tuned", result_cache=None):
+    """
+    Runs a parallel Optuna search over the walk-forward backtest and writes the best parameters
+    to a versioned config file.
+
+    Trials are split across `n_workers` processes sharing a journal-file storage, so a search can
+    be resumed by calling `tune` again with the same study name and storage path.
+
+    Args:
+        df (pd.DataFrame): Feature frame (output of `add_features`).
+        features (list): Model feature columns.
+        n_trials (int): Total trials across workers.
+        n_workers (int): Worker processes (defaults to every core).
+        study_name (str): Optuna study name.
+        storage_path (str): Journal file shared by the workers.
+        wfv_kwargs (dict): Fixed `run_wfv_with_params` arguments (train_size, short_signals, ...).
+        seed (int): Base sampler seed; worker k uses seed + k.
+        output_dir (str): Where versioned parameter files are written.
+        result_cache (ResultCache): Shared on-disk cache of finished walk-forward runs.
+
+    Returns:
+        (optuna.Study, str): The study and the path of the written config file.
+    """
+    n_workers = n_workers or os.cpu_count()
+    study = optuna.create_study(study_name=study_name, storage=_storage(storage_path),
+                                direction="maximize", load_if_exists=True)
+
+    per_worker = [n_trials // n_workers + (k < n_trials % n_workers) for k in range(n_workers)]
+    per_worker = [n for n in per_worker if n]
+    if len(per_worker) == 1:
+        _run_worker(study_name, storage_path, df, features, per_worker[0], wfv_kwargs, seed, result_cache)
+    else:
+        with ProcessPoolExecutor(max_workers=len(per_worker)) as pool:
+            futures = [pool.submit(_run_worker, study_name, storage_path, df, features, n, wfv_kwargs, seed + k,
+                                   result_cache)
+                       for k, n in enumerate(per_worker)]
+            for future in futures:
+                future.result()
+
+    return study, save_best_params(study, output_dir, df)
+
+
+def save_best_params(study, output_dir="data/tuned", df=None) -> str:
+    """
+    Writes the study's best trial as the next strategy_params_vNNN.json in `output_dir`.
+
+    Returns:
+        str: Path of the written file.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    versions = [int(os.path.basename(p)[len("strategy_params_v"):-len(".json")])
+                for p in glob.glob(os.path.join(output_dir, "strategy_params_v*.json"))]
+    version = max(versions, default=0) + 1
+
+    trial = study.best_trial
+    rf_keys = {'n_estimators', 'max_depth'}
+    config = {
+        "version": version,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "study_name": study.study_name,
+        "trial": trial.number,
+        "score": trial.value,
+        "n_trials": len(study.trials),
+        "data_range": [str(df.index.min()), str(df.index.max())] if df is not None else None,
+        "best_strategy_params": {k: v for k, v in trial.params.items() if k not in rf_keys},
+        "best_rf_params": {k: v for k, v in trial.params.items() if k in rf_keys},
+    }
+    path = os.path.join(output_dir, f"strategy_params_v{version:03d}.json")
+    with open(path, "w") as f:
+        json.dump(config, f, indent=2)
+    logger.info(f"✅ Best score {trial.value:.4f} (trial {trial.number}) saved to {path}")
+    return path
@@ -1,92 +1,256 @@
 # === run_wfv_with_params.py (signal timing + adaptive ATR + R:R + hold filter) ===
-def run_wfv_with_params(df, features, model_cls, best_params,
-                        train_size=60, test_size=10, confidence_threshold=0.6,
-                        atr_mult=1.5, rr_ratio=2.0, trailing_stop=False, short_signals=False,
-                        initial_capital=1000.0, risk_fraction=0.01, max_hold_days=10,
-                        rsi_filter=70, atr_threshold=None, atr_mult_low=1.2,
-                        confidence_margin=0.05, plot=True, commission_per_trade=0.0, slippage_points=0.0,
-                        vix_series=None, vix_scaling=False, rr_tuning=False):
-    import matplotlib.pyplot as plt
-    returns_all, dates_all, probas_all, trade_log = [], [], [], []
-    equity = initial_capital
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from src.strategies.exits import resolve_exits
+from src.strategies.signals import compute_signals
+from src.monitoring.metrics import metrics
 
-    # Precompute VIX stats if available
-    if vix_series is not None and vix_scaling:
-        vix_min, vix_max = vix_series.min(), vix_series.max()
 
-    for start in range(0, len(df) - train_size - test_size, test_size):
-        train = df.iloc[start:start + train_size].copy()
-        test = df.iloc[start + train_size:start + train_size + test_size].copy()
+def _fold_data(df, features, start, train_size, test_size):
+    # Copies only the fold's feature columns; rows with a NaN in any column are dropped from training
+    train = df.iloc[start:start + train_size]
+    close = train['Close'].to_numpy(dtype=float)
+    target = np.zeros(len(train), dtype=int)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        target[:-1] = np.log(close[1:] / close[:-1]) > 0
+    keep = train.notna().all(axis=1).to_numpy()
+    X_train = train[features][keep]
+    X_test = df.iloc[start + train_size:start + train_size + test_size][features]
+    return X_train, pd.Series(target[keep], index=X_train.index, name='target'), X_test
 
-        train['target'] = (np.log(train['Close'].shift(-1) / train['Close']) > 0).astype(int)
-        train.dropna(inplace=True)
 
-        X_train, y_train = train[features], train['target']
-        model = model_cls(**best_params)
+def _fit_predict_fold(model_cls, params, X_train, y_train, X_test):
+    model = model_cls(**params)
+    with metrics.span("fit"):
         model.fit(X_train, y_train)
+    with metrics.span("predict"):
+        return model.predict_proba(X_test)[:, 1]
+
+
+def _pooled_fit_predict_fold(model_cls, params, X_train, y_train, X_test):
+    # Spans recorded in a worker process stay there, so the fold's fit / predict timings travel back with it
+    with metrics.capture() as spans:
+        probas = _fit_predict_fold(model_cls, params, X_train, y_train, X_test)
+    return probas, spans
+
+
+def _map_folds(pool, model_cls, params, folds, window):
+    # Fits folds in the pool with at most `window` in flight, so the training copies of every
+    # fold are never materialised at once; results come back in fold order
+    pending = deque()
+
+    def collect():
+        probas, spans = pending.popleft().result()
+        metrics.merge(spans)
+        return probas
+
+    for fold_params, fold in zip(params, folds):
+        pending.append(pool.submit(_pooled_fit_predict_fold, model_cls, fold_params, *fold))
+        if len(pending) >= window:
+            yield collect()
+    while pending:
+        yield collect()
 
-        X_test = test[features]
-        probas = model.predict_proba(X_test)[:, 1]
-        signals = []
-
-        for i, prob in enumerate(probas):
-            row = test.iloc[i]
-            rsi = row.get('rsi', 50)
-            atr = row['atr']
-
-            # Skip long trades when ATR > 100
-            if prob > confidence_threshold and atr_threshold and atr > atr_threshold:
-                signals.append(0)
-                continue
-
-            if rsi > rsi_filter:
-                signals.append(0)
-                continue
-
-            # Skip trades too close to neutral confidence
-            if abs(prob - 0.5) < confidence_margin:
-                signals.append(0)
-            elif prob > confidence_threshold:
-                signals.append(1)
-            elif short_signals and prob < (1 - confidence_threshold):
-                signals.append(-1)
+
+def _fold_params(best_params, n_folds, seed):
+    return [dict(best_params, random_state=seed + k) if seed is not None else best_params
+            for k in range(n_folds)]
+
+
+def _iter_fold_probabilities(df, features, model_cls, best_params, train_size, test_size, seed):
+    # Lazy, in-process variant so a fold callback can stop the run before later folds are fitted
+    starts = range(0, len(df) - train_size - test_size, test_size)
+    for params, start in zip(_fold_params(best_params, len(starts), seed), starts):
+        yield _fit_predict_fold(model_cls, params, *_fold_data(df, features, start, train_size, test_size))
+
+
+def _iter_incremental_fold_probabilities(df, features, model_cls, best_params, train_size, test_size, seed):
+    # One model carried across folds: fitted on the first window, then updated with the rows each fold adds
+    params = dict(best_params, random_state=seed) if seed is not None else best_params
+    model = model_cls(**params)
+    starts = range(0, len(df) - train_size - test_size, test_size)
+    for k, start in enumerate(starts):
+        X_train, y_train, X_test = _fold_data(df, features, start, train_size, test_size)
+        with metrics.span("fit"):
+            if k == 0:
+                model.fit(X_train, y_train)
             else:
-                signals.append(0)
+                n_new = int((X_train.index >= df.index[start + train_size - test_size]).sum())
+                model.update(X_train, y_train, n_new=n_new)
+        with metrics.span("predict"):
+            probas = model.predict_proba(X_test)[:, 1]
+        yield probas
+
+
+def fold_probabilities(df, features, model_cls, best_params, train_size=60, test_size=10,
+                       n_jobs=1, seed=None):
+    """
+    Fits one model per walk-forward fold and returns its up-probabilities on the fold's test window.
+
+    Args:
+        df (pd.DataFrame): Feature frame with a 'Close' column.
+        features (list): Feature columns passed to the model.
+        model_cls: Classifier class exposing fit / predict_proba.
+        best_params (dict): Model hyperparameters.
+        train_size, test_size: Fold window sizes in rows.
+        n_jobs (int): Worker processes; 1 runs in-process, -1 uses every core.
+        seed (int): If set, fold k is fitted with random_state=seed + k so results do not depend on n_jobs.
+
+    Returns:
+        list[np.ndarray]: Probabilities per fold, in fold order.
+    """
+    if n_jobs == 1:
+        return list(_iter_fold_probabilities(df, features, model_cls, best_params, train_size, test_size, seed))
+
+    starts = range(0, len(df) - train_size - test_size, test_size)
+    params = _fold_params(best_params, len(starts), seed)
+    folds = (_fold_data(df, features, start, train_size, test_size) for start in starts)
+    workers = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(_map_folds(pool, model_cls, params, folds, window=workers * 4))
+
+
+def wfv_stats(strategy_returns, trade_count, periods_per_year=252):
+    """
+    Summary statistics of a walk-forward run (also usable on a partial run).
+
+    Args:
+        strategy_returns: Per-bar strategy returns.
+        trade_count (int): Number of trades taken.
+        periods_per_year (int): Bars per year used to annualise the Sharpe ratio
+            (252 for daily bars, see `src.data.bars.PERIODS_PER_YEAR` for intraday resolutions).
+
+    Returns:
+        dict: sharpe, hit_rate, max_drawdown, trade_count and the combined tuning score.
+    """
+    returns = pd.Series(strategy_returns, dtype=float)
+    cum_return = returns.cumsum()
+    return {
+        "sharpe": returns.mean() / returns.std() * np.sqrt(periods_per_year),
+        "hit_rate": (returns > 0).mean(),
+        "max_drawdown": (cum_return - cum_return.cummax()).min(),
+        "trade_count": trade_count,
+        "score": returns.mean() / returns.std() * np.sqrt(periods_per_year)
+                - abs((cum_return - cum_return.cummax()).min()) * 0.5
+                + (returns > 0).mean() * 0.3
+    }
+
 
-        test['target_return'] = np.log(test['Close'].shift(-1) / test['Close'])
-        test['position'] = signals
-        test['strategy_return'] = 0.0
+def plot_cumulative(cum_pct, path=None):
+    """
+    Plots the cumulative return curve: shown interactively, or written to `path` through a
+    standalone Figure that needs neither pyplot nor a display (servers, cron, the CLI).
+    """
+    if path is not None:
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=(12, 6))
+        ax = fig.subplots()
+    else:
+        import matplotlib.pyplot as plt
+        fig, ax = plt.subplots(figsize=(12, 6))
+    ax.plot(cum_pct, label="Strategy")
+    ax.set_title("Cumulative Return")
+    ax.set_ylabel("Return")
+    ax.legend()
+    ax.grid(True)
+    if path is not None:
+        fig.savefig(path)
+    else:
+        plt.show()
+
+
+def strategy_settings(confidence_threshold=0.6, atr_mult=1.5, rr_ratio=2.0, trailing_stop=False, short_signals=False,
+                      risk_fraction=0.01, max_hold_days=10, rsi_filter=70, atr_threshold=None, atr_mult_low=1.2,
+                      confidence_margin=0.05, commission_per_trade=0.0, slippage_points=0.0, vix_series=None,
+                      vix_scaling=False, rr_tuning=False, vectorized_exits=False) -> dict:
+    """
+    Trade-rule settings of a walk-forward run, with the `run_wfv_with_params` defaults
+    (the keyword arguments of `_simulate_fold`).
+    """
+    settings = dict(locals())
+    # Precompute VIX stats if available
+    if vix_series is not None and vix_scaling:
+        settings.update(vix_min=vix_series.min(), vix_max=vix_series.max())
+    return settings
+
+
+def _simulate_fold(test, probas, equity, trade_log, confidence_threshold, atr_mult, rr_ratio, trailing_stop,
+                   short_signals, risk_fraction, max_hold_days, rsi_filter, atr_threshold, atr_mult_low,
+                   confidence_margin, commission_per_trade, slippage_points, vix_series, vix_scaling, rr_tuning,
+                   vectorized_exits, vix_min=None, vix_max=None):
+    """
+    Trades one fold's test window (a copy, modified in place) from its up-probabilities, appending
+    closed trades to `trade_log`. Trades never outlive the window, so equity is the only state
+    carried between folds.
+
+    Returns:
+        (np.ndarray, float): Per-bar strategy returns of the window and the equity after it.
+    """
+    rsi = test['rsi'].to_numpy(dtype=float) if 'rsi' in test.columns else np.full(len(test), 50.0)
+    signals, _ = compute_signals(probas, rsi, test['atr'].to_numpy(dtype=float), confidence_threshold,
+                                 confidence_margin=confidence_margin, rsi_filter=rsi_filter,
+                                 atr_threshold=atr_threshold, short_signals=short_signals)
+    signals = signals.tolist()
 
-        for i, signal in enumerate(signals):
-            if signal == 0:
-                continue
+    test['target_return'] = np.log(test['Close'].shift(-1) / test['Close'])
+    test['position'] = signals
+    test['strategy_return'] = 0.0
 
-            row = test.iloc[i]
-            entry_date = test.index[i]
-            entry_price, atr = row['Close'], row['atr']
+    # Resolve every exit in the fold at once; the equity loop below only looks them up
+    if vectorized_exits:
+        sig = np.asarray(signals)
+        entries = np.flatnonzero(sig)
+        entry_sig = sig[entries]
+        entry_close = test['Close'].to_numpy(dtype=float)[entries]
+        entry_atr = test['atr'].to_numpy(dtype=float)[entries]
+        high_atr = entry_atr > atr_threshold if atr_threshold else np.zeros(len(entries), dtype=bool)
+        entry_mult = np.where(high_atr, atr_mult_low, atr_mult)
+        with metrics.span("exits"):
+            exit_idx, exit_px, exit_reason = resolve_exits(
+                test['High'].to_numpy(dtype=float), test['Low'].to_numpy(dtype=float),
+                test['Close'].to_numpy(dtype=float), entries, entry_sig,
+                stop_loss=entry_close - entry_sig * entry_atr * entry_mult * -1,
+                take_profit=entry_close + entry_sig * entry_atr * entry_mult * rr_ratio,
+                trail_offset=entry_atr * entry_mult, max_hold=max_hold_days, trailing_stop=trailing_stop)
+        fold_exits = {i: (exit_px[k], exit_reason[k], exit_idx[k]) for k, i in enumerate(entries)}
 
-            vix_value = vix_series.loc[entry_date] if vix_series is not None and entry_date in vix_series.index else None
-            rf, rr, am = risk_fraction, rr_ratio, atr_mult
+    for i, signal in enumerate(signals):
+        if signal == 0:
+            continue
 
-            if vix_value and vix_scaling:
-                norm_vix = (vix_value - vix_min) / (vix_max - vix_min + 1e-8)
-                rf = risk_fraction / (1 + norm_vix)
+        row = test.iloc[i]
+        entry_date = test.index[i]
+        entry_price, atr = row['Close'], row['atr']
 
-            if vix_value and rr_tuning and vix_value > 25:
-                rr *= 0.8
-                am *= 0.8
+        vix_value = vix_series.loc[entry_date] if vix_series is not None and entry_date in vix_series.index else None
+        rf, rr, am = risk_fraction, rr_ratio, atr_mult
 
-            adj_atr_mult = atr_mult_low if atr_threshold and atr > atr_threshold else atr_mult
+        if vix_value and vix_scaling:
+            norm_vix = (vix_value - vix_min) / (vix_max - vix_min + 1e-8)
+            rf = risk_fraction / (1 + norm_vix)
 
-            stop_loss = entry_price - signal * atr * adj_atr_mult * -1
-            take_profit = entry_price + signal * atr * adj_atr_mult * rr_ratio
-            max_fav_price = entry_price
+        if vix_value and rr_tuning and vix_value > 25:
+            rr *= 0.8
+            am *= 0.8
 
-            capital_at_risk = equity * risk_fraction
-            risk_per_point = abs(entry_price - stop_loss)
-            contracts = capital_at_risk / risk_per_point if risk_per_point > 0 else 0
+        adj_atr_mult = atr_mult_low if atr_threshold and atr > atr_threshold else atr_mult
 
-            exit_price, reason, j = None, None, i
+        stop_loss = entry_price - signal * atr * adj_atr_mult * -1
+        take_profit = entry_price + signal * atr * adj_atr_mult * rr_ratio
+        max_fav_price = entry_price
+
+        capital_at_risk = equity * risk_fraction
+        risk_per_point = abs(entry_price - stop_loss)
+        contracts = capital_at_risk / risk_per_point if risk_per_point > 0 else 0
+
+        exit_price, reason, j = None, None, i
+        if vectorized_exits:
+            exit_price, reason, j = fold_exits[i]
+            exit_date = test.index[j]
+        else:
             for j in range(i + 1, min(i + max_hold_days + 1, len(test))):
                 row_j = test.iloc[j]
                 next_high, next_low = row_j['High'], row_j['Low']
@@ -117,53 +281,114 @@ def run_wfv_with_params(df, features, model_cls, best_params,
                 if exit_price:
                     break
 
-            if not exit_price:
-                exit_price = test.iloc[j]['Close']
-                exit_date = test.index[j]
-                reason = 'time_exit'
-
-            # Apply slippage and commission
-            slippage = slippage_points * contracts
-            gross_pnl = signal * (exit_price - entry_price)
-            net_dollar_pnl = (gross_pnl * contracts) - commission_per_trade - slippage
-            scaled_return = net_dollar_pnl / equity if equity > 0 else 0
-            equity *= (1 + scaled_return)
-
-            test.at[entry_date, 'strategy_return'] = scaled_return
-            trade_log.append({
-                'entry_date': entry_date, 'exit_date': exit_date,
-                'entry_price': entry_price, 'exit_price': exit_price,
-                'atr': atr, 'reason': reason, 'held_days': (exit_date - entry_date).days,
-                'contracts': contracts, 'dollar_pnl': net_dollar_pnl,
-                'equity': equity, 'direction': 'long' if signal == 1 else 'short',
-                'position': signal, 'confidence': probas[i]
-            })
-
-        returns_all.extend(test['strategy_return'].values)
+        if not exit_price:
+            exit_price = test.iloc[j]['Close']
+            exit_date = test.index[j]
+            reason = 'time_exit'
+        metrics.count("wfv_trades", reason=reason)
+
+        # Apply slippage and commission
+        slippage = slippage_points * contracts
+        gross_pnl = signal * (exit_price - entry_price)
+        net_dollar_pnl = (gross_pnl * contracts) - commission_per_trade - slippage
+        scaled_return = net_dollar_pnl / equity if equity > 0 else 0
+        equity *= (1 + scaled_return)
+
+        test.at[entry_date, 'strategy_return'] = scaled_return
+        trade_log.append({
+            'entry_date': entry_date, 'exit_date': exit_date,
+            'entry_price': entry_price, 'exit_price': exit_price,
+            'atr': atr, 'reason': reason, 'held_days': (exit_date - entry_date).days,
+            'contracts': contracts, 'dollar_pnl': net_dollar_pnl,
+            'equity': equity, 'direction': 'long' if signal == 1 else 'short',
+            'position': signal, 'confidence': probas[i]
+        })
+
+    return test['strategy_return'].to_numpy(), equity
+
+
+def run_wfv_with_params(df, features, model_cls, best_params,
+                        train_size=60, test_size=10, confidence_threshold=0.6,
+                        atr_mult=1.5, rr_ratio=2.0, trailing_stop=False, short_signals=False,
+                        initial_capital=1000.0, risk_fraction=0.01, max_hold_days=10,
+                        rsi_filter=70, atr_threshold=None, atr_mult_low=1.2,
+                        confidence_margin=0.05, plot=True, commission_per_trade=0.0, slippage_points=0.0,
+                        vix_series=None, vix_scaling=False, rr_tuning=False, vectorized_exits=False,
+                        n_jobs=1, seed=None, fold_callback=None, fold_data=None, periods_per_year=252,
+                        incremental=False, result_cache=None):
+    returns_all, dates_all, probas_all, trade_log, fold_trades = [], [], [], [], []
+    equity = initial_capital
+
+    strategy = strategy_settings(confidence_threshold=confidence_threshold, atr_mult=atr_mult, rr_ratio=rr_ratio,
+                                 trailing_stop=trailing_stop, short_signals=short_signals,
+                                 risk_fraction=risk_fraction, max_hold_days=max_hold_days, rsi_filter=rsi_filter,
+                                 atr_threshold=atr_threshold, atr_mult_low=atr_mult_low,
+                                 confidence_margin=confidence_margin, commission_per_trade=commission_per_trade,
+                                 slippage_points=slippage_points, vix_series=vix_series, vix_scaling=vix_scaling,
+                                 rr_tuning=rr_tuning, vectorized_exits=vectorized_exits)
+
+    # A ResultCache (src.strategies.result_cache) returns finished runs of the same data and settings
+    if result_cache is not None:
+        cache_key = result_cache.key(df, features, model_cls, best_params, train_size=train_size,
+                                     test_size=test_size, initial_capital=initial_capital, seed=seed,
+                                     incremental=incremental, periods_per_year=periods_per_year, **strategy)
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            df_results = cached['results']
+            if fold_callback is not None:
+                returns = df_results['strategy_return'].to_numpy()
+                for fold, trade_count in enumerate(cached['fold_trades']):
+                    fold_callback(fold, list(returns[:(fold + 1) * test_size]), trade_count)
+            if plot:
+                plot_cumulative(df_results['cum_pct'], path=plot if isinstance(plot, str) else None)
+            return df_results.copy(), cached['trades'].copy(), dict(cached['stats'])
+
+    # Models are independent per fold, so fit them up front (optionally in a process pool)
+    # Precomputed fold inputs (FoldData) also cache probabilities across runs with the same model params
+    # Incremental backends (src.models.backends) carry one model through the folds instead
+    if incremental:
+        if fold_data is not None or n_jobs != 1:
+            raise ValueError("incremental folds are fitted sequentially; fold_data and n_jobs do not apply")
+        fold_probas = _iter_incremental_fold_probabilities(df, features, model_cls, best_params,
+                                                           train_size, test_size, seed)
+    elif fold_data is not None:
+        if not fold_data.matches(df, features, train_size, test_size):
+            raise ValueError("fold_data was built for a different frame, feature list or fold sizes")
+        if n_jobs == 1:
+            fold_probas = fold_data.iter_probabilities(model_cls, best_params, seed=seed)
+        else:
+            fold_probas = fold_data.probabilities(model_cls, best_params, n_jobs=n_jobs, seed=seed)
+    elif n_jobs == 1:
+        fold_probas = _iter_fold_probabilities(df, features, model_cls, best_params, train_size, test_size, seed)
+    else:
+        fold_probas = fold_probabilities(df, features, model_cls, best_params, train_size, test_size,
+                                         n_jobs=n_jobs, seed=seed)
+
+    starts = range(0, len(df) - train_size - test_size, test_size)
+    for fold, (start, probas) in enumerate(zip(starts, fold_probas)):
+        test = df.iloc[start + train_size:start + train_size + test_size].copy()
+        fold_returns, equity = _simulate_fold(test, probas, equity, trade_log, **strategy)
+
+        returns_all.extend(fold_returns)
         probas_all.extend(probas)
         dates_all.extend(test.index)
+        fold_trades.append(len(trade_log))
+
+        # Lets callers (e.g. tuning) inspect partial results and abort by raising
+        if fold_callback is not None:
+            fold_callback(fold, returns_all, len(trade_log))
 
     df_results = pd.DataFrame({'date': dates_all, 'strategy_return': returns_all, 'proba': probas_all}).set_index('date')
     df_results['cum_return'] = df_results['strategy_return'].cumsum()
     df_results['cum_pct'] = np.exp(df_results['cum_return']) - 1
 
-    stats = {
-        "sharpe": df_results['strategy_return'].mean() / df_results['strategy_return'].std() * np.sqrt(252),
-        "hit_rate": (df_results['strategy_return'] > 0).mean(),
-        "max_drawdown": (df_results['cum_return'] - df_results['cum_return'].cummax()).min(),
-        "trade_count": len(trade_log),
-        "score": df_results['strategy_return'].mean() / df_results['strategy_return'].std() * np.sqrt(252)
-                - abs((df_results['cum_return'] - df_results['cum_return'].cummax()).min()) * 0.5
-                + (df_results['strategy_return'] > 0).mean() * 0.3
-    }
+    stats = wfv_stats(df_results['strategy_return'], len(trade_log), periods_per_year)
+    df_trades = pd.DataFrame(trade_log)
+    if result_cache is not None:
+        result_cache.put(cache_key, df_results, df_trades, stats, fold_trades)
 
+    # plot=True shows the curve; a file path saves it without a display
     if plot:
-        plt.figure(figsize=(12, 6))
-        plt.plot(df_results['cum_pct'], label="Strategy")
-        plt.title("Cumulative Return")
-        plt.ylabel("Return")
-        plt.legend()
-        plt.grid(True)
-        plt.show()
+        plot_cumulative(df_results['cum_pct'], path=plot if isinstance(plot, str) else None)
 
-    return df_results, pd.DataFrame(trade_log), stats
+    return df_results, df_trades, stats
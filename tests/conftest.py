@@ -0,0 +1,27 @@
+import os
+import sys
+import pytest
+
+# Tests import the package as `src`, like the notebooks and `python -m src` do
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.benchmarks.synthetic import synthetic_ohlcv, CannedFred  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def bars():
+    """Two trading days of synthetic 1-minute MES bars."""
+    return synthetic_ohlcv(3000, seed=5)
+
+
+@pytest.fixture(scope="session")
+def fred(bars):
+    """Offline FRED stand-in covering `bars`."""
+    return CannedFred(bars.index, seed=5)
+
+
+@pytest.fixture(scope="session")
+def features_df(bars, fred):
+    """`add_features` output for `bars` (shared, do not modify)."""
+    from src.features.engineering import add_features
+    return add_features(bars.copy(), None, verbose=False, fred_cache=fred)
@@ -0,0 +1,40 @@
+import asyncio
+from aiohttp import web
+from src.api.async_client import AsyncSchwabClient
+
+
+async def _token_server():
+    issued = []
+
+    async def token(request):
+        form = await request.post()
+        issued.append(form["refresh_token"])
+        return web.json_response({"access_token": f"access-{len(issued)}", "refresh_token": f"refresh-{len(issued)}",
+                                  "expires_in": 1800})
+
+    app = web.Application()
+    app.router.add_post("/v1/oauth/token", token)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}", issued
+
+
+def test_refresh_tokens_works_before_open_and_after_close():
+    async def scenario():
+        runner, base_url, issued = await _token_server()
+        try:
+            client = AsyncSchwabClient("id", "secret", refresh_token="refresh-0", base_url=base_url)
+            await client.refresh_tokens(force=True)
+            assert client.access_token == "access-1"
+            await client.close()
+            await client.refresh_tokens(force=True)
+            assert client.access_token == "access-2"
+            await client.close()
+        finally:
+            await runner.cleanup()
+        return issued
+
+    assert asyncio.run(scenario()) == ["refresh-0", "refresh-1"]
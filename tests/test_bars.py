@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.data.bars import OHLCV, RESOLUTIONS, EXCHANGE_TZ, BarAggregator, BarCache, resample_all, resample_bars
+from src.data.candle_store import CandleStore
+
+AGG = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+
+
+@pytest.fixture(scope="module")
+def minutes(bars):
+    # Drop a few minutes so some buckets have gaps
+    keep = np.random.default_rng(1).random(len(bars)) > 0.05
+    return bars[keep]
+
+
+def _reference(minutes, resolution):
+    if resolution in ("session", "daily"):
+        local = minutes.index.tz_localize("UTC").tz_convert(EXCHANGE_TZ).tz_localize(None)
+        time_of_day = local - local.normalize()
+        if resolution == "session":
+            mask = (time_of_day >= pd.Timedelta("08:30:00")) & (time_of_day < pd.Timedelta("15:15:00"))
+            labels = local.normalize()
+        else:
+            mask = (time_of_day < pd.Timedelta("16:00:00")) | (time_of_day >= pd.Timedelta("17:00:00"))
+            labels = (local + pd.Timedelta(hours=7)).normalize()
+        out = minutes[mask].groupby(labels[mask]).agg(AGG)
+    else:
+        out = minutes.resample(resolution).agg(AGG).dropna(subset=["Open"])
+    out.index.name = "datetime"
+    return out.astype(float)
+
+
+def test_resample_all_matches_pandas(minutes):
+    bars = resample_all(minutes)
+    assert list(bars) == RESOLUTIONS
+    for resolution, out in bars.items():
+        expected = _reference(minutes, resolution)
+        assert len(out) > 1, resolution
+        pd.testing.assert_frame_equal(out, expected, check_freq=False, check_index_type=False, obj=resolution)
+        pd.testing.assert_frame_equal(resample_bars(minutes, resolution), out)
+
+
+def test_bar_aggregator_emits_the_batch_bars(minutes):
+    aggregator = BarAggregator(RESOLUTIONS[1:])
+    emitted = []
+    for ts, candle in minutes.iterrows():
+        emitted.extend(aggregator.update(ts, candle))
+    emitted.extend(aggregator.flush())
+
+    batch = resample_all(minutes, RESOLUTIONS[1:])
+    for resolution, expected in batch.items():
+        rows = [(ts, bar) for r, ts, bar in emitted if r == resolution]
+        streamed = pd.DataFrame([bar for _, bar in rows], index=pd.DatetimeIndex([ts for ts, _ in rows]))
+        assert streamed.index.is_monotonic_increasing, resolution
+        np.testing.assert_array_equal(streamed.index.asi8, expected.index.as_unit("ns").asi8)
+        np.testing.assert_allclose(streamed[OHLCV].to_numpy(), expected.to_numpy(), err_msg=resolution)
+
+
+def test_bar_cache_incremental_refresh_matches_a_full_resample(minutes, tmp_path):
+    store = CandleStore(str(tmp_path / "candles"))
+    cache = BarCache(store)
+    for part in np.array_split(np.arange(len(minutes)), 4):
+        store.append("/MES", minutes.iloc[part])
+        for resolution in ("15min", "session", "daily"):
+            expected = resample_bars(store.read("/MES"), resolution)
+            pd.testing.assert_frame_equal(cache.get("/MES", resolution), expected, check_freq=False)
@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+from src.data.candle_store import CandleStore
+
+
+def test_overlapping_appends_read_back_like_the_merged_frame(bars, tmp_path):
+    store = CandleStore(str(tmp_path))
+    # Overlapping fetches; the later fetch of a timestamp replaces the stored candle
+    store.append("/MES", bars.iloc[:2000])
+    revised = bars.iloc[1990:].copy()
+    revised.iloc[:10, revised.columns.get_loc("Close")] += 0.25
+    store.append("/MES", revised)
+    expected = pd.concat([bars.iloc[:1990], revised]).astype(float)
+
+    assert store.days("/MES") == sorted({str(d) for d in bars.index.date})
+    assert store.last_timestamp("/MES") == bars.index[-1]
+    pd.testing.assert_frame_equal(store.read("/MES"), expected, check_freq=False, check_index_type=False)
+
+    lo, hi = bars.index[500], bars.index[2500]
+    window = store.read("/MES", start=lo, end=hi)
+    np.testing.assert_array_equal(window.to_numpy(), expected.loc[lo:hi].to_numpy())
+    assert window.index[0] == lo and window.index[-1] == hi
+
+    chunks = list(store.iter_chunks("/MES", start=lo, days_per_chunk=1))
+    assert len(chunks) == len([d for d in store.days("/MES") if d >= str(lo.date())]) > 1
+    np.testing.assert_array_equal(pd.concat(chunks).to_numpy(), expected.loc[lo:].to_numpy())
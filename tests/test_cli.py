@@ -0,0 +1,19 @@
+import json
+from src import cli
+from src.strategies import live_recommender
+
+
+def test_live_once_prints_a_signal(bars, fred, monkeypatch, capsys):
+    monkeypatch.setattr(live_recommender, "fetch_mes_data", lambda token: bars.copy())
+    monkeypatch.setattr(cli, "_fred_cache", lambda args: fred)
+
+    assert cli.main(["--log-level", "WARNING", "--startup-budget", "60", "live", "--once", "--token", "t",
+                     "--fred-cache", "unused"]) == 0
+    result = json.loads(capsys.readouterr().out)
+    assert 0.0 <= result["confidence"] <= 1.0
+    assert "reason" in result
+
+
+def test_backtest_requires_fred_data(monkeypatch):
+    monkeypatch.delenv("FRED_API_KEY", raising=False)
+    assert cli.main(["--log-level", "CRITICAL", "backtest", "--csv", "bars.csv"]) == 2
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier, ExtraTreesClassifier
+from sklearn.tree import DecisionTreeClassifier
+from src.features.engineering import final_features
+from src.models.backends import RandomForestBackend
+from src.models.compact import FlatForest
+from src.models.registry import ModelRegistry
+
+
+@pytest.fixture(scope="module")
+def xy(features_df):
+    X = features_df[final_features].to_numpy(dtype=float)
+    y = (features_df['Close'].shift(-1) > features_df['Close']).to_numpy().astype(int)
+    return X[:-1], y[:-1]
+
+
+@pytest.mark.parametrize("model", [
+    RandomForestClassifier(n_estimators=20, max_depth=6, random_state=1),
+    ExtraTreesClassifier(n_estimators=10, random_state=1),
+    DecisionTreeClassifier(max_depth=8, random_state=1),
+])
+def test_flat_forest_matches_sklearn_predict_proba(model, xy):
+    X, y = xy
+    model.fit(X[:2000], y[:2000])
+    flat = FlatForest.from_sklearn(model)
+    X_test = X[2000:]
+
+    np.testing.assert_allclose(flat.predict_proba(X_test), model.predict_proba(X_test), atol=1e-12)
+    assert np.array_equal(flat.predict(X_test), (model.predict_proba(X_test)[:, 1] > 0.5).astype(int))
+    for row in X_test[:50]:
+        assert flat.predict_one(row) == pytest.approx(model.predict_proba(row[None, :])[0, 1], abs=1e-12)
+
+
+def test_flat_forest_follows_learned_missing_value_direction(xy):
+    X, y = xy
+    X = X.copy()
+    rng = np.random.default_rng(0)
+    X[rng.random(X.shape) < 0.1] = np.nan
+    model = RandomForestClassifier(n_estimators=10, max_depth=6, random_state=2).fit(X[:2000], y[:2000])
+
+    np.testing.assert_allclose(FlatForest.from_sklearn(model).predict_proba(X[2000:]), model.predict_proba(X[2000:]),
+                               atol=1e-12)
+
+
+def test_saved_and_registry_forests_predict_like_the_model(xy, features_df, tmp_path):
+    X, y = xy
+    model = RandomForestClassifier(n_estimators=10, max_depth=5, random_state=3).fit(X[:2000], y[:2000])
+    expected = model.predict_proba(X[2000:])
+
+    FlatForest.from_sklearn(model).save(str(tmp_path / "flat.npz"))
+    np.testing.assert_allclose(FlatForest.load(str(tmp_path / "flat.npz")).predict_proba(X[2000:]), expected,
+                               atol=1e-12)
+
+    registry = ModelRegistry(str(tmp_path / "registry"))
+    params = dict(n_estimators=10, max_depth=5)
+    registry.save(model, final_features, params, features_df)
+    loaded = registry.load(final_features, params, features_df, compact=True)
+    assert isinstance(loaded, FlatForest)
+    np.testing.assert_allclose(loaded.predict_proba(X[2000:]), expected, atol=1e-12)
+
+
+def test_random_forest_backend_compact_tracks_grown_forest(xy):
+    X, y = xy
+    backend = RandomForestBackend(grow_trees=5, max_trees=15, n_estimators=10, max_depth=5, random_state=4)
+    backend.fit(X[:1500], y[:1500])
+    for end in (1600, 1700, 1800):
+        backend.update(X[end - 1500:end], y[end - 1500:end], n_new=100)
+    assert len(backend.model.estimators_) == 15
+
+    np.testing.assert_allclose(backend.compact().predict_proba(X[2000:]), backend.predict_proba(X[2000:]),
+                               atol=1e-12)
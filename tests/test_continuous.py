@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.benchmarks.synthetic import synthetic_ohlcv
+from src.data.bars import EXCHANGE_TZ
+from src.data.continuous import stitch
+from src.data.contracts import roll_date
+
+PRICES = ["Open", "High", "Low", "Close"]
+
+
+@pytest.fixture(scope="module")
+def contracts():
+    # Two weeks of 5-minute bars around the March 2025 roll; June trades at a fixed premium
+    march = synthetic_ohlcv(4000, freq="5min", end="2025-03-21 20:00", seed=2)
+    june = march.copy()
+    june[PRICES] += 20.0
+    return march, june
+
+
+def _trade_dates(index):
+    local = index.tz_localize("UTC").tz_convert(EXCHANGE_TZ).tz_localize(None)
+    return (local + pd.Timedelta(hours=7)).normalize()
+
+
+@pytest.mark.parametrize("adjustment", ["difference", "ratio"])
+def test_back_adjusted_series_follows_the_new_contract(contracts, adjustment):
+    march, june = contracts
+    if adjustment == "ratio":
+        june = march.copy()
+        june[PRICES] *= 1.004
+    series, rolls = stitch({"MESH5": march, "MESM5": june}, method="calendar", adjustment=adjustment)
+
+    assert len(rolls) == 1 and rolls["date"].iloc[0] == roll_date(2025, 3)
+    pd.testing.assert_index_equal(series.index, march.index)
+    np.testing.assert_allclose(series[PRICES].to_numpy(), june[PRICES].to_numpy(), rtol=1e-12)
+
+
+def test_unadjusted_series_switches_contracts_on_the_roll_date(contracts):
+    march, june = contracts
+    series, _ = stitch({"MESH5": march, "MESM5": june}, method="calendar", adjustment="none")
+    new = (_trade_dates(march.index) >= roll_date(2025, 3))
+    assert 0 < new.sum() < len(new)
+    np.testing.assert_array_equal(series["Close"].to_numpy(), np.where(new, june["Close"], march["Close"]))
+
+
+def test_volume_roll_is_the_trade_date_after_the_crossover(contracts):
+    march, june = contracts
+    days = _trade_dates(march.index)
+    crossover = days.unique()[3]
+    march = march.assign(Volume=100.0)
+    june = june.assign(Volume=np.where(days >= crossover, 200.0, 10.0))
+
+    series, rolls = stitch({"MESH5": march, "MESM5": june}, method="volume", adjustment="none")
+    roll = days.unique()[4]
+    assert rolls["date"].iloc[0] == roll and roll < roll_date(2025, 3)
+    np.testing.assert_array_equal(series["Volume"].to_numpy(), np.where(days >= roll, 200.0, 100.0))
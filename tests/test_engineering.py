@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.data.candle_store import CandleStore
+from src.features.engineering import (add_features, add_features_chunked, compact_frame, final_features,
+                                      iter_feature_chunks)
+
+
+@pytest.fixture(scope="module")
+def float32_features(bars, fred):
+    return compact_frame(add_features(bars.copy(), None, verbose=False, fred_cache=fred, dtype=np.float32))
+
+
+def test_float32_storage_matches_float64_features(features_df, float32_features):
+    expected = compact_frame(features_df)
+    pd.testing.assert_index_equal(float32_features.index, expected.index)
+    assert (float32_features.dtypes[final_features] == np.float32).all()
+    # es_vix_corr is computed from the stored float32 returns, so it only agrees to float32 precision
+    np.testing.assert_allclose(float32_features.to_numpy(dtype=float), expected.to_numpy(dtype=float),
+                               rtol=1e-6, atol=1e-7)
+
+
+@pytest.mark.parametrize("chunk_size", [700, 1000, 2999])
+def test_chunked_features_match_a_single_pass(bars, fred, float32_features, chunk_size):
+    chunked = add_features_chunked(bars, None, chunk_size=chunk_size, overlap=500, fred_cache=fred)
+    pd.testing.assert_index_equal(chunked.index, float32_features.index)
+    assert list(chunked.columns) == list(float32_features.columns)
+    np.testing.assert_allclose(chunked.to_numpy(dtype=float), float32_features.to_numpy(dtype=float),
+                               rtol=1e-6, atol=1e-9)
+
+
+def test_store_chunks_match_a_single_pass(bars, fred, float32_features, tmp_path):
+    store = CandleStore(str(tmp_path))
+    store.append("/MES", bars)
+    chunks = list(iter_feature_chunks(store.iter_chunks("/MES", days_per_chunk=1), None, overlap=500,
+                                      fred_cache=fred))
+    assert len(chunks) > 1
+    streamed = pd.concat(chunks)
+    np.testing.assert_array_equal(streamed.index.asi8, float32_features.index.as_unit(streamed.index.unit).asi8)
+    np.testing.assert_allclose(streamed.to_numpy(dtype=float), float32_features.to_numpy(dtype=float),
+                               rtol=1e-6, atol=1e-9)
@@ -0,0 +1,80 @@
+import pandas as pd
+import pytest
+from src.data.fred_cache import FredCache
+
+
+class FakeFred:
+    """Serves FRED observations from an in-memory series and records the requested start dates."""
+
+    def __init__(self, series):
+        self.series = series
+        self.requests = []
+        self.fail = False
+
+    def get(self, url, params, timeout):
+        self.requests.append((params["series_id"], params["observation_start"]))
+        observed = self.series[params["series_id"]]
+        observed = observed[observed.index >= params["observation_start"]]
+        return FakeResponse(not self.fail, [{"date": str(d.date()), "value": "." if pd.isna(v) else str(v),
+                                             "realtime_start": "2025-01-10"} for d, v in observed.items()])
+
+
+class FakeResponse:
+    def __init__(self, ok, observations):
+        self.ok = ok
+        self.status_code = 200 if ok else 500
+        self._observations = observations
+
+    def json(self):
+        return {"observations": self._observations}
+
+
+@pytest.fixture
+def fake():
+    dates = pd.date_range("2024-01-01", "2024-12-31", freq="D")
+    return FakeFred({"DFF": pd.Series(range(len(dates)), index=dates, dtype=float) / 10,
+                     "CPIAUCSL": pd.Series(300.0, index=pd.date_range("2024-01-01", "2024-12-01", freq="MS"))})
+
+
+def _cache(tmp_path, fake, **kwargs):
+    cache = FredCache(str(tmp_path), api_key="key", observation_start="2024-01-01", **kwargs)
+    cache._session = fake
+    return cache
+
+
+def test_cached_series_match_a_fresh_download(tmp_path, fake):
+    cache = _cache(tmp_path, fake)
+    first = cache.get(["DFF", "CPIAUCSL"], verbose=False)
+    assert sorted(fake.requests) == [("CPIAUCSL", "2024-01-01"), ("DFF", "2024-01-01")]
+    for sid, series in fake.series.items():
+        pd.testing.assert_series_equal(first[sid], series, check_names=False, check_freq=False)
+
+    # Fresh series are served from disk without a request
+    second = cache.get(["DFF", "CPIAUCSL"], verbose=False)
+    assert len(fake.requests) == 2
+    for sid in first:
+        pd.testing.assert_series_equal(second[sid], first[sid])
+
+
+def test_stale_series_refetch_only_the_revision_window(tmp_path, fake):
+    _cache(tmp_path, fake).get(["CPIAUCSL"], verbose=False)
+    # A revision of recent values and a new observation
+    revised = fake.series["CPIAUCSL"].copy()
+    revised.iloc[-2:] = 301.0
+    revised[pd.Timestamp("2025-01-01")] = 302.0
+    fake.series["CPIAUCSL"] = revised
+
+    refreshed = _cache(tmp_path, fake, ttl=0, revision_days=90).get(["CPIAUCSL"], verbose=False)
+    assert fake.requests[-1] == ("CPIAUCSL", "2024-09-02")
+    pd.testing.assert_series_equal(refreshed["CPIAUCSL"], revised, check_names=False, check_freq=False)
+
+
+def test_failed_or_offline_refresh_serves_stale_data(tmp_path, fake):
+    stored = _cache(tmp_path, fake).get(["DFF"], verbose=False)["DFF"]
+    fake.fail = True
+    pd.testing.assert_series_equal(_cache(tmp_path, fake, ttl=0).get(["DFF"], verbose=False)["DFF"], stored)
+
+    requests = len(fake.requests)
+    offline = _cache(tmp_path, fake, ttl=0, offline=True).get(["DFF", "CPIAUCSL"], verbose=False)
+    assert list(offline) == ["DFF"] and len(fake.requests) == requests
+    pd.testing.assert_series_equal(offline["DFF"], stored)
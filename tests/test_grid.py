@@ -0,0 +1,30 @@
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from src.features.engineering import final_features
+from src.strategies.fold_data import FoldData
+from src.strategies.grid import run_wfv_grid
+from src.strategies.walkforward import run_wfv_with_params
+
+PARAMS = dict(n_estimators=5, max_depth=3)
+STATS = ['sharpe', 'hit_rate', 'max_drawdown', 'trade_count', 'score']
+
+
+@pytest.mark.parametrize("trailing_stop", [False, True])
+def test_grid_rows_match_individual_runs(features_df, trailing_stop):
+    df = features_df.iloc[:600]
+    grid = {'confidence_threshold': [0.5, 0.55], 'atr_mult': [1.0, 2.0],
+            'atr_threshold': [None, float(df['atr'].median())], 'max_hold_days': [3, 10]}
+    settings = dict(short_signals=True, trailing_stop=trailing_stop, commission_per_trade=0.5, slippage_points=0.25)
+    fold_data = FoldData(df, final_features)
+    result = run_wfv_grid(df, final_features, RandomForestClassifier, PARAMS, grid, seed=3, fold_data=fold_data,
+                          confidence_margin=0.0, **settings)
+    assert len(result) == 16 and result['trade_count'].min() > 0
+
+    for _, combo in result.iterrows():
+        strategy = {k: combo[k] for k in grid}
+        strategy['max_hold_days'] = int(strategy['max_hold_days'])
+        _, trades, stats = run_wfv_with_params(df, final_features, RandomForestClassifier, PARAMS, plot=False,
+                                               seed=3, fold_data=fold_data, confidence_margin=0.0,
+                                               vectorized_exits=True, **settings, **strategy)
+        assert len(trades) == combo['trade_count'], strategy
+        assert {k: combo[k] for k in STATS} == pytest.approx({k: stats[k] for k in STATS}, rel=1e-9, abs=1e-12)
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+from src.features.engineering import final_features, fred_indicators
+from src.features.incremental import IncrementalFeatureEngine
+from src.features.indicators import compute_indicators, indicator_features
+
+
+def _engine(fred):
+    series = fred.get(list(fred_indicators))
+    return IncrementalFeatureEngine(macro={fred_indicators[code]: s for code, s in series.items()})
+
+
+def test_incremental_features_match_add_features(bars, fred, features_df):
+    engine = _engine(fred)
+    rows = {}
+    for ts, candle in bars.iterrows():
+        rows[ts] = engine.update(ts, candle)
+    streamed = pd.DataFrame.from_dict(rows, orient='index')[final_features].loc[features_df.index]
+
+    assert len(features_df) > 2500
+    np.testing.assert_allclose(streamed.to_numpy(), features_df[final_features].to_numpy(dtype=float),
+                               rtol=1e-9, atol=1e-10)
+
+
+def test_warm_up_then_update_matches_a_full_pass(bars, fred, features_df):
+    engine = _engine(fred)
+    engine.warm_up(bars.iloc[:-100])
+    for ts, candle in bars.iloc[-100:].iterrows():
+        last = engine.update(ts, candle)
+    np.testing.assert_allclose([last[f] for f in final_features], features_df[final_features].iloc[-1].to_numpy(dtype=float),
+                               rtol=1e-9, atol=1e-10)
+    row = engine.row()
+    assert row.name == bars.index[-1] and row['Close'] == bars['Close'].iloc[-1]
+
+
+def test_running_windows_match_batch_kernels_across_flat_stretches(bars, fred):
+    # Identical closes exercise the exact-zero deviations and the undefined correlation;
+    # add_features drops those rows, so every row is compared with the batch computations directly
+    flat = bars.copy()
+    flat.iloc[1200:1240] = flat.iloc[[1200]].to_numpy()
+    flat.iloc[2500:2507] = flat.iloc[[2500]].to_numpy()
+    engine = _engine(fred)
+    rows = {ts: engine.update(ts, candle) for ts, candle in flat.iterrows()}
+    streamed = pd.DataFrame.from_dict(rows, orient='index')
+
+    expected = pd.DataFrame(compute_indicators(flat['High'], flat['Low'], flat['Close']), index=flat.index,
+                            columns=indicator_features)
+    vix = fred.get(['VIXCLS'])['VIXCLS']
+    expected['es_vix_corr'] = expected['log_return'].rolling(10).corr(np.log(vix / vix.shift(1)).reindex(flat.index))
+
+    assert (streamed.loc[flat.index[1219]:flat.index[1239], ['bb_width', 'vol_5']] == 0.0).all().all()
+    assert streamed.loc[flat.index[1210]:flat.index[1239], 'es_vix_corr'].isna().all()
+    np.testing.assert_allclose(streamed[expected.columns].to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-10)
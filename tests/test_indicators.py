@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.benchmarks.synthetic import synthetic_ohlcv
+from src.features import indicators
+from src.features.indicators import compute_indicators, indicator_features
+
+
+@pytest.fixture(scope="module")
+def long_bars():
+    # Long enough to span several ewm and rolling-sum blocks, with flat stretches for the zero-std path
+    df = synthetic_ohlcv(6000, seed=11)
+    df.iloc[2000:2040] = df.iloc[[2000]].to_numpy()
+    return df
+
+
+@pytest.mark.parametrize("alpha", [1.0, 0.5, 1 / 14, 2 / 27, 1e-3])
+def test_ewm_matches_pandas(long_bars, alpha):
+    close = long_bars['Close']
+    expected = close.ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    np.testing.assert_allclose(indicators.ewm(close.to_numpy(), alpha), expected, rtol=1e-12)
+
+
+def _flat(x, window):
+    # End rows of windows holding a single value
+    x = pd.Series(x)
+    return (x.rolling(window).max() == x.rolling(window).min()).to_numpy()
+
+
+@pytest.mark.parametrize("window", [5, 20, 1500])
+def test_rolling_mean_and_std_match_pandas(long_bars, window):
+    close = long_bars['Close']
+    np.testing.assert_allclose(indicators.rolling_mean(close.to_numpy(), window),
+                               close.rolling(window).mean().to_numpy(), rtol=1e-12)
+    flat = _flat(close, window)
+    assert flat.any() == (window <= 20)
+    for ddof in (0, 1):
+        got = indicators.rolling_std(close.to_numpy(), window, ddof=ddof)
+        expected = close.rolling(window).std(ddof=ddof).to_numpy()
+        np.testing.assert_allclose(got[~flat], expected[~flat], rtol=1e-7, atol=1e-9)
+        # pandas leaves a rounding residue on constant windows; the kernel is exactly 0
+        assert (got[flat] == 0.0).all() and (np.abs(expected[flat]) < 1e-4).all()
+
+
+def _ta_reference(df):
+    # The ta / pandas calls add_features made before the NumPy kernels
+    ta = pytest.importorskip("ta")
+    close, high, low = df['Close'], df['High'], df['Low']
+    out = pd.DataFrame(index=df.index)
+    out['log_return'] = np.log(close / close.shift(1))
+    out['rsi'] = ta.momentum.RSIIndicator(close=close, window=14).rsi()
+    out['macd'] = ta.trend.MACD(close=close).macd_diff()
+    bb = ta.volatility.BollingerBands(close=close)
+    out['bb_mavg'] = bb.bollinger_mavg()
+    out['bb_width'] = bb.bollinger_hband() - bb.bollinger_lband()
+    out['atr'] = ta.volatility.AverageTrueRange(high=high, low=low, close=close).average_true_range()
+    out['rsi_lag1'] = out['rsi'].shift(1)
+    out['macd_lag1'] = out['macd'].shift(1)
+    out['momentum_3'] = close / close.shift(3) - 1
+    out['momentum_5'] = close / close.shift(5) - 1
+    out['vol_5'] = out['log_return'].rolling(window=5).std()
+    return out
+
+
+def test_compute_indicators_match_ta(long_bars):
+    expected = _ta_reference(long_bars)
+    got = compute_indicators(long_bars['High'], long_bars['Low'], long_bars['Close'])
+    assert got.shape == (len(long_bars), len(indicator_features))
+    # Bollinger width of constant windows is exactly 0 (see rolling_std), ta's is a rounding residue
+    flat = _flat(long_bars['Close'], 20)
+    assert (got[flat, indicator_features.index('bb_width')] == 0.0).all()
+    expected.loc[flat, 'bb_width'] = 0.0
+    for k, name in enumerate(indicator_features):
+        np.testing.assert_array_equal(np.isnan(got[:, k]), expected[name].isna().to_numpy(), err_msg=name)
+        np.testing.assert_allclose(got[:, k], expected[name].to_numpy(), rtol=1e-8, atol=1e-9, err_msg=name)
+
+
+def test_compute_indicators_handles_short_inputs(long_bars):
+    short = long_bars.iloc[:20]
+    expected = _ta_reference(short)
+    got = compute_indicators(short['High'], short['Low'], short['Close'])
+    np.testing.assert_allclose(got, expected[indicator_features].to_numpy(), rtol=1e-8, atol=1e-9)
@@ -0,0 +1,32 @@
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from src.features.engineering import final_features, fred_indicators
+from src.features.incremental import IncrementalFeatureEngine
+from src.strategies.live_engine import LiveEngine, ReplaySource
+from src.strategies.live_recommender import LiveTradeRecommender
+
+PARAMS = dict(confidence_threshold=0.52, confidence_margin=0.02, rr_ratio=2.0, atr_mult=1.5, atr_threshold=None,
+              rsi_filter=70, short_signals=True, max_hold_days=10)
+
+
+def test_replayed_bars_score_like_the_batch_pipeline(bars, fred, features_df):
+    train = features_df.iloc[:1500]
+    y = (train['Close'].shift(-1) > train['Close']).astype(int)
+    model = RandomForestClassifier(n_estimators=10, max_depth=4, random_state=0).fit(train[final_features].values, y)
+    recommender = LiveTradeRecommender(model, final_features, PARAMS)
+
+    macro = {fred_indicators[code]: s for code, s in fred.get(list(fred_indicators)).items()}
+    engine = LiveEngine(recommender, IncrementalFeatureEngine(macro=macro), verbose=False)
+    split = bars.index.get_loc(features_df.index[2000])
+    engine.warm_up(bars.iloc[:split])
+    events = [engine.on_bar(ts, candle) for ts, candle in ReplaySource(bars.iloc[split:])]
+
+    expected = recommender.generate_batch(features_df.iloc[2000:])
+    scored = {e['timestamp']: e['recommendation'] for e in events}
+    assert list(scored) == list(expected.index)
+    assert [r['reason'] for r in scored.values()] == list(expected['reason'])
+    np.testing.assert_allclose([r['confidence'] for r in scored.values()], expected['confidence'], rtol=1e-12)
+
+    summary = engine.summary()
+    assert summary['bars'] == len(events) and summary['signals'] == int(expected['direction'].notna().sum())
+    assert summary['closed_trades'] > 0
@@ -0,0 +1,76 @@
+import os
+import pandas as pd
+import pytest
+from src.data.candle_store import CandleStore
+from src.features.engineering import final_features
+from src.models.registry import ModelRegistry
+from src.monitoring.metrics import metrics
+from src.strategies import live_recommender
+
+
+def test_run_live_signal_builds_macro_features_and_reuses_registry_model(bars, fred, tmp_path, monkeypatch):
+    fetched = []
+    monkeypatch.setattr(live_recommender, "fetch_mes_data", lambda token: fetched.append(token) or bars.copy())
+    misses = metrics.counter("cache_misses", cache="model")
+    registry = ModelRegistry(str(tmp_path), refit_every="1D")
+
+    first = live_recommender.run_live_signal("token", final_features, verbose=False, registry=registry,
+                                             fred_cache=fred)
+    assert fetched == ["token"]
+    assert 0.0 <= first["confidence"] <= 1.0
+
+    # A new candle changes the training window but stays within the refit schedule
+    extra = bars.iloc[[-1]].copy()
+    extra.index = extra.index + pd.Timedelta(minutes=1)
+    bars_next = pd.concat([bars, extra])
+    monkeypatch.setattr(live_recommender, "fetch_mes_data", lambda token: bars_next.copy())
+    live_recommender.run_live_signal("token", final_features, verbose=False, registry=registry, fred_cache=fred)
+    assert metrics.counter("cache_misses", cache="model") == misses + 1
+    assert len(os.listdir(tmp_path)) == 1
+
+
+def test_run_live_signal_syncs_the_candle_store_once_per_call(bars, fred, tmp_path, monkeypatch):
+    requests = []
+
+    def fetch(token, symbol=None, lookback_days=5, start_date=None, **kwargs):
+        requests.append(start_date)
+        return bars if start_date is None else bars[bars.index >= start_date]
+
+    monkeypatch.setattr("src.data.candle_store.fetch_mes_data", fetch)
+    monkeypatch.setattr(live_recommender, "fetch_mes_data", lambda *a, **k: pytest.fail("store bypassed"))
+    store = CandleStore(str(tmp_path / "candles"))
+    syncs = []
+    sync = store.sync
+    monkeypatch.setattr(store, "sync", lambda *a, **k: syncs.append(1) or sync(*a, **k))
+
+    for _ in range(2):
+        live_recommender.run_live_signal("token", final_features, verbose=False, store=store, fred_cache=fred)
+    assert len(syncs) == 2
+    # The first call backfills the lookback, the second only asks for candles after the stored ones
+    assert requests == [None, bars.index[-1]]
+
+
+def test_generate_batch_matches_generate_row_by_row(features_df):
+    from sklearn.ensemble import RandomForestClassifier
+    df = features_df.iloc[-400:]
+    y = (df['Close'].shift(-1) > df['Close']).astype(int)
+    model = RandomForestClassifier(n_estimators=10, max_depth=4, random_state=0).fit(df[final_features].values, y)
+    params = dict(confidence_threshold=0.52, confidence_margin=0.02, rr_ratio=2.0, atr_mult=1.5,
+                  atr_threshold=float(df['atr'].quantile(0.8)), rsi_filter=60, short_signals=True)
+    recommender = live_recommender.LiveTradeRecommender(model, final_features, params)
+
+    batch = recommender.generate_batch(df)
+    reasons = set()
+    for ts, row in df.iterrows():
+        expected, got = recommender.generate(row, verbose=False), batch.loc[ts]
+        reasons.add(expected['reason'])
+        for field, value in expected.items():
+            if field == 'date':
+                continue
+            if isinstance(value, str) or value is None:
+                assert got[field] == value, (ts, field)
+            else:
+                assert got[field] == pytest.approx(value, rel=1e-12), (ts, field)
+    # Accepted signals and each kind of rejection are covered
+    assert 'Live signal with filtered confidence and ATR' in reasons and 'high_atr_rejection' in reasons
+    assert len(reasons) >= 4
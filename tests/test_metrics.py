@@ -0,0 +1,32 @@
+from sklearn.ensemble import RandomForestClassifier
+from src.features.engineering import final_features
+from src.monitoring.metrics import Metrics, metrics
+from src.strategies.walkforward import run_wfv_with_params
+
+
+def test_prometheus_label_values_are_escaped():
+    m = Metrics()
+    m.count("rejections", reason='say "no"\\\nnow')
+    line = m.to_prometheus().splitlines()[1]
+    assert line == 'mes_rejections_total{reason="say \\"no\\"\\\\\\nnow"} 1'
+
+
+def test_capture_collects_spans_for_merge():
+    m = Metrics()
+    with m.capture() as spans:
+        with m.span("fit"):
+            pass
+    other = Metrics()
+    other.merge(spans)
+    assert [name for name, _ in spans] == ["fit"]
+    assert other.latency.counts == {"fit": 1}
+
+
+def test_fold_spans_from_worker_processes_reach_the_parent(features_df):
+    df = features_df.iloc[:300]
+    n_folds = len(range(0, len(df) - 60 - 10, 10))
+    before = metrics.latency.counts.get("fit", 0), metrics.latency.counts.get("predict", 0)
+    run_wfv_with_params(df, final_features, RandomForestClassifier, dict(n_estimators=5, max_depth=2),
+                        plot=False, n_jobs=2, seed=0)
+    assert metrics.latency.counts["fit"] - before[0] == n_folds
+    assert metrics.latency.counts["predict"] - before[1] == n_folds
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+from src.strategies.signals import compute_signals
+
+
+def _backtest_reference(proba, rsi, atr, threshold, margin, rsi_filter, atr_threshold, short_signals):
+    # Per-row rules of the original run_wfv_with_params loop
+    signals = []
+    for p, r, a in zip(proba, rsi, atr):
+        if p > threshold and atr_threshold and a > atr_threshold:
+            signals.append(0)
+        elif r > rsi_filter:
+            signals.append(0)
+        elif abs(p - 0.5) < margin:
+            signals.append(0)
+        elif p > threshold:
+            signals.append(1)
+        elif short_signals and p < (1 - threshold):
+            signals.append(-1)
+        else:
+            signals.append(0)
+    return np.array(signals)
+
+
+def _live_reference(p, r, a, threshold, margin, rsi_filter, atr_threshold, short_signals):
+    # Branches of the original LiveTradeRecommender.generate
+    if abs(p - 0.5) < margin:
+        return 0, "confidence_margin_rejection"
+    if p > threshold and r < rsi_filter:
+        signal = 1
+    elif p < (1 - threshold) and short_signals:
+        signal = -1
+    else:
+        return 0, "threshold_not_crossed"
+    if signal == 1 and atr_threshold and a > atr_threshold:
+        return 0, "high_atr_rejection"
+    return signal, "accepted"
+
+
+@pytest.fixture(scope="module")
+def inputs():
+    rng = np.random.default_rng(0)
+    n = 5_000
+    proba = rng.uniform(0, 1, n)
+    rsi = rng.uniform(0, 100, n)
+    # Boundary and missing RSI values, where the two RSI scopes differ
+    rsi[::37] = 70.0
+    rsi[::101] = np.nan
+    atr = rng.uniform(0, 150, n)
+    return proba, rsi, atr
+
+
+SETTINGS = [(0.6, 0.05, 70, None, False), (0.55, 0.0, 70, 80.0, True), (0.5, 0.1, 60, 50.0, True)]
+
+
+@pytest.mark.parametrize("settings", SETTINGS)
+def test_backtest_rules_match_the_original_loop(inputs, settings):
+    threshold, margin, rsi_filter, atr_threshold, short = settings
+    signal, _ = compute_signals(*inputs, threshold, confidence_margin=margin, rsi_filter=rsi_filter,
+                                atr_threshold=atr_threshold, short_signals=short, rules='backtest')
+    np.testing.assert_array_equal(signal, _backtest_reference(*inputs, *settings))
+
+
+@pytest.mark.parametrize("settings", SETTINGS)
+def test_live_rules_match_the_original_generate(inputs, settings):
+    threshold, margin, rsi_filter, atr_threshold, short = settings
+    signal, reason = compute_signals(*inputs, threshold, confidence_margin=margin, rsi_filter=rsi_filter,
+                                     atr_threshold=atr_threshold, short_signals=short, rules='live')
+    expected = [_live_reference(p, r, a, *settings) for p, r, a in zip(*inputs)]
+    np.testing.assert_array_equal(signal, [s for s, _ in expected])
+    # RSI-filtered longs now say so instead of 'threshold_not_crossed'
+    for got, (_, want), p, r in zip(reason, expected, inputs[0], inputs[1]):
+        assert got == want or (got == 'rsi_rejection' and want == 'threshold_not_crossed'
+                               and p > threshold and not r < rsi_filter)
+
+
+@pytest.mark.parametrize("settings", SETTINGS)
+def test_rule_sets_agree_where_the_rsi_filter_does_not_apply(inputs, settings):
+    threshold, margin, rsi_filter, atr_threshold, short = settings
+    kwargs = dict(confidence_margin=margin, rsi_filter=rsi_filter, atr_threshold=atr_threshold, short_signals=short)
+    backtest = compute_signals(*inputs, threshold, rules='backtest', **kwargs)
+    live = compute_signals(*inputs, threshold, rules='live', **kwargs)
+    unfiltered = inputs[1] < rsi_filter
+    assert unfiltered.sum() > 1000
+    np.testing.assert_array_equal(backtest[0][unfiltered], live[0][unfiltered])
+    np.testing.assert_array_equal(backtest[1][unfiltered], live[1][unfiltered])
+    # Elsewhere live takes shorts the backtest filters, and rejects longs at exactly rsi_filter or NaN RSI
+    rsi = inputs[1]
+    differ = backtest[0] != live[0]
+    shorts = (live[0] == -1) & (backtest[0] == 0) & (rsi > rsi_filter)
+    longs = (backtest[0] == 1) & (live[0] == 0) & ((rsi == rsi_filter) | np.isnan(rsi))
+    np.testing.assert_array_equal(differ, shorts | longs)
+
+
+def test_unknown_rules_raise():
+    with pytest.raises(ValueError):
+        compute_signals([0.7], [50], [1], 0.6, rules='paper')
@@ -0,0 +1,16 @@
+import os
+import optuna
+from src.config.strategy_params import load_params
+from src.strategies.tuning import save_best_params, suggest_params
+
+
+def test_save_best_params_versions_files_that_load_params_reads(tmp_path):
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    study = optuna.create_study(direction="maximize", sampler=optuna.samplers.TPESampler(seed=0))
+    study.optimize(lambda trial: sum(suggest_params(trial)[0].values()), n_trials=3)
+
+    paths = [save_best_params(study, str(tmp_path)) for _ in range(2)]
+    assert [os.path.basename(p) for p in paths] == ["strategy_params_v001.json", "strategy_params_v002.json"]
+    strategy_params, rf_params = load_params(paths[-1])
+    assert set(rf_params) == {"n_estimators", "max_depth"}
+    assert dict(strategy_params, **rf_params) == study.best_params
@@ -0,0 +1,105 @@
+import os
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from src.features.engineering import final_features
+from src.strategies import fold_data as fold_data_module, walkforward
+from src.strategies.fold_data import FoldData
+from src.strategies.result_cache import ResultCache
+from src.strategies.streaming import run_wfv_streaming
+from src.strategies.walkforward import run_wfv_with_params
+
+PARAMS = dict(n_estimators=5, max_depth=3)
+
+
+@pytest.fixture(scope="module")
+def wfv_df(features_df):
+    return features_df.iloc[:600]
+
+
+def _run(df, **kwargs):
+    kwargs = dict(dict(plot=False, seed=3, short_signals=True, confidence_threshold=0.52,
+                       confidence_margin=0.0, atr_threshold=None), **kwargs)
+    return run_wfv_with_params(df, final_features, RandomForestClassifier, PARAMS, **kwargs)
+
+
+def _assert_same_run(a, b):
+    pd.testing.assert_frame_equal(a[0], b[0])
+    pd.testing.assert_frame_equal(a[1], b[1])
+    assert a[2] == pytest.approx(b[2], nan_ok=True)
+
+
+@pytest.mark.parametrize("trailing_stop", [False, True])
+def test_vectorized_exits_match_the_bar_loop(wfv_df, trailing_stop):
+    loop = _run(wfv_df, trailing_stop=trailing_stop)
+    vectorized = _run(wfv_df, trailing_stop=trailing_stop, vectorized_exits=True)
+    assert len(loop[1]) > 20
+    assert set(loop[1]['reason']) >= {'stop_loss', 'time_exit'}
+    _assert_same_run(loop, vectorized)
+
+
+def test_process_pool_folds_match_in_process_folds(wfv_df):
+    _assert_same_run(_run(wfv_df, vectorized_exits=True), _run(wfv_df, vectorized_exits=True, n_jobs=2))
+
+
+def test_fold_data_runs_match_runs_without_it(wfv_df, monkeypatch):
+    fold_data = FoldData(wfv_df, final_features)
+    _assert_same_run(_run(wfv_df), _run(wfv_df, fold_data=fold_data))
+
+    # A second strategy setting is served from the cached fold probabilities without refitting
+    expected = _run(wfv_df, atr_mult=2.0, rr_ratio=1.5)
+    monkeypatch.setattr(fold_data_module, "_fit_predict_fold", lambda *args: pytest.fail("fold refitted"))
+    _assert_same_run(expected, _run(wfv_df, atr_mult=2.0, rr_ratio=1.5, fold_data=fold_data))
+
+
+@pytest.mark.parametrize("bounds", [(150, 400), (65, 66, 300)])
+def test_streaming_run_matches_in_memory_run(wfv_df, tmp_path, bounds):
+    results, trades, stats = _run(wfv_df)
+    edges = [0, *bounds, len(wfv_df)]
+    chunks = [wfv_df.iloc[lo:hi] for lo, hi in zip(edges, edges[1:])]
+    streamed = run_wfv_streaming(chunks, final_features, RandomForestClassifier, PARAMS, str(tmp_path), seed=3,
+                                 short_signals=True, confidence_threshold=0.52, confidence_margin=0.0,
+                                 atr_threshold=None)
+
+    assert streamed == pytest.approx(stats, rel=1e-9)
+    streamed_results = pd.read_csv(tmp_path / "results.csv", index_col="date", parse_dates=["date"])
+    pd.testing.assert_frame_equal(streamed_results, results, check_names=False, check_freq=False, rtol=1e-9)
+    streamed_trades = pd.read_csv(tmp_path / "trades.csv", parse_dates=["entry_date", "exit_date"])
+    pd.testing.assert_frame_equal(streamed_trades, trades.reset_index(drop=True), check_dtype=False, rtol=1e-9)
+
+
+def test_result_cache_hit_returns_the_stored_run_and_replays_fold_callbacks(wfv_df, tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path))
+    live_folds, cached_folds = [], []
+    first = _run(wfv_df, result_cache=cache, fold_callback=lambda f, r, n: live_folds.append((f, list(r), n)))
+    _assert_same_run(first, _run(wfv_df))
+    assert len(cache.entries()) == 1
+
+    monkeypatch.setattr(walkforward, "_iter_fold_probabilities", lambda *args: pytest.fail("folds refitted"))
+    hit = _run(wfv_df, result_cache=cache, fold_callback=lambda f, r, n: cached_folds.append((f, list(r), n)))
+    _assert_same_run(first, hit)
+    assert len(live_folds) == len(first[0]) // 10
+    assert cached_folds == live_folds
+
+    # Any result-affecting argument is part of the key
+    monkeypatch.undo()
+    _run(wfv_df, result_cache=cache, atr_mult=2.0)
+    _run(wfv_df.iloc[:-1], result_cache=cache)
+    assert len(cache.entries()) == 3
+
+
+def test_result_cache_evicts_least_recently_used_entries(wfv_df, tmp_path):
+    cache = ResultCache(str(tmp_path))
+    runs = [dict(atr_mult=m) for m in (1.0, 1.5, 2.0)]
+    for kwargs in runs:
+        _run(wfv_df, result_cache=cache, **kwargs)
+    oldest = cache.entries()[0][2]
+    # Reading the oldest entry makes it the most recently used
+    assert cache.get(os.path.basename(oldest)[:-len(".pkl")]) is not None
+    assert cache.entries()[-1][2] == oldest
+    cache.max_bytes = cache.size() - 1
+    assert cache.evict() == 1
+    assert os.path.exists(oldest) and len(cache.entries()) == 2
+
+    cache.clear()
+    assert cache.entries() == [] and cache.get("missing") is None